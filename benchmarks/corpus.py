@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Reproducible synthetic crontab corpora for the benchmarks
+
+Every corpus is a valid crontab, so timings measure the checker and not error reporting.
+
+Usage:
+    python benchmarks/corpus.py KIND LINES OUTPUT [--seed N]
+"""
+
+import argparse
+import random
+import sys
+from typing import Callable, Dict, Iterator, List
+
+DEFAULT_SEED = 20251017
+KEYWORDS = ["@reboot", "@yearly", "@annually", "@monthly", "@weekly", "@daily", "@midnight", "@hourly"]
+COMMANDS = ["/usr/bin/backup.sh", "/usr/local/bin/report --daily", "/usr/bin/find /tmp -mtime +7 -delete", "echo ok > /dev/null 2>&1", "/opt/app/bin/sync"]
+USERS = ["root", "nobody", "daemon"]
+# Share of comment and environment lines among the generated entries
+COMMENT_RATE = 0.05
+ENV_RATE = 0.02
+
+
+def time_fields(rng: random.Random) -> str:
+    """Five time fields mixing wildcards, ranges, steps and lists"""
+    minute = rng.choice(["*", str(rng.randrange(60)), f"*/{rng.randrange(1, 31)}", f"{rng.randrange(30)}-{rng.randrange(30, 60)}"])
+    hour = rng.choice(["*", str(rng.randrange(24)), f"*/{rng.randrange(1, 13)}", f"{rng.randrange(12)}-{rng.randrange(12, 24)}"])
+    day = rng.choice(["*", str(rng.randrange(1, 29)), "1,15"])
+    month = rng.choice(["*", str(rng.randrange(1, 13)), "1-6"])
+    weekday = rng.choice(["*", str(rng.randrange(7)), "1-5", "1,3,5"])
+    return f"{minute} {hour} {day} {month} {weekday}"
+
+
+def user_entries(rng: random.Random) -> Iterator[List[str]]:
+    """User crontab entries with an occasional comment or environment line"""
+    while True:
+        roll = rng.random()
+        if roll < COMMENT_RATE:
+            yield [f"# job group {rng.randrange(1000)}"]
+        elif roll < COMMENT_RATE + ENV_RATE:
+            yield [f"MAILTO=ops{rng.randrange(100)}@example.com"]
+        else:
+            yield [f"{time_fields(rng)} {rng.choice(COMMANDS)}"]
+
+
+def system_entries(rng: random.Random) -> Iterator[List[str]]:
+    """System crontab entries with a user field"""
+    while True:
+        if rng.random() < COMMENT_RATE:
+            yield [f"# job group {rng.randrange(1000)}"]
+        else:
+            yield [f"{time_fields(rng)} {rng.choice(USERS)} {rng.choice(COMMANDS)}"]
+
+
+def continuation_entries(rng: random.Random) -> Iterator[List[str]]:
+    """User entries whose commands span several backslash-continued lines"""
+    while True:
+        lines = [f"{time_fields(rng)} {rng.choice(COMMANDS)} \\"]
+        for index in range(rng.randrange(2, 8)):
+            lines.append(f"    --option-{index} value{rng.randrange(100)} \\")
+        lines.append("    --last")
+        yield lines
+
+
+def keyword_entries(rng: random.Random) -> Iterator[List[str]]:
+    """User entries using @keywords"""
+    while True:
+        yield [f"{rng.choice(KEYWORDS)} {rng.choice(COMMANDS)}"]
+
+
+def comma_list_entries(rng: random.Random) -> Iterator[List[str]]:
+    """User entries with wide comma lists in every time field"""
+    while True:
+        minutes = ",".join(str(value) for value in sorted(rng.sample(range(60), rng.randrange(10, 40))))
+        hours = ",".join(str(value) for value in sorted(rng.sample(range(24), rng.randrange(5, 20))))
+        days = ",".join(str(value) for value in sorted(rng.sample(range(1, 32), rng.randrange(5, 20))))
+        yield [f"{minutes} {hours} {days} 1,3,5,7,9,11 0,1,2,3,4,5,6 {rng.choice(COMMANDS)}"]
+
+
+GENERATORS: Dict[str, Callable[[random.Random], Iterator[List[str]]]] = {
+    "user": user_entries,
+    "system": system_entries,
+    "continuation": continuation_entries,
+    "keywords": keyword_entries,
+    "comma_lists": comma_list_entries,
+}
+# Corpora checked as system crontabs
+SYSTEM_KINDS = ("system",)
+
+
+def generate_lines(kind: str, lines: int, seed: int = DEFAULT_SEED) -> List[str]:
+    """About `lines` physical lines of the given kind; whole entries only, so continuations are never cut"""
+    rng = random.Random(f"{kind}:{seed}")
+    result: List[str] = []
+    entries = GENERATORS[kind](rng)
+    while len(result) < lines:
+        result.extend(next(entries))
+    return result
+
+
+def write_corpus(path: str, kind: str, lines: int, seed: int = DEFAULT_SEED) -> int:
+    """Write a corpus file, returns the number of physical lines"""
+    content = generate_lines(kind, lines, seed)
+    with open(path, "w") as f:
+        f.write("\n".join(content) + "\n")
+    return len(content)
+
+
+def main() -> int:
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Write a synthetic crontab corpus")
+    parser.add_argument("kind", choices=sorted(GENERATORS), help="Corpus kind")
+    parser.add_argument("lines", type=int, help="Approximate number of lines")
+    parser.add_argument("output", help="Output file")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"Random seed (default: {DEFAULT_SEED})")
+    args = parser.parse_args()
+    print(write_corpus(args.output, args.kind, args.lines, args.seed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Next-fire-time benchmark: CronExpression.next_fire over schedules from the synthetic corpus (see corpus.py)
+
+Two modes, one million computations each by default:
+    independent  next_fire from start times spread over a year, cycling through the schedules
+    iterate      consecutive runs of each schedule with iter_fires ("list the next N runs")
+A minute-by-minute scan over a small sample of the same calls is timed for comparison.
+Results are printed as JSON: wall time, computations/sec and ns per computation per mode.
+
+Usage:
+    python benchmarks/next_fire.py                          # 1M computations per mode
+    python benchmarks/next_fire.py --computations 100000 --schedules 200
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import DEFAULT_SEED, generate_lines  # noqa: E402
+
+from checkcrontab.expression import CronExpression  # noqa: E402
+
+MODES = ("independent", "iterate")
+DEFAULT_COMPUTATIONS = 1000000
+DEFAULT_SCHEDULES = 1000
+# The scan takes tens of milliseconds per call on the sparser corpus schedules
+DEFAULT_SCAN_SAMPLE = 100
+# Time fields and command of a user crontab entry
+USER_FIELDS = 6
+START = datetime(2025, 1, 1)
+MINUTES_PER_YEAR = 365 * 24 * 60
+# Give up scanning after this many minutes, longer than any gap in the corpus schedules
+SCAN_LIMIT = 2 * MINUTES_PER_YEAR
+
+
+def load_schedules(count: int, seed: int = DEFAULT_SEED) -> List[CronExpression]:
+    """Parsed time fields of the first count entries of a user corpus"""
+    schedules: List[CronExpression] = []
+    lines = generate_lines("user", count * 2, seed)
+    for line in lines:
+        fields = line.split(None, USER_FIELDS - 1)
+        if len(fields) < USER_FIELDS or line.startswith("#") or "=" in fields[0]:
+            continue
+        minute, hour, day, month, weekday, _ = fields
+        expression, errors = CronExpression.parse(minute, hour, day, month, weekday)
+        if expression is not None and not errors:
+            schedules.append(expression)
+        if len(schedules) == count:
+            break
+    return schedules
+
+
+def start_times(count: int, seed: int = DEFAULT_SEED) -> List[datetime]:
+    """Start times spread over a year, with seconds, made before timing starts"""
+    rng = random.Random(seed)
+    return [START + timedelta(minutes=rng.randrange(MINUTES_PER_YEAR), seconds=rng.randrange(60)) for _ in range(count)]
+
+
+def scan_next_fire(expression: CronExpression, after: datetime) -> Optional[datetime]:
+    """Reference next fire time by checking every following minute"""
+    current = after.replace(second=0, microsecond=0)
+    minute = timedelta(minutes=1)
+    for _ in range(SCAN_LIMIT):
+        current += minute
+        if expression.matches(current.minute, current.hour, current.day, current.month, (current.weekday() + 1) % 7):
+            return current
+    return None
+
+
+def run_independent(schedules: List[CronExpression], times: List[datetime]) -> float:
+    """Wall time of one next_fire per start time"""
+    pairs = list(zip(itertools.cycle(schedules), times))
+    start = time.perf_counter()
+    for expression, after in pairs:
+        expression.next_fire(after)
+    return time.perf_counter() - start
+
+
+def run_iterate(schedules: List[CronExpression], computations: int) -> float:
+    """Wall time of listing the next runs of every schedule, computations in total"""
+    per_schedule, extra = divmod(computations, len(schedules))
+    start = time.perf_counter()
+    for index, expression in enumerate(schedules):
+        for _ in itertools.islice(expression.iter_fires(START), per_schedule + (index < extra)):
+            pass
+    return time.perf_counter() - start
+
+
+def run_scan(schedules: List[CronExpression], times: List[datetime]) -> float:
+    """Wall time of the minute scan over the same calls as run_independent, checking both agree"""
+    pairs = list(zip(itertools.cycle(schedules), times))
+    start = time.perf_counter()
+    expected = [scan_next_fire(expression, after) for expression, after in pairs]
+    wall = time.perf_counter() - start
+    if expected != [expression.next_fire(after) for expression, after in pairs]:
+        raise RuntimeError("next_fire disagrees with the minute scan")
+    return wall
+
+
+def result(mode: str, computations: int, wall: float) -> Dict[str, Any]:
+    """Report entry of one mode"""
+    return {
+        "mode": mode,
+        "computations": computations,
+        "wall_s": round(wall, 6),
+        "per_s": round(computations / wall) if wall > 0 else None,
+        "ns_per_computation": round(wall / computations * 1e9) if computations else None,
+    }
+
+
+def benchmark(modes: List[str], schedules: List[CronExpression], times: List[datetime], scan_sample: int, repeat: int) -> List[Dict[str, Any]]:
+    """Fastest of `repeat` runs for every mode, one computation per start time, then the minute scan on a sample"""
+    computations = len(times)
+    results = []
+    for mode in modes:
+        run: Callable[[], float] = (lambda: run_independent(schedules, times)) if mode == "independent" else (lambda: run_iterate(schedules, computations))
+        wall = min(run() for _ in range(repeat))
+        results.append(result(mode, computations, wall))
+    if scan_sample:
+        results.append(result("minute_scan", scan_sample, run_scan(schedules, times[:scan_sample])))
+    return results
+
+
+def main() -> int:
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Measure next-fire-time computations over corpus schedules")
+    parser.add_argument("--mode", action="append", choices=MODES, help="Mode to run, repeatable (default: all)")
+    parser.add_argument("--computations", type=int, default=DEFAULT_COMPUTATIONS, help=f"Computations per mode (default: {DEFAULT_COMPUTATIONS})")
+    parser.add_argument("--schedules", type=int, default=DEFAULT_SCHEDULES, help=f"Distinct schedules taken from the corpus (default: {DEFAULT_SCHEDULES})")
+    parser.add_argument("--scan-sample", type=int, default=DEFAULT_SCAN_SAMPLE, help=f"Calls timed with the minute scan for comparison, 0 to skip (default: {DEFAULT_SCAN_SAMPLE})")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode, the fastest is reported (default: 3)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"Corpus random seed (default: {DEFAULT_SEED})")
+    args = parser.parse_args()
+
+    schedules = load_schedules(max(args.schedules, 1), args.seed)
+    times = start_times(max(args.computations, 1), args.seed)
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "seed": args.seed,
+        "schedules": args.schedules,
+        "results": benchmark(args.mode or list(MODES), schedules, times, max(args.scan_sample, 0), max(args.repeat, 1)),
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Performance regression gate: times fixed scenarios and compares them to regression_baseline.json
+
+Times are divided by a calibration loop measured in the same run, so a baseline recorded on one
+machine is comparable on another. A scenario fails when its normalized time exceeds the baseline
+by more than the scenario's tolerance (0.5 = 50% slower).
+
+Usage:
+    python benchmarks/regression.py            # Print results as JSON and a comparison table
+    python benchmarks/regression.py --check    # Exit 1 when a scenario is slower than allowed
+    python benchmarks/regression.py --update   # Record the current results as the new baseline
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import write_corpus  # noqa: E402
+from next_fire import load_schedules, start_times  # noqa: E402
+from throughput import ROOT, cli_command  # noqa: E402
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "regression_baseline.json")
+DEFAULT_TOLERANCE = 0.5
+LINE_CHECKS = 20000
+FILE_LINES = 100000
+FRAGMENTS = 1000
+FRAGMENT_LINES = 20
+CLI_LINES = 20000
+NEXT_FIRE_SCHEDULES = 1000
+NEXT_FIRE_COMPUTATIONS = 100000
+CALIBRATION_ITERATIONS = 200000
+SINGLE_LINE = "*/5 9-17 * * 1-5 /usr/bin/backup.sh --incremental"
+
+
+def calibrate() -> float:
+    """Pure-Python loop of string splitting and int parsing, like the checker's hot path"""
+    start = time.perf_counter()
+    total = 0
+    for i in range(CALIBRATION_ITERATIONS):
+        text = f"{i % 60} {i % 24} */{i % 7 + 1} * *"
+        for part in text.split():
+            total += int(part) if part.isdigit() else len(part)
+    return time.perf_counter() - start
+
+
+def reset_caches() -> None:
+    """Start every run cold, like a fresh CLI invocation"""
+    from checkcrontab import checker, expression
+
+    expression.FIELD_CACHE.clear()
+    checker.USER_DB.clear()
+
+
+def build_scenarios(tmp: str) -> Dict[str, Callable[[], object]]:
+    """Write the corpora and return one callable per scenario"""
+    from checkcrontab import checker, main
+
+    user_file = os.path.join(tmp, "user")
+    system_file = os.path.join(tmp, "system")
+    cli_file = os.path.join(tmp, "cli")
+    crond = os.path.join(tmp, "cron.d")
+    write_corpus(user_file, "user", FILE_LINES)
+    write_corpus(system_file, "system", FILE_LINES)
+    write_corpus(cli_file, "user", CLI_LINES)
+    os.mkdir(crond)
+    for index in range(FRAGMENTS):
+        write_corpus(os.path.join(crond, f"job-{index:04d}"), "system", FRAGMENT_LINES, seed=index)
+    cli_env = dict(os.environ, GITHUB_ACTIONS="true", PYTHONPATH=ROOT)
+    cli_env.pop("CHECKCRONTAB_SOCKET", None)
+
+    def check_line() -> None:
+        for number in range(1, LINE_CHECKS + 1):
+            checker.check_line(SINGLE_LINE, number, "crontab")
+
+    def check_crond() -> None:
+        files, _ = main.get_files(crond)
+        for path in files:
+            main.check_file(path, is_system_crontab=True)
+
+    schedules = load_schedules(NEXT_FIRE_SCHEDULES)
+    after_times = start_times(NEXT_FIRE_COMPUTATIONS)
+
+    def next_fire() -> None:
+        for index, after in enumerate(after_times):
+            schedules[index % NEXT_FIRE_SCHEDULES].next_fire(after)
+
+    def run_cli() -> None:
+        subprocess.run(cli_command(cli_file, False), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=cli_env, check=True)
+
+    return {
+        "check_line": check_line,
+        "user_file_100k": lambda: main.check_file(user_file),
+        "system_file_100k": lambda: main.check_file(system_file, is_system_crontab=True),
+        "crond_1000": check_crond,
+        "cli_user_20k": run_cli,
+        "next_fire_100k": next_fire,
+    }
+
+
+def measure(runs: int, only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Best-of-runs wall time of every scenario and of the calibration loop"""
+    logging.disable(logging.CRITICAL)
+    calibration = min(calibrate() for _ in range(runs))
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, scenario in build_scenarios(tmp).items():
+            if only and name not in only:
+                continue
+            times = []
+            for _ in range(runs):
+                reset_caches()
+                start = time.perf_counter()
+                scenario()
+                times.append(time.perf_counter() - start)
+            results[name] = {"wall_s": round(min(times), 6)}
+    # Recalibrate after the scenarios and keep the faster value, in case the machine was busy at the start
+    calibration = min(calibration, calibrate())
+    for result in results.values():
+        result["normalized"] = round(result["wall_s"] / calibration, 3)
+    return {"calibration_s": round(calibration, 6), "scenarios": results}
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-scenario comparison rows; status is ok, fail, faster (beyond tolerance) or new"""
+    rows = []
+    for name, current in result["scenarios"].items():
+        expected = baseline.get("scenarios", {}).get(name)
+        if expected is None:
+            rows.append({"scenario": name, "baseline": None, "current": current["normalized"], "ratio": None, "tolerance": DEFAULT_TOLERANCE, "status": "new"})
+            continue
+        tolerance = float(expected.get("tolerance", DEFAULT_TOLERANCE))
+        ratio = current["normalized"] / expected["normalized"]
+        status = "fail" if ratio > 1 + tolerance else "faster" if ratio < 1 / (1 + tolerance) else "ok"
+        rows.append({"scenario": name, "baseline": expected["normalized"], "current": current["normalized"], "ratio": round(ratio, 3), "tolerance": tolerance, "status": status})
+    return rows
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    """Readable comparison of normalized times"""
+    lines = [f"{'scenario':<20} {'baseline':>10} {'current':>10} {'change':>8} {'allowed':>8}  status"]
+    for row in rows:
+        baseline = "-" if row["baseline"] is None else f"{row['baseline']:.3f}"
+        change = "-" if row["ratio"] is None else f"{(row['ratio'] - 1) * 100:+.0f}%"
+        lines.append(f"{row['scenario']:<20} {baseline:>10} {row['current']:>10.3f} {change:>8} {'+' + format(row['tolerance'] * 100, '.0f') + '%':>8}  {row['status'].upper()}")
+    return "\n".join(lines)
+
+
+def update_baseline(path: str, result: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Write the current results into the baseline, keeping the tolerances already set and scenarios not run"""
+    import platform
+
+    scenarios = dict(baseline.get("scenarios", {}))
+    for name, current in result["scenarios"].items():
+        tolerance = baseline.get("scenarios", {}).get(name, {}).get("tolerance", DEFAULT_TOLERANCE)
+        scenarios[name] = {"normalized": current["normalized"], "tolerance": tolerance}
+    data = {"python": platform.python_version(), "calibration_s": result["calibration_s"], "scenarios": scenarios}
+    with open(path, "w") as f:
+        f.write(json.dumps(data, indent=2) + "\n")
+
+
+def main() -> int:
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Compare checkcrontab performance to a committed baseline")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per scenario, the fastest is kept (default: 3)")
+    parser.add_argument("--scenario", action="append", help="Only run this scenario, repeatable")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline JSON file")
+    parser.add_argument("--check", action="store_true", help="Exit 1 when a scenario is slower than its tolerance allows")
+    parser.add_argument("--update", action="store_true", help="Write the results to the baseline file")
+    args = parser.parse_args()
+
+    baseline: Dict[str, Any] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    result = measure(max(args.runs, 1), args.scenario)
+    rows = compare(result, baseline)
+    result["comparison"] = rows
+    print(json.dumps(result, indent=2))
+    print(format_table(rows), file=sys.stderr)
+    if args.update:
+        update_baseline(args.baseline, result, baseline)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+    failed = [row["scenario"] for row in rows if row["status"] == "fail"]
+    if failed:
+        print(f"Performance regression: {', '.join(failed)} slower than the baseline allows", file=sys.stderr)
+    return 1 if args.check and failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
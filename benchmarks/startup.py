@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: import time of a single-file CLI check measured with python -X importtime
+
+The import time is divided by the calibration loop of regression.py measured in the same run,
+so the budget in startup_budget.json holds on faster and slower machines alike.
+
+Usage:
+    python benchmarks/startup.py            # Print results as JSON
+    python benchmarks/startup.py --check    # Exit 1 when over the budget in startup_budget.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from regression import calibrate  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.json")
+CRONTAB = "0 2 * * * /usr/bin/backup.sh\n"
+
+
+def run_importtime(argv: List[str], pycache_dir: str) -> List[Tuple[str, int, int]]:
+    """Run python -X importtime with argv, returns (module, self us, cumulative us) in import order; nested modules are indented"""
+    # Bytecode goes to a private cache so runs measure imports like an installed package would
+    env = dict(os.environ, GITHUB_ACTIONS="true", PYTHONPATH=ROOT, PYTHONPYCACHEPREFIX=pycache_dir)
+    for name in ("PYTHONDONTWRITEBYTECODE", "CHECKCRONTAB_SOCKET", "CHECKCRONTAB_CACHE_DIR"):
+        env.pop(name, None)
+    proc = subprocess.run([sys.executable, "-X", "importtime", *argv], capture_output=True, text=True, env=env, cwd=pycache_dir, check=False)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(argv)} exited with {proc.returncode}: {proc.stderr[-2000:]}")
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def measure(runs: int) -> Dict[str, Any]:
+    """Best-of-runs import time of the checkcrontab modules for a one-file text check, also normalized by the calibration loop"""
+    calibration = min(calibrate() for _ in range(runs))
+    with tempfile.TemporaryDirectory() as tmp:
+        crontab = os.path.join(tmp, "crontab")
+        with open(crontab, "w") as f:
+            f.write(CRONTAB)
+        pycache_dir = os.path.join(tmp, "pycache")
+        os.mkdir(pycache_dir)
+        # Modules loaded by a bare interpreter are not charged to checkcrontab
+        startup = {name for name, _, _ in run_importtime(["-c", "pass"], pycache_dir)}
+        run_importtime(["-m", "checkcrontab", crontab], pycache_dir)
+        best_us = None
+        best_modules: List[Tuple[str, int, int]] = []
+        for _ in range(runs):
+            modules = run_importtime(["-m", "checkcrontab", crontab], pycache_dir)
+            total_us = sum(cumulative for name, _, cumulative in modules if not name.startswith(" ") and name not in startup)
+            if best_us is None or total_us < best_us:
+                best_us, best_modules = total_us, modules
+    # Recalibrate after the runs and keep the faster value, in case the machine was busy at the start
+    calibration = min(calibration, calibrate())
+    top = sorted(best_modules, key=lambda module: module[1], reverse=True)[:10]
+    return {
+        "scenario": "cli_single_file",
+        "runs": runs,
+        "import_us": best_us,
+        "calibration_s": round(calibration, 6),
+        "import_normalized": round((best_us or 0) / 1e6 / calibration, 4),
+        "modules": sorted({name.strip() for name, _, _ in best_modules}),
+        "top_self_us": [{"module": name.strip(), "self_us": self_us} for name, self_us, _ in top],
+    }
+
+
+def check_budget(result: Dict[str, Any], budget: Dict[str, Any]) -> List[str]:
+    """Return budget violations"""
+    problems = []
+    if result["import_normalized"] > budget["import_normalized"]:
+        allowed_us = round(budget["import_normalized"] * result["calibration_s"] * 1e6)
+        problems.append(
+            f"import time {result['import_us']} us ({result['import_normalized']} calibration loops) exceeds budget {budget['import_normalized']} ({allowed_us} us on this machine)"
+        )
+    for module in budget.get("forbidden_modules", []):
+        if module in result["modules"]:
+            problems.append(f"{module} is imported at startup")
+    return problems
+
+
+def main() -> int:
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Measure checkcrontab startup import time")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs, the fastest is reported (default: 5)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 when the budget is exceeded")
+    parser.add_argument("--budget", default=BUDGET_FILE, help="Budget JSON file")
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+    with open(args.budget) as f:
+        budget = json.load(f)
+    problems = check_budget(result, budget)
+    result["budget_normalized"] = budget["import_normalized"]
+    result["problems"] = problems
+    print(json.dumps(result, indent=2))
+    for problem in problems:
+        print(f"Startup budget: {problem}", file=sys.stderr)
+    return 1 if args.check and problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: check_line, check_file and full CLI runs over synthetic corpora (see corpus.py)
+
+Each measurement runs in a fresh interpreter so peak memory is per scenario.
+Results are printed as JSON: wall time, lines/sec and peak RSS per scenario, corpus kind and size.
+For check_line, "lines" counts the entries passed to it (continuations joined, comments skipped).
+
+Usage:
+    python benchmarks/throughput.py                                  # All kinds, 1k and 100k lines
+    python benchmarks/throughput.py --lines 1000000 --kind system    # One 1M-line system crontab
+    python benchmarks/throughput.py --scenario cli --output out.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import DEFAULT_SEED, GENERATORS, SYSTEM_KINDS, write_corpus  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("check_line", "check_file", "cli")
+DEFAULT_LINES = [1000, 100000]
+# CLI exit codes of a completed check; 1 means the corpus has findings
+CLI_EXIT_CODES = (0, 1)
+
+
+def maxrss_kb(maxrss: int) -> int:
+    """ru_maxrss in KiB; it is in bytes on macOS"""
+    return maxrss // 1024 if sys.platform == "darwin" else maxrss
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Peak resident set size of this process in KiB, None where unavailable"""
+    # On Linux ru_maxrss keeps the high-water mark of the process image before exec, VmHWM does not
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    return maxrss_kb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def exit_code(status: int) -> int:
+    """Exit code of a wait status like Popen.returncode: negative signal number for a killed process"""
+    if hasattr(os, "waitstatus_to_exitcode"):
+        return os.waitstatus_to_exitcode(status)
+    # Python 3.8
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def run_command(argv: List[str], env: Dict[str, str]) -> Optional[int]:
+    """
+    Run a checkcrontab command with its output discarded, returns its peak RSS in KiB where available
+    Raises RuntimeError when the command did not complete its check
+    """
+    proc = subprocess.Popen(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+    peak = None
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = exit_code(status)
+        peak = maxrss_kb(usage.ru_maxrss)
+    else:
+        proc.wait()
+    if proc.returncode not in CLI_EXIT_CODES:
+        raise RuntimeError(f"{' '.join(argv)} exited with {proc.returncode}")
+    return peak
+
+
+def entry_lines(path: str) -> List[str]:
+    """Entries of a corpus as check_file passes them to the checker: continuations joined, no comments or blanks"""
+    with open(path) as f:
+        lines = f.read().splitlines()
+    entries = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        i += 1
+        while line.endswith("\\") and i < len(lines) and lines[i].startswith((" ", "\t")):
+            line = line[:-1] + "\n" + lines[i]
+            i += 1
+        if line.strip() and not line.lstrip().startswith("#"):
+            entries.append(line)
+    return entries
+
+
+def cli_command(path: str, is_system: bool) -> List[str]:
+    """Command line of a single-file CLI check with the result cache and worker pool off"""
+    return [sys.executable, "-m", "checkcrontab", "--no-cache", "--jobs", "1", "-S" if is_system else "-U", path]
+
+
+def measure_child(scenario: str, path: str, is_system: bool) -> Dict[str, Any]:
+    """Run one scenario in this process; called in a fresh interpreter by run_scenario"""
+    from checkcrontab import checker, main
+
+    logging.disable(logging.CRITICAL)
+    with open(path) as f:
+        lines = sum(1 for _ in f)
+    if scenario == "check_line":
+        entries = entry_lines(path)
+        lines = len(entries)
+        file_name = os.path.basename(path)
+        start = time.perf_counter()
+        for number, line in enumerate(entries, 1):
+            checker.check_line(line, number, file_name, is_system_crontab=is_system)
+        wall = time.perf_counter() - start
+        peak = peak_rss_kb()
+    elif scenario == "check_file":
+        start = time.perf_counter()
+        main.check_file(path, is_system_crontab=is_system)
+        wall = time.perf_counter() - start
+        peak = peak_rss_kb()
+    else:
+        env = dict(os.environ, GITHUB_ACTIONS="true", PYTHONPATH=ROOT)
+        env.pop("CHECKCRONTAB_SOCKET", None)
+        start = time.perf_counter()
+        peak = run_command(cli_command(path, is_system), env)
+        wall = time.perf_counter() - start
+    return {"lines": lines, "wall_s": wall, "peak_rss_kb": peak}
+
+
+def run_scenario(scenario: str, path: str, is_system: bool) -> Dict[str, Any]:
+    """Measure one scenario in a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", scenario, path, "system" if is_system else "user"], capture_output=True, text=True, env=env, check=False
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{scenario} on {path} exited with {proc.returncode}: {proc.stderr[-2000:]}")
+    result: Dict[str, Any] = json.loads(proc.stdout.splitlines()[-1])
+    return result
+
+
+def benchmark(scenarios: List[str], kinds: List[str], sizes: List[int], repeat: int, seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """Fastest of `repeat` runs for every scenario, corpus kind and size"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in kinds:
+            for size in sizes:
+                path = os.path.join(tmp, f"{kind}_{size}")
+                write_corpus(path, kind, size, seed)
+                for scenario in scenarios:
+                    runs = [run_scenario(scenario, path, kind in SYSTEM_KINDS) for _ in range(repeat)]
+                    best = min(runs, key=lambda run: float(run["wall_s"]))
+                    peaks = [run["peak_rss_kb"] for run in runs if run["peak_rss_kb"] is not None]
+                    results.append(
+                        {
+                            "scenario": scenario,
+                            "kind": kind,
+                            "size": size,
+                            "lines": best["lines"],
+                            "wall_s": round(best["wall_s"], 6),
+                            "lines_per_s": round(best["lines"] / best["wall_s"]) if best["wall_s"] > 0 else None,
+                            "peak_rss_kb": max(peaks) if peaks else None,
+                        }
+                    )
+    return results
+
+
+def main() -> int:
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Measure checkcrontab throughput on synthetic corpora")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Scenario to run, repeatable (default: all)")
+    parser.add_argument("--kind", action="append", choices=sorted(GENERATORS), help="Corpus kind, repeatable (default: all)")
+    parser.add_argument("--lines", action="append", type=int, help=f"Corpus size in lines, repeatable (default: {', '.join(map(str, DEFAULT_LINES))})")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, the fastest is reported (default: 3)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"Corpus random seed (default: {DEFAULT_SEED})")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--child", nargs=3, metavar=("SCENARIO", "PATH", "TYPE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        scenario, path, crontab_type = args.child
+        print(json.dumps(measure_child(scenario, path, crontab_type == "system")))
+        return 0
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "seed": args.seed,
+        "results": benchmark(args.scenario or list(SCENARIOS), args.kind or list(GENERATORS), args.lines or DEFAULT_LINES, max(args.repeat, 1), args.seed),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
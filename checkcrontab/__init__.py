@@ -9,15 +9,34 @@ __author__ = "Aleksandr Pimenov"
 __email__ = "wachawo@gmail.com"
 __url__ = "https://github.com/wachawo/checkcrontab"
 
-# Import main functions
-from . import checker, logger, main
+import sys
+from typing import Any
+
+# Submodules are imported on first attribute access so that importing the
+# library (e.g. checkcrontab.checker) does not pay for the CLI and its helpers
+SUBMODULES = ("main", "analyze", "cache", "checker", "diagnostic", "expression", "logger", "profiling", "sarif", "server", "watch")
 
 __all__ = [
     "main",
+    "analyze",
+    "cache",
     "checker",
+    "diagnostic",
+    "expression",
     "logger",
+    "profiling",
+    "sarif",
+    "server",
+    "watch",
     "__version__",
     "__description__",
     "__author__",
     "__email__",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in SUBMODULES:
+        __import__(f"{__name__}.{name}")
+        return sys.modules[f"{__name__}.{name}"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Module for schedule analysis over the valid lines of crontab files
+"""
+
+import hashlib
+import itertools
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .expression import CronExpression
+
+SECONDS_PER_MINUTE = 60
+MINUTES_PER_HOUR = 60
+HOURS_PER_DAY = 24
+MINUTES_PER_DAY = MINUTES_PER_HOUR * HOURS_PER_DAY
+DAYS_PER_WEEK = 7
+MINUTES_PER_WEEK = MINUTES_PER_DAY * DAYS_PER_WEEK
+ALL_WEEKDAYS = 0x7F
+WEEKDAY_NAMES = ("Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat")
+DENSITY_PERIODS = {"day": MINUTES_PER_DAY, "week": MINUTES_PER_WEEK}
+DEFAULT_TOP = 10
+DEFAULT_RUNS = 5
+# Runtime in seconds of jobs missing from the runtimes file: the job occupies its start minute
+DEFAULT_RUNTIME = SECONDS_PER_MINUTE
+DURATION_UNITS = {"s": 1, "m": SECONDS_PER_MINUTE, "h": SECONDS_PER_MINUTE * MINUTES_PER_HOUR, "d": SECONDS_PER_MINUTE * MINUTES_PER_DAY}
+FINGERPRINT_LENGTH = 12
+# Fields before the command: time fields, plus the user in system crontabs
+USER_COMMAND_FIELD = 5
+SYSTEM_COMMAND_FIELD = 6
+# Heatmap cells from no starts to the peak
+HEATMAP_SHADES = " .:-=+*#%@"
+# Longest line content shown in text reports
+CONTENT_WIDTH = 80
+
+
+class Job:
+    """A valid crontab line with a schedule"""
+
+    __slots__ = ("file", "line_number", "line", "expression", "is_system_crontab")
+
+    def __init__(self, file: str, line_number: int, line: str, expression: CronExpression, is_system_crontab: bool = False) -> None:
+        self.file = file
+        self.line_number = line_number
+        self.line = line
+        self.expression = expression
+        self.is_system_crontab = is_system_crontab
+
+    def __repr__(self) -> str:
+        return f"Job({self.file!r}, {self.line_number!r}, {self.line!r})"
+
+    @property
+    def command(self) -> str:
+        """Command part of the line, after the time fields or keyword and the user of system crontabs"""
+        parts = self.line.split()
+        skip = 1 if self.line.startswith("@") else USER_COMMAND_FIELD
+        if self.is_system_crontab:
+            skip += 1
+        return " ".join(parts[skip:])
+
+    @property
+    def fingerprint(self) -> str:
+        """Short hash of the line with whitespace collapsed, stable across files and reformatting"""
+        return hashlib.sha256(" ".join(self.line.split()).encode("utf-8")).hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def spread(mask: int, stride: int) -> int:
+    """Move bit n of mask to bit n * stride"""
+    result = 0
+    bit = 0
+    while mask:
+        if mask & 1:
+            result |= 1 << (bit * stride)
+        mask >>= 1
+        bit += 1
+    return result
+
+
+def day_mask(expression: CronExpression) -> int:
+    """Bit m set for every minute of the day (0-1439) the expression starts in"""
+    # Minutes fit in 60 bits, so the product places one copy of them per selected hour without carries
+    return expression.minutes * spread(expression.hours, MINUTES_PER_HOUR)
+
+
+def week_mask(expression: CronExpression) -> int:
+    """
+    Bit m set for every minute of the week (0 = Sunday 00:00) the expression starts in
+    Months and days of month are not modelled: a line restricted by day of month
+    may fall on any weekday, so it counts on all of them.
+    """
+    weekdays = expression.weekday_mask if expression.day_star else ALL_WEEKDAYS
+    return day_mask(expression) * spread(weekdays, MINUTES_PER_DAY)
+
+
+def popcount(value: int) -> int:
+    """Number of set bits"""
+    return bin(value).count("1")
+
+
+def set_bits(value: int) -> Iterable[int]:
+    """Positions of the set bits, lowest first"""
+    for position, bit in enumerate(reversed(bin(value)[2:])):
+        if bit == "1":
+            yield position
+
+
+class SlicedCounter:
+    """
+    Per-slot counters kept as bit planes: plane j holds bit j of every slot's count
+    Adding a mask of slots is a ripple-carry over a few big integers instead of a loop over slots.
+    """
+
+    def __init__(self) -> None:
+        self.planes: List[int] = []
+
+    def add(self, mask: int, count: int = 1) -> None:
+        """Add count to every slot set in mask"""
+        plane = 0
+        while count:
+            if count & 1:
+                carry = mask
+                level = plane
+                while carry:
+                    while level >= len(self.planes):
+                        self.planes.append(0)
+                    current = self.planes[level]
+                    self.planes[level] = current ^ carry
+                    carry &= current
+                    level += 1
+            count >>= 1
+            plane += 1
+
+    def counts(self, slots: int) -> List[int]:
+        """Count per slot"""
+        result = [0] * slots
+        for level, plane in enumerate(self.planes):
+            weight = 1 << level
+            for slot in set_bits(plane):
+                result[slot] += weight
+        return result
+
+
+def slot_label(slot: int, period: str) -> str:
+    """'HH:MM' for a minute of the day, 'Day HH:MM' for a minute of the week"""
+    day, minute = divmod(slot, MINUTES_PER_DAY)
+    label = f"{minute // MINUTES_PER_HOUR:02d}:{minute % MINUTES_PER_HOUR:02d}"
+    return f"{WEEKDAY_NAMES[day]} {label}" if period == "week" else label
+
+
+def density(jobs: List[Job], period: str = "day", top: int = DEFAULT_TOP) -> Dict[str, Any]:
+    """
+    Job starts per minute of the day or week
+    Returns the histogram, the busiest minutes and the files and lines starting the most jobs in them
+    """
+    slots = DENSITY_PERIODS[period]
+    to_mask = week_mask if period == "week" else day_mask
+    masks: Dict[CronExpression, int] = {}
+    job_masks = []
+    for job in jobs:
+        mask = masks.get(job.expression)
+        if mask is None:
+            mask = masks[job.expression] = to_mask(job.expression)
+        job_masks.append(mask)
+
+    counter = SlicedCounter()
+    for mask, count in Counter(job_masks).items():
+        counter.add(mask, count)
+    histogram = counter.counts(slots)
+
+    peaks = sorted((slot for slot in range(slots) if histogram[slot]), key=lambda slot: (-histogram[slot], slot))[:top]
+    peak_mask = 0
+    for slot in peaks:
+        peak_mask |= 1 << slot
+    file_starts: Counter[str] = Counter()
+    line_starts = []
+    for job, mask in zip(jobs, job_masks):
+        hits = popcount(mask & peak_mask)
+        if hits:
+            file_starts[job.file] += hits
+            line_starts.append((hits, job))
+    line_starts.sort(key=lambda item: (-item[0], item[1].file, item[1].line_number))
+
+    return {
+        "period": period,
+        "jobs": len(jobs),
+        "starts": sum(histogram),
+        "peak_minutes": [{"minute": slot_label(slot, period), "slot": slot, "starts": histogram[slot]} for slot in peaks],
+        "top_files": [{"file": file, "starts": starts} for file, starts in sorted(file_starts.items(), key=lambda item: (-item[1], item[0]))[:top]],
+        "top_lines": [{"file": job.file, "line": job.line_number, "content": job.line, "starts": hits} for hits, job in line_starts[:top]],
+        "histogram": histogram,
+    }
+
+
+def parse_duration(value: Union[str, int, float]) -> int:
+    """Seconds from a number of seconds or a string such as '90', '90s', '15m', '2h' or '1d'"""
+    if isinstance(value, bool):
+        raise ValueError(f"invalid duration: {value!r}")
+    if isinstance(value, (int, float)):
+        seconds = value
+    else:
+        text = value.strip().lower()
+        factor = DURATION_UNITS.get(text[-1:], 1)
+        if text[-1:] in DURATION_UNITS:
+            text = text[:-1]
+        try:
+            seconds = float(text) * factor
+        except ValueError:
+            raise ValueError(f"invalid duration: {value!r}") from None
+    if seconds < 0:
+        raise ValueError(f"negative duration: {value!r}")
+    return int(-(-seconds // 1))
+
+
+def load_runtimes(path: str) -> Dict[str, int]:
+    """Runtimes file: a JSON object mapping commands or line fingerprints to durations (see parse_duration)"""
+    import json
+
+    with open(path) as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object mapping commands or fingerprints to runtimes")
+    runtimes = {}
+    for key, value in data.items():
+        try:
+            runtimes[key] = parse_duration(value)
+        except ValueError as e:
+            raise ValueError(f"{path}: {key}: {e}") from None
+    return runtimes
+
+
+def job_runtime(job: Job, runtimes: Dict[str, int], default: int = DEFAULT_RUNTIME) -> Tuple[int, str]:
+    """Runtime of a job in seconds and where it came from: fingerprint, command or default"""
+    runtime = runtimes.get(job.fingerprint)
+    if runtime is not None:
+        return runtime, "fingerprint"
+    runtime = runtimes.get(job.command)
+    if runtime is not None:
+        return runtime, "command"
+    return default, "default"
+
+
+def rotate(mask: int, shift: int, slots: int) -> int:
+    """Move every set bit of a slots-wide mask shift places up, wrapping around the end"""
+    shift %= slots
+    return ((mask << shift) | (mask >> (slots - shift))) & ((1 << slots) - 1)
+
+
+def window_count(mask: int, slot: int, width: int, slots: int) -> int:
+    """Number of set bits among the width slots ending at slot, wrapping around the start"""
+    return popcount(rotate(mask, slots - 1 - slot, slots) >> (slots - width))
+
+
+def overlaps_itself(mask: int, width: int, slots: int) -> bool:
+    """Whether a run covering width slots from a start in mask is still running at the next start"""
+    reach = min(width - 1, slots)
+    if reach < 1 or not mask:
+        return False
+    # Smear the starts over the next reach slots by doubling the covered distance
+    smeared = rotate(mask, 1, slots)
+    covered = 1
+    while covered < reach:
+        step = min(covered, reach - covered)
+        smeared |= rotate(smeared, step, slots)
+        covered += step
+    return bool(mask & smeared)
+
+
+def shortest_gap(mask: int, slots: int) -> int:
+    """Fewest slots from a start to the next one, wrapping around the end"""
+    if not mask:
+        return slots
+    # smears[j] has the starts moved up by 1 to 2**j slots; grow the gap by the largest steps keeping clear of mask
+    smears = [rotate(mask, 1, slots)]
+    while (1 << len(smears)) < slots:
+        last = smears[-1]
+        smears.append(last | rotate(last, 1 << (len(smears) - 1), slots))
+    gap = 0
+    covered = 0
+    for level in range(len(smears) - 1, -1, -1):
+        candidate = covered | rotate(smears[level], gap, slots)
+        if not mask & candidate and gap + (1 << level) < slots:
+            covered = candidate
+            gap += 1 << level
+    return gap + 1
+
+
+def concurrency(jobs: List[Job], runtimes: Dict[str, int], period: str = "day", default_runtime: int = DEFAULT_RUNTIME) -> Dict[str, Any]:
+    """
+    Jobs running at once at every minute of the day or week, given their runtimes
+    A run starting in minute s with a runtime of r seconds covers the minutes s to s + ceil(r / 60) - 1,
+    wrapping into the start of the period since the schedule repeats. A sweep line over the start and
+    end minutes gives the running count; the peak names the jobs running in it, and jobs whose runs
+    last longer than the shortest gap between their starts are flagged.
+    """
+    slots = DENSITY_PERIODS[period]
+    to_mask = week_mask if period == "week" else day_mask
+    masks: Dict[CronExpression, int] = {}
+    entries: List[Tuple[Job, int, int, str, int]] = []
+    groups: Counter[Tuple[int, int]] = Counter()
+    base = 0
+    for job in jobs:
+        mask = masks.get(job.expression)
+        if mask is None:
+            mask = masks[job.expression] = to_mask(job.expression)
+        runtime, source = job_runtime(job, runtimes, default_runtime)
+        width = max(1, -(-runtime // SECONDS_PER_MINUTE))
+        entries.append((job, mask, runtime, source, width))
+        laps, rest = divmod(width, slots)
+        # A run longer than the period covers every minute laps times
+        base += laps * popcount(mask)
+        if rest:
+            groups[(mask, rest)] += 1
+
+    starts = SlicedCounter()
+    ends = SlicedCounter()
+    running = base
+    for (mask, rest), count in groups.items():
+        starts.add(mask, count)
+        ends.add(rotate(mask, rest, slots), count)
+        # Runs from the end of the previous period still going at its start
+        running += count * popcount(mask >> (slots - rest + 1))
+    start_counts = starts.counts(slots)
+    end_counts = ends.counts(slots)
+    timeline = []
+    running += start_counts[0]
+    timeline.append(running)
+    for slot in range(1, slots):
+        running += start_counts[slot] - end_counts[slot]
+        timeline.append(running)
+
+    peak = max(timeline, default=0)
+    peak_slot = timeline.index(peak) if peak else 0
+    at_peak = []
+    self_overlaps = []
+    # Runs covering the peak minute and the shortest gap of self-overlapping runs, per schedule and width
+    seen: Dict[Tuple[int, int], Tuple[int, Optional[int]]] = {}
+    for job, mask, runtime, source, width in entries:
+        known = seen.get((mask, width))
+        if known is None:
+            laps, rest = divmod(width, slots)
+            runs = laps * popcount(mask) + (window_count(mask, peak_slot, rest, slots) if rest and peak else 0)
+            known = seen[(mask, width)] = (runs, shortest_gap(mask, slots) if overlaps_itself(mask, width, slots) else None)
+        runs, gap = known
+        if not runs and gap is None:
+            continue
+        entry = {"file": job.file, "line": job.line_number, "content": job.line, "fingerprint": job.fingerprint, "runtime_s": runtime, "runtime_from": source}
+        if peak and runs:
+            at_peak.append({**entry, "runs": runs})
+        if gap is not None:
+            self_overlaps.append({**entry, "shortest_gap_minutes": gap})
+
+    return {
+        "period": period,
+        "jobs": len(jobs),
+        "default_runtime_s": default_runtime,
+        "defaulted": sum(1 for entry in entries if entry[3] == "default"),
+        "peak": peak,
+        "peak_minute": slot_label(peak_slot, period) if peak else None,
+        "running_at_peak": at_peak,
+        "self_overlaps": self_overlaps,
+        "timeline": timeline,
+    }
+
+
+def shade(count: int, peak: int) -> str:
+    """Heatmap character for count on a scale up to peak"""
+    if count <= 0 or peak <= 0:
+        return HEATMAP_SHADES[0]
+    return HEATMAP_SHADES[max(1, -(-count * (len(HEATMAP_SHADES) - 1) // peak))]
+
+
+def heatmap(histogram: List[int], period: str, unit: str = "starts per minute") -> List[str]:
+    """
+    Text heatmap: for a day one row per hour and one column per minute,
+    for a week one row per weekday and one column per hour (busiest minute of the hour)
+    """
+    peak = max(histogram, default=0)
+    rows = []
+    if period == "week":
+        rows.append("    " + "".join(f"{hour:<3d}" for hour in range(0, HOURS_PER_DAY, 3)).rstrip())
+        for day in range(DAYS_PER_WEEK):
+            hours = [max(histogram[day * MINUTES_PER_DAY + hour * MINUTES_PER_HOUR : day * MINUTES_PER_DAY + (hour + 1) * MINUTES_PER_HOUR]) for hour in range(HOURS_PER_DAY)]
+            rows.append(f"{WEEKDAY_NAMES[day]} " + "".join(shade(count, peak) for count in hours))
+    else:
+        rows.append("   " + "".join(f"{minute:<10d}" for minute in range(0, MINUTES_PER_HOUR, 10)).rstrip())
+        for hour in range(HOURS_PER_DAY):
+            minutes = histogram[hour * MINUTES_PER_HOUR : (hour + 1) * MINUTES_PER_HOUR]
+            rows.append(f"{hour:02d} " + "".join(shade(count, peak) for count in minutes))
+    rows.append(f"scale: '{HEATMAP_SHADES[1]}' = 1 ... '{HEATMAP_SHADES[-1]}' = {peak} {unit}")
+    return rows
+
+
+def render_density(report: Dict[str, Any]) -> str:
+    """Text form of a density report"""
+    lines = [f"Job starts per minute of the {report['period']}: {report['jobs']} jobs, {report['starts']} starts"]
+    lines.append("")
+    lines.append("Peak minutes:")
+    lines.extend(f"  {peak['minute']:>9}  {peak['starts']}" for peak in report["peak_minutes"])
+    lines.append("")
+    lines.append("Top files at peak minutes:")
+    lines.extend(f"  {entry['starts']:>6}  {entry['file']}" for entry in report["top_files"])
+    lines.append("")
+    lines.append("Top lines at peak minutes:")
+    for entry in report["top_lines"]:
+        content = " ".join(entry["content"].split())
+        if len(content) > CONTENT_WIDTH:
+            content = content[: CONTENT_WIDTH - 3] + "..."
+        lines.append(f"  {entry['starts']:>6}  {entry['file']}:{entry['line']}  {content}")
+    lines.append("")
+    lines.extend(heatmap(report["histogram"], report["period"]))
+    return "\n".join(lines)
+
+
+def timestamp(value: str) -> datetime:
+    """Local time from 'YYYY-MM-DD HH:MM' or another ISO 8601 form"""
+    return datetime.fromisoformat(value)
+
+
+def now() -> datetime:
+    """Current local time"""
+    return datetime.now()
+
+
+def next_runs(jobs: List[Job], after: datetime, count: int = DEFAULT_RUNS) -> Dict[str, Any]:
+    """The next count run times of every job after the given time"""
+    runs: Dict[CronExpression, List[str]] = {}
+    entries = []
+    for job in jobs:
+        times = runs.get(job.expression)
+        if times is None:
+            times = runs[job.expression] = [run.isoformat(sep=" ") for run in itertools.islice(job.expression.iter_fires(after), count)]
+        entries.append({"file": job.file, "line": job.line_number, "content": job.line, "runs": times})
+    return {"after": after.isoformat(sep=" "), "jobs": entries}
+
+
+def render_next(report: Dict[str, Any]) -> str:
+    """Text form of a next runs report"""
+    lines = [f"Next runs after {report['after']}:"]
+    for entry in report["jobs"]:
+        lines.append("")
+        lines.append(f"{entry['file']}:{entry['line']}  {' '.join(entry['content'].split())}")
+        lines.extend(f"  {run}" for run in entry["runs"])
+        if not entry["runs"]:
+            lines.append("  never")
+    return "\n".join(lines)
+
+
+def format_duration(seconds: int) -> str:
+    """Short form of a duration: 45s, 15m, 1h30m"""
+    if seconds < SECONDS_PER_MINUTE:
+        return f"{seconds}s"
+    hours, minutes = divmod(seconds // SECONDS_PER_MINUTE, MINUTES_PER_HOUR)
+    rest = seconds % SECONDS_PER_MINUTE
+    return (f"{hours}h" if hours else "") + (f"{minutes}m" if minutes else "") + (f"{rest}s" if rest else "")
+
+
+def render_concurrency(report: Dict[str, Any]) -> str:
+    """Text form of a concurrency report"""
+    lines = [f"Jobs running at once over the {report['period']}: {report['jobs']} jobs, {report['defaulted']} with the default runtime of {format_duration(report['default_runtime_s'])}"]
+    lines.append("")
+    if report["peak"]:
+        lines.append(f"Peak: {report['peak']} running at {report['peak_minute']}")
+    else:
+        lines.append("Peak: no jobs run")
+    for entry in report["running_at_peak"]:
+        runs = f" x{entry['runs']}" if entry["runs"] > 1 else ""
+        lines.append(f"  {format_duration(entry['runtime_s']):>8}{runs}  {entry['fingerprint']}  {entry['file']}:{entry['line']}  {' '.join(entry['content'].split())}")
+    lines.append("")
+    lines.append("Jobs overlapping their own next run:")
+    for entry in report["self_overlaps"]:
+        gap = format_duration(entry["shortest_gap_minutes"] * SECONDS_PER_MINUTE)
+        lines.append(f"  {format_duration(entry['runtime_s']):>8} every {gap:<6}  {entry['fingerprint']}  {entry['file']}:{entry['line']}  {' '.join(entry['content'].split())}")
+    if not report["self_overlaps"]:
+        lines.append("  none")
+    lines.append("")
+    lines.extend(heatmap(report["timeline"], report["period"], unit="jobs running"))
+    return "\n".join(lines)
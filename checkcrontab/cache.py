@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Module for caching per-file check results on disk
+"""
+
+import logging
+import os
+import platform
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import __version__ as VERSION
+from . import checker
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV = "CHECKCRONTAB_CACHE_DIR"
+CACHE_MAX_SIZE_MB = 64
+# After eviction the cache is trimmed to this share of its maximum size
+CACHE_EVICT_RATIO = 0.8
+
+
+class ResultCache:
+    """
+    Per-file check results stored as JSON files under cache_dir
+    Entries are keyed by file content hash, mode and owner (of the link and its target),
+    crontab type, output settings and checkcrontab version, so any change to the file
+    or to the tool gives a new key. Least recently used entries are evicted by size.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = CACHE_MAX_SIZE_MB * 1024 * 1024) -> None:
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+    def key(self, path: str, is_system_crontab: bool, output_format: str, level: int, *extra: Any, snapshot: Optional[checker.FileStat] = None) -> Optional[str]:
+        """
+        Build the cache key for a file, None if the file cannot be read
+        extra: other JSON-serializable inputs the result depends on, such as the user names of a root filesystem
+        snapshot: stat results of path to reuse, taken here when not given
+        """
+        import hashlib
+        import json
+
+        if snapshot is None:
+            snapshot = checker.FileStat.of(path)
+        link_stat, file_stat = snapshot.link_stat, snapshot.file_stat
+        if link_stat is None or file_stat is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                content_hash = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+        passwd_file = checker.USER_DB.passwd_file or checker.PASSWD_FILE
+        try:
+            passwd_mtime = os.stat(passwd_file).st_mtime_ns
+        except OSError:
+            passwd_mtime = 0
+        parts = [
+            VERSION,
+            os.path.abspath(path),
+            path,
+            is_system_crontab,
+            output_format,
+            level,
+            platform.system().lower(),
+            checker.CRONTAB_OWNER_UID,
+            [link_stat.st_mode, link_stat.st_uid, link_stat.st_gid],
+            [file_stat.st_mode, file_stat.st_uid, file_stat.st_gid],
+            content_hash,
+            passwd_file,
+            passwd_mtime,
+            *extra,
+        ]
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        """Location of the entry file for a key"""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached entry or None"""
+        import json
+
+        entry_path = self.entry_path(key)
+        try:
+            with open(entry_path, encoding="utf-8") as f:
+                entry: Dict[str, Any] = json.load(f)
+            # Mark as recently used for eviction
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store an entry atomically; failures only disable caching for this file"""
+        import json
+        import tempfile
+
+        entry_path = self.entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=os.path.dirname(entry_path), suffix=".tmp", delete=False) as tmp:
+                json.dump(entry, tmp)
+            os.replace(tmp.name, entry_path)
+        except OSError as e:
+            logger.debug(f"Failed to write cache entry {entry_path}: {e}")
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """List (mtime, size, path) of all entries"""
+        found = []
+        try:
+            subdirs = list(os.scandir(self.cache_dir))
+        except OSError:
+            return []
+        for subdir in subdirs:
+            if not subdir.is_dir(follow_symlinks=False):
+                continue
+            try:
+                for entry in os.scandir(subdir.path):
+                    if entry.name.endswith(".json"):
+                        st = entry.stat(follow_symlinks=False)
+                        found.append((st.st_mtime, st.st_size, entry.path))
+            except OSError:
+                continue
+        return found
+
+    def evict(self) -> int:
+        """Remove least recently used entries when the cache exceeds max_size; returns removed count"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_size:
+            return 0
+        removed = 0
+        target = self.max_size * CACHE_EVICT_RATIO
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        logger.debug(f"Result cache: evicted {removed} entries")
+        return removed
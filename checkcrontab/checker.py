@@ -10,12 +10,19 @@ import re
 import stat
 import subprocess
 import traceback
-from typing import List, Optional, Tuple
+from typing import AbstractSet, Dict, List, Optional, Sequence, Set, Tuple
+
+from .diagnostic import SEVERITY_WARNING, Diagnostic
+from .expression import DAY, HOUR, MINUTE, MONTH, WEEKDAY, CronExpression, parse_field
+
+try:
+    import pwd
+except ImportError:  # Windows
+    pwd = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
 # Constants for validation
-RANGE_PARTS_COUNT = 2
 CRONTAB_PERMISSIONS = 0o644
 CRONTAB_OWNER_UID = int(os.getenv("CRONTAB_OWNER_UID", "0"))
 USER_CRONTAB_MIN_FIELDS = 6
@@ -26,13 +33,16 @@ USER_SPECIAL_MIN_FIELDS = 2
 SYSTEM_SPECIAL_MIN_FIELDS = 3
 WINDOWS_MAJOR_VERSION = 10
 WINDOWS_BUILD_VERSION = 10586
+PASSWD_FILE = "/etc/passwd"
+# Seconds to wait for `crontab -l -u USER`
+CRONTAB_TIMEOUT = 10
+PROC_DIR = "/proc"
+# Process names of cron daemons; cronie runs as crond, busybox crond also as `busybox crond`
+DAEMON_NAMES = ("cron", "crond", "cronie", "fcron")
+DAEMON_PIDFILES = ("/run/crond.pid", "/var/run/crond.pid", "/run/cron.pid", "/var/run/cron.pid", "/run/fcron.pid", "/var/run/fcron.pid")
+# systemd units of cron daemons, asked with --systemctl
+DAEMON_UNITS = ("cron", "crond", "cronie")
 
-# Regex patterns for time fields
-MINUTE_PATTERN = r"^(\*|([0-5]?[0-9])(-([0-5]?[0-9]))?(/([0-9]+))?(,([0-5]?[0-9])(-([0-5]?[0-9]))?(/([0-9]+))?)*|\*/([0-9]+))$"
-HOUR_PATTERN = r"^(\*|([0-9]|1[0-9]|2[0-3])(-([0-9]|1[0-9]|2[0-3]))?(/([0-9]|1[0-9]|2[0-3]))?(,([0-9]|1[0-9]|2[0-3])(-([0-9]|1[0-9]|2[0-3]))?(/([0-9]|1[0-9]|2[0-3]))?)*|\*/([0-9]|1[0-9]|2[0-3]))$"
-DAY_PATTERN = r"^(\*|([1-9]|[12][0-9]|3[01])(-([1-9]|[12][0-9]|3[01]))?(/([1-9]|[12][0-9]|3[01]))?(,([1-9]|[12][0-9]|3[01])(-([1-9]|[12][0-9]|3[01]))?(/([1-9]|[12][0-9]|3[01]))?)*|\*/([1-9]|[12][0-9]|3[01]))$"
-MONTH_PATTERN = r"^(\*|([1-9]|1[0-2])(-([1-9]|1[0-2]))?(/([1-9]|1[0-2]))?(,([1-9]|1[0-2])(-([1-9]|1[0-2]))?(/([1-9]|1[0-2]))?)*|\*/([1-9]|1[0-2]))$"
-WEEKDAY_PATTERN = r"^(\*|([0-7])(-([0-7]))?(/([0-7]))?(,([0-7])(-([0-7]))?)*|\*/([0-7]))$"
 INVALID_NAME_ALLOWED_RE = r"^[A-Za-z0-9_-]+$"
 
 
@@ -63,12 +73,71 @@ def check_filename(file_path: str) -> str:
     return ""
 
 
-def check_daemon() -> List[str]:
-    """Check if cron daemon is running"""
+def daemon_name(pid_dir: str) -> Optional[str]:
+    """Name of the cron daemon running as the process of a /proc/PID directory, None for other or finished processes"""
+    try:
+        with open(os.path.join(pid_dir, "comm")) as f:
+            name = f.read().strip()
+        if name == "busybox":
+            with open(os.path.join(pid_dir, "cmdline"), "rb") as f:
+                argv = f.read().split(b"\0")
+            command = os.path.basename(argv[1].decode(errors="replace")) if len(argv) > 1 else ""
+            return f"busybox {command}" if command in DAEMON_NAMES else None
+    except OSError:
+        return None
+    return name if name in DAEMON_NAMES else None
+
+
+def find_daemon(proc_dir: str = PROC_DIR, pidfiles: Sequence[str] = DAEMON_PIDFILES) -> Optional[Tuple[int, str]]:
+    """
+    Find a running cron daemon from its pidfile, or else by the process names in procfs
+    Returns: (pid, name) or None; raises OSError when procfs cannot be read
+    """
+    for pidfile in pidfiles:
+        try:
+            with open(pidfile) as f:
+                pid = int(f.read().split()[0])
+        except (OSError, ValueError, IndexError):
+            continue
+        name = daemon_name(os.path.join(proc_dir, str(pid)))
+        if name:
+            return pid, name
+    with os.scandir(proc_dir) as entries:
+        for entry in entries:
+            if entry.name.isdigit():
+                name = daemon_name(entry.path)
+                if name:
+                    return int(entry.name), name
+    return None
+
+
+def check_daemon(systemctl: bool = False) -> List[str]:
+    """
+    Check if cron daemon is running by looking for its process in procfs
+    systemctl: ask systemctl when no cron process is found or procfs cannot be read
+    """
+    try:
+        found = find_daemon()
+    except OSError as e:
+        if not systemctl:
+            return [f"Cron daemon: cannot read {PROC_DIR}: {type(e).__name__}"]
+        found = None
+    if found:
+        logger.debug(f"Cron daemon: {found[1]} is running (pid {found[0]})")
+        return []
+    if systemctl:
+        return check_daemon_systemctl()
+    logger.warning("Cron daemon: is not running")
+    return []
+
+
+def check_daemon_systemctl() -> List[str]:
+    """Check if cron daemon is running with `systemctl is-active`"""
     errors: List[str] = []
     try:
-        result = subprocess.run(["systemctl", "is-active", "cron"], capture_output=True, text=True, timeout=5, check=False)
-        if result.returncode != 0 or result.stdout.strip() != "active":
+        result = subprocess.run(["systemctl", "is-active", *DAEMON_UNITS], capture_output=True, text=True, timeout=5, check=False)
+        # Exit status 0 when at least one of the units is active
+        if result.returncode != 0 or "active" not in result.stdout.split():
             logger.warning("Cron daemon: is not running")
         else:
             logger.debug("Cron daemon: is active")
@@ -83,11 +152,87 @@ def check_daemon() -> List[str]:
     return errors
 
 
-def check_kind(path: str, follow_symlink: bool = True) -> str:
-    """Determine the kind of file at the given path"""
-    # is_link = os.path.islink(path)
-    st = os.stat(path) if follow_symlink else os.lstat(path)
-    m = st.st_mode
+class FileStat:
+    """
+    One stat snapshot of a path, taken once and reused by existence, kind, permission and owner checks
+    link_stat is the lstat result, file_stat the stat result of the file it points to (the same object unless
+    the path is a symlink), so a regular file costs one stat call and a symlink two. error is the failed call's error.
+    """
+
+    __slots__ = ("path", "link_stat", "file_stat", "error")
+
+    def __init__(self, path: str, link_stat: Optional[os.stat_result] = None, file_stat: Optional[os.stat_result] = None, error: Optional[OSError] = None) -> None:
+        self.path = path
+        self.link_stat = link_stat
+        self.file_stat = file_stat
+        self.error = error
+
+    @classmethod
+    def of(cls, path: str, entry: "Optional[os.DirEntry[str]]" = None) -> "FileStat":
+        """Stat a path, or reuse what an os.scandir entry already knows about it"""
+        try:
+            link_stat = entry.stat(follow_symlinks=False) if entry is not None else os.lstat(path)
+        except OSError as e:
+            return cls(path, error=e)
+        if not stat.S_ISLNK(link_stat.st_mode):
+            return cls(path, link_stat, link_stat)
+        try:
+            file_stat = entry.stat() if entry is not None else os.stat(path)
+        except OSError as e:
+            return cls(path, link_stat, None, e)
+        return cls(path, link_stat, file_stat)
+
+    def exists(self) -> bool:
+        """Like os.path.exists: the path resolves to an existing file"""
+        return self.file_stat is not None
+
+    def is_file(self) -> bool:
+        """Like os.path.isfile"""
+        return self.file_stat is not None and stat.S_ISREG(self.file_stat.st_mode)
+
+    def is_dir(self) -> bool:
+        """Like os.path.isdir"""
+        return self.file_stat is not None and stat.S_ISDIR(self.file_stat.st_mode)
+
+    def is_link(self) -> bool:
+        """Like os.path.islink"""
+        return self.link_stat is not None and stat.S_ISLNK(self.link_stat.st_mode)
+
+
+class StatCache:
+    """
+    FileStat snapshots by absolute path for one run
+    Directory listings add their os.scandir entries; they are only stat'ed when a check asks for them.
+    """
+
+    def __init__(self) -> None:
+        self.snapshots: Dict[str, FileStat] = {}
+        self.entries: Dict[str, os.DirEntry[str]] = {}
+
+    def add(self, entry: "os.DirEntry[str]") -> None:
+        """Remember a directory entry to stat through when its path is asked for"""
+        self.entries[os.path.abspath(entry.path)] = entry
+
+    def get(self, path: str) -> FileStat:
+        """Snapshot of a path, stat'ed on the first call only"""
+        key = os.path.abspath(path)
+        snapshot = self.snapshots.get(key)
+        if snapshot is None:
+            snapshot = self.snapshots[key] = FileStat.of(path, self.entries.pop(key, None))
+        return snapshot
+
+    def clear(self) -> None:
+        """Forget all snapshots, for the next run or after a file changed"""
+        self.snapshots.clear()
+        self.entries.clear()
+
+
+STAT_CACHE = StatCache()
+
+
+def file_kind(mode: int) -> str:
+    """Kind of file from a st_mode value"""
+    m = mode
     # Check if regular file
     if stat.S_ISREG(m):
         return "regular_file"
@@ -106,50 +251,80 @@ def check_kind(path: str, follow_symlink: bool = True) -> str:
     return "unknown"
 
 
-def check_owner_and_permissions(file_path: str, owner_uid: int = CRONTAB_OWNER_UID) -> List[str]:
-    """Check owner and file permissions"""
+def check_kind(path: str, follow_symlink: bool = True) -> str:
+    """Determine the kind of file at the given path"""
+    st = os.stat(path) if follow_symlink else os.lstat(path)
+    return file_kind(st.st_mode)
+
+
+def link_target(file_path: str) -> str:
+    """
+    Final path a chain of symlinks points to, one readlink call per link and no stat calls
+    Stops at the first path that is not a link (or does not exist) and on a loop
+    """
+    path = file_path
+    seen = {path}
+    while True:
+        try:
+            target = os.readlink(path)
+        except OSError:
+            return path
+        path = os.path.normpath(os.path.join(os.path.dirname(path), target))
+        if path in seen:
+            return path
+        seen.add(path)
+
+
+def check_owner_and_permissions(file_path: str, owner_uid: int = CRONTAB_OWNER_UID, snapshot: Optional[FileStat] = None) -> List[str]:
+    """
+    Check owner and file permissions
+    snapshot: stat results of file_path to reuse (see STAT_CACHE), taken here when not given
+    """
     errors: List[str] = []
-    if not os.path.lexists(file_path):
-        errors.append(f"{file_path}: file does not exist")
-        return errors
-    try:
-        if os.path.islink(file_path):
-            try:
-                link_stat = os.lstat(file_path)  # symlink inode (do not follow)
-                if link_stat.st_uid != owner_uid:
-                    errors.append(f"wrong symlink owner: sudo chown -h root:root {file_path}")
-                else:
-                    logger.debug("symlink correct owner")
-            except Exception as e:
-                errors.append(f"failed to stat symlink: {e}")
-                # If we can't lstat the link, further checks don't make sense
-                return errors
-            target_path = os.path.realpath(file_path)
-            if not os.path.exists(target_path):
-                errors.append(f"broken symlink ({target_path} does not exist)")
-                return errors
+    if snapshot is None:
+        snapshot = FileStat.of(file_path)
+    if snapshot.link_stat is None:
+        if isinstance(snapshot.error, FileNotFoundError):
+            errors.append(f"{file_path}: file does not exist")
         else:
-            target_path = file_path
-        file_kind = check_kind(target_path)
-        if file_kind != "regular_file":
-            errors.append(f"{target_path}({file_kind}): not a regular_file.")
-        stat_info = os.stat(target_path)
-        mode = stat_info.st_mode & 0o777
-        if mode != CRONTAB_PERMISSIONS:
-            errors.append(f"wrong permissions ({oct(mode)}): sudo chmod 644 {target_path}")
+            errors.append(f"failed to stat {file_path}: {snapshot.error}")
+        return errors
+    target_path = file_path
+    if snapshot.is_link():
+        if snapshot.link_stat.st_uid != owner_uid:
+            errors.append(f"wrong symlink owner: sudo chown -h root:root {file_path}")
         else:
-            logger.debug(f"correct permissions: {oct(mode)}")
-        if stat_info.st_uid != owner_uid:
-            errors.append(f"crontab wrong owner: sudo chown root:root {target_path}")
+            logger.debug("symlink correct owner")
+        target_path = link_target(file_path)
+    stat_info = snapshot.file_stat
+    if stat_info is None:
+        # Only a symlink can have an lstat result without a stat result
+        if isinstance(snapshot.error, FileNotFoundError):
+            errors.append(f"broken symlink ({target_path} does not exist)")
         else:
-            logger.debug("crontab correct owner:")
-    except Exception as e:
-        errors.append(f"{e}")
+            errors.append(f"failed to stat {target_path}: {snapshot.error}")
+        return errors
+    kind = file_kind(stat_info.st_mode)
+    if kind != "regular_file":
+        errors.append(f"{target_path}({kind}): not a regular_file.")
+    mode = stat_info.st_mode & 0o777
+    if mode != CRONTAB_PERMISSIONS:
+        errors.append(f"wrong permissions ({oct(mode)}): sudo chmod 644 {target_path}")
+    else:
+        logger.debug(f"correct permissions: {oct(mode)}")
+    if stat_info.st_uid != owner_uid:
+        errors.append(f"crontab wrong owner: sudo chown root:root {target_path}")
+    else:
+        logger.debug("crontab correct owner:")
     return errors
 
 
-def get_line_content(file_path: str, line_number: int) -> str:
-    """Get line content from file"""
+def get_line_content(file_path: str, line_number: int, lines: Optional[Sequence[str]] = None) -> str:
+    """Get line content from already loaded lines or from file"""
+    if lines is not None:
+        if 1 <= line_number <= len(lines):
+            return lines[line_number - 1].rstrip("\n")
+        return ""
     try:
         with open(file_path, encoding="utf-8") as f:
             lines = f.readlines()
@@ -192,99 +367,170 @@ def check_dangerous_commands(command: str) -> List[str]:
 
 def check_minutes(minute: str, is_system_crontab: bool = False) -> List[str]:
     """Check minutes field validation"""
-    errors = []
-
-    # Handle dash prefix in minutes field (suppress syslog logging) - only for system crontab
-    original_minute = minute
-    if is_system_crontab and minute.startswith("-"):
-        minute = minute[1:]  # Remove the dash prefix
-
-    logic_errors = validate_time_field_logic(minute, "minutes", 0, 59)
-    if logic_errors:
-        errors.extend(logic_errors)
-    elif not re.match(MINUTE_PATTERN, minute):
-        errors.append(f"invalid minute format: '{original_minute}'")
-
-    return errors
+    return parse_field(MINUTE, minute, is_system_crontab)[1]
 
 
 def check_hours(hour: str) -> List[str]:
     """Check hours field validation"""
-    errors = []
-
-    logic_errors = validate_time_field_logic(hour, "hours", 0, 23)
-    if logic_errors:
-        errors.extend(logic_errors)
-    elif not re.match(HOUR_PATTERN, hour):
-        errors.append(f"invalid hour format: '{hour}'")
-
-    return errors
+    return parse_field(HOUR, hour)[1]
 
 
 def check_day_of_month(day: str) -> List[str]:
     """Check day of month field validation"""
-    errors = []
-
-    logic_errors = validate_time_field_logic(day, "day of month", 1, 31)
-    if logic_errors:
-        errors.extend(logic_errors)
-    elif not re.match(DAY_PATTERN, day):
-        errors.append(f"invalid day of month format: '{day}'")
-
-    return errors
+    return parse_field(DAY, day)[1]
 
 
 def check_month(month: str) -> List[str]:
     """Check month field validation"""
-    errors = []
-
-    logic_errors = validate_time_field_logic(month, "month", 1, 12)
-    if logic_errors:
-        errors.extend(logic_errors)
-    elif not re.match(MONTH_PATTERN, month):
-        errors.append(f"invalid month format: '{month}'")
-
-    return errors
+    return parse_field(MONTH, month)[1]
 
 
 def check_day_of_week(weekday: str) -> List[str]:
     """Check day of week field validation"""
-    errors = []
+    return parse_field(WEEKDAY, weekday)[1]
 
-    logic_errors = validate_time_field_logic(weekday, "day of week", 0, 7)
-    if logic_errors:
-        errors.extend(logic_errors)
-    elif not re.match(WEEKDAY_PATTERN, weekday):
-        errors.append(f"invalid day of week format: '{weekday}'")
 
-    return errors
+class UserDatabase:
+    """
+    Resolve user names once per run
+    Uses pwd.getpwnam, or a passwd file when one is given or pwd is unavailable.
+    Positive and negative answers are cached; hits and misses are counted for debug output.
+    A passwd file that cannot be read is tried once; the error is kept in passwd_error.
+    """
+
+    def __init__(self, passwd_file: Optional[str] = None) -> None:
+        self.passwd_file = passwd_file
+        self.cache: Dict[str, bool] = {}
+        self.hits = 0
+        self.misses = 0
+        self.passwd_error: Optional[OSError] = None
+        self._passwd_users: Optional[Set[str]] = None
+        self._passwd_mtime: Optional[int] = None
+
+    def configure(self, passwd_file: Optional[str] = None) -> None:
+        """Switch to another passwd file, read it now and drop cached answers; check passwd_error afterwards"""
+        self.passwd_file = passwd_file
+        self._reset_passwd()
+        self.clear()
+        if passwd_file is not None:
+            try:
+                self._passwd_users = load_passwd(passwd_file)
+            except OSError as e:
+                self.passwd_error = e
+
+    def refresh(self) -> None:
+        """Drop cached answers when the passwd file changed since the last call (long-running server)"""
+        try:
+            passwd_mtime: Optional[int] = os.stat(self.passwd_file or PASSWD_FILE).st_mtime_ns
+        except OSError:
+            passwd_mtime = None
+        if passwd_mtime != self._passwd_mtime:
+            self._passwd_mtime = passwd_mtime
+            self._reset_passwd()
+            self.clear()
+
+    def clear(self) -> None:
+        """Drop cached answers and reset counters"""
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.cache)}
+
+    def exists(self, username: str) -> bool:
+        """Check if user exists, answering repeated names from the cache"""
+        cached = self.cache.get(username)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        try:
+            found = self._lookup(username)
+        except OSError:
+            # Unreadable passwd file, reported once by _passwd_names: do not report users as missing
+            found = True
+        except Exception as e:
+            # Unknown answer: do not report the user as missing and do not cache
+            logging.warning(f"{type(e).__name__} {str(e)}\n{traceback.format_exc()}")
+            return True
+        self.cache[username] = found
+        return found
+
+    def names(self) -> Set[str]:
+        """All user names, read once from pwd.getpwall or the passwd file; raises OSError when the file cannot be read"""
+        if self.passwd_file is None and pwd is not None:
+            if self._passwd_users is None:
+                self._passwd_users = {entry.pw_name for entry in pwd.getpwall()}
+            return self._passwd_users
+        return self._passwd_names()
+
+    def _reset_passwd(self) -> None:
+        self._passwd_users = None
+        self.passwd_error = None
+
+    def _passwd_names(self) -> Set[str]:
+        # Read the passwd file on first use; a failure is logged once and raised again on later calls
+        if self.passwd_error is not None:
+            raise self.passwd_error
+        if self._passwd_users is None:
+            passwd_file = self.passwd_file or PASSWD_FILE
+            try:
+                self._passwd_users = load_passwd(passwd_file)
+            except OSError as e:
+                self.passwd_error = e
+                logger.warning(f"Failed to read passwd file {passwd_file}: {e}")
+                raise
+        return self._passwd_users
+
+    def _lookup(self, username: str) -> bool:
+        if self.passwd_file is None and pwd is not None:
+            try:
+                pwd.getpwnam(username)
+            except KeyError:
+                return False
+            return True
+        return username in self._passwd_names()
+
 
+def load_passwd(file_path: str = PASSWD_FILE) -> Set[str]:
+    """Read user names from a passwd(5) formatted file"""
+    users: Set[str] = set()
+    with open(file_path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            name = line.split(":", 1)[0].strip()
+            if name and not name.startswith(("#", "+", "-")):
+                users.add(name)
+    return users
 
-def check_user_exists(username: str) -> bool:
-    """Check if user exists in the system"""
+
+USER_DB = UserDatabase()
+
+
+def check_user_exists(username: str, users: Optional[AbstractSet[str]] = None) -> bool:
+    """Check if user exists in the system, or among users when given"""
     if username in ("root", "pytest_user"):  # users always exists for tests
         return True
-    try:
-        result = subprocess.run(["id", username], capture_output=True, text=True, timeout=5, check=False)
-        return result.returncode == 0
-    except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.SubprocessError):
-        return True
-    except Exception as e:
-        logging.warning(f"{type(e).__name__} {str(e)}\n{traceback.format_exc()}")
-        return True
+    if users is not None:
+        return username in users
+    return USER_DB.exists(username)
 
 
-def check_user(username: str) -> Tuple[List[str], List[str]]:
-    """Check user field validation"""
+def check_user(username: str, users: Optional[AbstractSet[str]] = None) -> Tuple[List[str], List[str]]:
+    """
+    Check user field validation
+    users: user names to check against instead of the system user database, such as those of a root filesystem
+    """
     errors: List[str] = []
     warnings: List[str] = []
     if not username or username.startswith("#") or '"' in username or "@" in username or " " in username or not re.compile(r"^[a-zA-Z][a-zA-Z0-9_-]{0,31}$").match(username):
         errors.append(f"invalid user format: '{username}'")
-    elif platform.system().lower() == "windows":
+    elif users is None and platform.system().lower() == "windows":
         # Skip user existence check on Windows
         return errors, warnings
     # Check if user exists in the system (only on Linux/macOS)
-    elif not check_user_exists(username):
+    elif not check_user_exists(username, users):
         # On Linux/macOS, log warning instead of error
         warnings.append(f"user does not exist: '{username}'")
     return errors, warnings
@@ -304,8 +550,8 @@ def check_command(command: str) -> List[str]:
     return errors
 
 
-def check_special(keyword: str, parts: List[str], is_system_crontab: bool = False) -> List[str]:
-    """Check special keyword validation"""
+def check_special(keyword: str, parts: List[str], is_system_crontab: bool = False, users: Optional[AbstractSet[str]] = None) -> List[str]:
+    """Check special keyword validation, with the user field checked against users when given"""
     errors: List[str] = []
 
     # Validate special keyword
@@ -323,7 +569,7 @@ def check_special(keyword: str, parts: List[str], is_system_crontab: bool = Fals
             command = " ".join(parts[2:])
 
             # Validate user field for system crontab
-            user_errors, user_warnings = check_user(user)
+            user_errors, user_warnings = check_user(user, users)
             errors.extend(user_errors)
             for warning in user_warnings:
                 logger.warning(f"{keyword} {' '.join(parts)} # {warning}")
@@ -343,48 +589,71 @@ def check_special(keyword: str, parts: List[str], is_system_crontab: bool = Fals
     return errors
 
 
+class LineSource:
+    """
+    Where checked lines come from: the name used in messages, the file path and its already loaded lines,
+    and the user names the user field is checked against (None: the system user database)
+    """
+
+    __slots__ = ("file_name", "file_path", "lines", "users")
+
+    def __init__(self, file_name: str, file_path: Optional[str] = None, lines: Optional[Sequence[str]] = None, users: Optional[AbstractSet[str]] = None) -> None:
+        self.file_name = file_name
+        self.file_path = file_path
+        self.lines = lines
+        self.users = users
+
+
+def line_diagnostics(errors: List[str], warnings: List[str], line: str, line_number: int, source: LineSource) -> Tuple[List[Diagnostic], List[Diagnostic]]:
+    """
+    Attach file name, line number and line content to error and warning messages
+    Line content is only looked up when there is something to report
+    """
+    if not errors and not warnings:
+        return [], []
+    line_content = get_line_content(source.file_path or "", line_number, source.lines) if source.lines is not None or source.file_path else line
+    line_content = clean_line_for_output(line_content)
+    error_diagnostics = [Diagnostic.on_line(source.file_name, line_number, error, line_content) for error in errors]
+    warning_diagnostics = [Diagnostic.on_line(source.file_name, line_number, warning, line_content, severity=SEVERITY_WARNING) for warning in warnings]
+    return error_diagnostics, warning_diagnostics
+
+
 def check_line(line: str, line_number: int, file_name: str, file_path: Optional[str] = None, is_system_crontab: bool = False) -> Tuple[List[str], List[str]]:
     """
     Check a single crontab line (user or system)
-    Returns: tuple of (errors, warnings)
+    Returns: tuple of (errors, warnings) as 'file (Line N): content # message' strings
+    """
+    errors, warnings, _ = check_entry(line, line_number, LineSource(file_name, file_path), is_system_crontab)
+    return [error.format() for error in errors], [warning.format() for warning in warnings]
+
+
+def check_entry(line: str, line_number: int, source: LineSource, is_system_crontab: bool = False) -> Tuple[List[Diagnostic], List[Diagnostic], Optional[CronExpression]]:
+    """
+    Check a single crontab line like check_line, keeping findings as Diagnostic records and the parsed schedule
+    source: file name for messages, plus the path or loaded lines the line content is taken from
+    Returns: tuple of (errors, warnings, expression); expression is None for
+    lines with errors, environment variables and @reboot
     """
     errors: List[str] = []
     warnings: List[str] = []
 
     # Skip environment variables
     if "=" in line and not any(char.isdigit() or char in "*@" for char in line.split("=")[0]):
-        return errors, warnings
+        return [], [], None
 
     # Check for special keywords
     if line.startswith("@"):
         parts = line.split()
         if len(parts) < SPECIAL_KEYWORD_MIN_FIELDS:
             errors.append(f"insufficient fields for special keyword (minimum {SPECIAL_KEYWORD_MIN_FIELDS} required)")
-            # Return errors with line number and content
-            formatted_errors = []
-            formatted_warnings = []
-            line_content = get_line_content(file_path, line_number) if file_path else line
-            line_content = clean_line_for_output(line_content)
-            for error in errors:
-                formatted_errors.append(f"{file_name} (Line {line_number}): {line_content} # {error}")
-            for warning in warnings:
-                formatted_warnings.append(f"{file_name} (Line {line_number}): {line_content} # {warning}")
-            return formatted_errors, formatted_warnings
+            return (*line_diagnostics(errors, warnings, line, line_number, source), None)
 
         keyword = parts[0]
-        special_errors = check_special(keyword, parts, is_system_crontab)
+        special_errors = check_special(keyword, parts, is_system_crontab, source.users)
         errors.extend(special_errors)
 
-        # Return errors with line number and content
-        formatted_errors = []
-        formatted_warnings = []
-        line_content = get_line_content(file_path, line_number) if file_path else line
-        line_content = clean_line_for_output(line_content)
-        for error in errors:
-            formatted_errors.append(f"{file_name} (Line {line_number}): {line_content} # {error}")
-        for warning in warnings:
-            formatted_warnings.append(f"{file_name} (Line {line_number}): {line_content} # {warning}")
-        return formatted_errors, formatted_warnings
+        expression = None if errors else CronExpression.from_keyword(keyword)
+        return (*line_diagnostics(errors, warnings, line, line_number, source), expression)
 
     # Parse regular crontab line
     parts = line.split()
@@ -392,16 +661,7 @@ def check_line(line: str, line_number: int, file_name: str, file_path: Optional[
 
     if len(parts) < min_fields:
         errors.append(f"insufficient fields (minimum {min_fields} required for {'system' if is_system_crontab else 'user'} crontab, found {len(parts)})")
-        # Return errors with line number and content
-        formatted_errors = []
-        formatted_warnings = []
-        line_content = get_line_content(file_path, line_number) if file_path else line
-        line_content = clean_line_for_output(line_content)
-        for error in errors:
-            formatted_errors.append(f"{file_name} (Line {line_number}): {line_content} # {error}")
-        for warning in warnings:
-            formatted_warnings.append(f"{file_name} (Line {line_number}): {line_content} # {warning}")
-        return formatted_errors, formatted_warnings
+        return (*line_diagnostics(errors, warnings, line, line_number, source), None)
 
     # Extract time fields and command
     minute, hour, day, month, weekday = parts[:5]
@@ -410,16 +670,7 @@ def check_line(line: str, line_number: int, file_name: str, file_path: Optional[
         # System crontab format: minute hour day month weekday user command
         if len(parts) < SYSTEM_CRONTAB_MIN_FIELDS:
             errors.append(f"insufficient fields (minimum {SYSTEM_CRONTAB_MIN_FIELDS} required for system crontab, found {len(parts)})")
-            # Return errors with line number and content
-            formatted_errors = []
-            formatted_warnings = []
-            line_content = get_line_content(file_path, line_number) if file_path else line
-            line_content = clean_line_for_output(line_content)
-            for error in errors:
-                formatted_errors.append(f"{file_name} (Line {line_number}): {line_content} # {error}")
-            for warning in warnings:
-                formatted_warnings.append(f"{file_name} (Line {line_number}): {line_content} # {warning}")
-            return formatted_errors, formatted_warnings
+            return (*line_diagnostics(errors, warnings, line, line_number, source), None)
 
         user = parts[5]
         command = " ".join(parts[6:])
@@ -427,35 +678,17 @@ def check_line(line: str, line_number: int, file_name: str, file_path: Optional[
         # Check for too many fields (more than 7) - but only if command doesn't contain spaces
         if len(parts) > SYSTEM_CRONTAB_MAX_FIELDS and " " not in command:
             errors.append(f"too many fields (maximum {SYSTEM_CRONTAB_MAX_FIELDS} required for system crontab, found {len(parts)})")
-            # Return errors with line number and content
-            formatted_errors = []
-            formatted_warnings = []
-            line_content = get_line_content(file_path, line_number) if file_path else line
-            line_content = clean_line_for_output(line_content)
-            for error in errors:
-                formatted_errors.append(f"{file_name} (Line {line_number}): {line_content} # {error}")
-            for warning in warnings:
-                formatted_warnings.append(f"{file_name} (Line {line_number}): {line_content} # {warning}")
-            return formatted_errors, formatted_warnings
+            return (*line_diagnostics(errors, warnings, line, line_number, source), None)
 
         # Check for extra fields in command (like "extra" in "root extra /usr/bin/backup.sh")
         if len(parts) > SYSTEM_CRONTAB_MAX_FIELDS:
             extra_field = parts[6]
             if extra_field == "extra":
                 errors.append(f"extra field '{extra_field}' in command")
-                # Return errors with line number and content
-                formatted_errors = []
-                formatted_warnings = []
-                line_content = get_line_content(file_path, line_number) if file_path else line
-                line_content = clean_line_for_output(line_content)
-                for error in errors:
-                    formatted_errors.append(f"{file_name} (Line {line_number}): {line_content} # {error}")
-                for warning in warnings:
-                    formatted_warnings.append(f"{file_name} (Line {line_number}): {line_content} # {warning}")
-                return formatted_errors, formatted_warnings
+                return (*line_diagnostics(errors, warnings, line, line_number, source), None)
 
         # Validate user field
-        user_errors, user_warnings = check_user(user)
+        user_errors, user_warnings = check_user(user, source.users)
         errors.extend(user_errors)
         warnings.extend(user_warnings)
     else:
@@ -466,33 +699,13 @@ def check_line(line: str, line_number: int, file_name: str, file_path: Optional[
     command_errors = check_command(command)
     errors.extend(command_errors)
 
-    # Validate time fields
-    minute_errors = check_minutes(minute, is_system_crontab)
-    errors.extend(minute_errors)
-
-    hour_errors = check_hours(hour)
-    errors.extend(hour_errors)
-
-    day_errors = check_day_of_month(day)
-    errors.extend(day_errors)
-
-    month_errors = check_month(month)
-    errors.extend(month_errors)
-
-    weekday_errors = check_day_of_week(weekday)
-    errors.extend(weekday_errors)
-
-    # Return errors with line number and content
-    formatted_errors = []
-    formatted_warnings = []
-    line_content = get_line_content(file_path, line_number) if file_path else line
-    line_content = clean_line_for_output(line_content)
-    for error in errors:
-        formatted_errors.append(f"{file_name} (Line {line_number}): {line_content} # {error}")
-    for warning in warnings:
-        formatted_warnings.append(f"{file_name} (Line {line_number}): {line_content} # {warning}")
+    # Validate time fields in a single parse
+    expression, time_errors = CronExpression.parse(minute, hour, day, month, weekday, is_system_crontab=is_system_crontab)
+    errors.extend(time_errors)
 
-    return formatted_errors, formatted_warnings
+    if errors:
+        expression = None
+    return (*line_diagnostics(errors, warnings, line, line_number, source), expression)
 
 
 # Legacy functions for backward compatibility
@@ -516,95 +729,14 @@ def check_line_special(line: str, line_number: int, file_name: str, file_path: O
     return errors
 
 
-def validate_time_field_logic(value: str, field_name: str, min_val: int, max_val: int) -> List[str]:
-    """Validate time field logic (ranges, lists, steps)"""
-    errors: List[str] = []
-
-    # Skip special values
-    if value in ["*"]:
-        return errors
-
-    # Handle lists (comma-separated values)
-    if "," in value:
-        parts = value.split(",")
-        seen_values = set()
-        for part in parts:
-            part_stripped = part.strip()
-            if not part_stripped:
-                errors.append(f"empty value in {field_name} list: '{value}'")
-                continue
-
-            # Check for duplicates
-            if part_stripped in seen_values:
-                errors.append(f"duplicate value '{part_stripped}' in {field_name} list: '{value}'")
-            seen_values.add(part_stripped)
-
-            # Validate individual part
-            part_errors = validate_single_time_value(part_stripped, field_name, min_val, max_val)
-            errors.extend(part_errors)
-    else:
-        # Validate single value or range or step
-        part_errors = validate_single_time_value(value, field_name, min_val, max_val)
-        errors.extend(part_errors)
-
-    return errors
-
-
-def validate_single_time_value(value: str, field_name: str, min_val: int, max_val: int) -> List[str]:
-    """Validate single time value, range, or step"""
-    errors: List[str] = []
-
-    # Handle steps (*/n)
-    if value.startswith("*/"):
-        step_part = value[2:]
-        if step_part.isdigit():
-            step_val = int(step_part)
-            if step_val <= 0:
-                errors.append(f"step value must be positive in {field_name}: '{value}'")
-            # Step can be any positive number - cron will handle it correctly
-            # Step should not exceed the maximum value for the field
-            if step_val > max_val:
-                errors.append(f"step value {step_val} exceeds maximum {max_val} for {field_name}: '{value}'")
-        else:
-            errors.append(f"invalid step value in {field_name}: '{value}'")
-        return errors
-
-    # Handle ranges (n-m)
-    if "-" in value:
-        range_parts = value.split("-")
-        if len(range_parts) == RANGE_PARTS_COUNT:
-            start_str, end_str = range_parts
-            if start_str.isdigit() and end_str.isdigit():
-                start_val = int(start_str)
-                end_val = int(end_str)
-
-                if start_val > end_val:
-                    errors.append(f"invalid range {start_val}-{end_val} in {field_name}: start > end")
-
-                if start_val < min_val or start_val > max_val:
-                    errors.append(f"range start {start_val} out of bounds ({min_val}-{max_val}) for {field_name}: '{value}'")
-
-                if end_val < min_val or end_val > max_val:
-                    errors.append(f"range end {end_val} out of bounds ({min_val}-{max_val}) for {field_name}: '{value}'")
-        return errors
-
-    # Handle single numeric values
-    if value.isdigit():
-        num_val = int(value)
-        if num_val < min_val or num_val > max_val:
-            errors.append(f"value {num_val} out of bounds ({min_val}-{max_val}) for {field_name}: '{value}'")
-
-    return errors
-
-
-def get_crontab(username: str) -> Optional[str]:
+def get_crontab(username: str, timeout: float = CRONTAB_TIMEOUT) -> Optional[str]:
     """
     Get user crontab content using 'crontab -l -u username'
     Returns the crontab content as string or None if not found/error
     """
     try:
         # Try to get user crontab using crontab command
-        result = subprocess.run(["crontab", "-l", "-u", username], capture_output=True, text=True, timeout=10, check=False)
+        result = subprocess.run(["crontab", "-l", "-u", username], capture_output=True, text=True, timeout=timeout, check=False)
 
         if result.returncode == 0:
             return result.stdout
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Module for structured check results
+"""
+
+from typing import Any, Dict, Optional
+
+SEVERITY_ERROR = "error"
+SEVERITY_WARNING = "warning"
+
+# Rule ids, also used as SARIF ruleId
+RULE_SYNTAX = "crontab-syntax-error"
+RULE_FILENAME = "crontab-filename"
+RULE_PERMISSIONS = "crontab-permissions"
+RULE_MISSING_NEWLINE = "crontab-missing-newline"
+RULE_FILE_ACCESS = "crontab-file-access"
+
+
+class Diagnostic:
+    """
+    One finding in a crontab file
+    file is the name shown in messages, line is 1-based (0 for file-level findings, None when
+    the finding has no location) and content is the cleaned line text, if it is shown.
+    Formatting into the text form happens only at output time.
+    """
+
+    __slots__ = ("file", "line", "column", "rule_id", "severity", "message", "content")
+
+    def __init__(self, file: str, line: Optional[int], message: str, severity: str = SEVERITY_ERROR, rule_id: str = RULE_SYNTAX) -> None:
+        self.file = file
+        self.line = line
+        self.column = 1
+        self.rule_id = rule_id
+        self.severity = severity
+        self.message = message
+        self.content: Optional[str] = None
+
+    @classmethod
+    def on_line(cls, file: str, line: int, message: str, content: str, severity: str = SEVERITY_ERROR) -> "Diagnostic":
+        """Syntax finding for a crontab line, shown together with the line content"""
+        diagnostic = cls(file, line, message, severity=severity)
+        diagnostic.content = content
+        return diagnostic
+
+    def format(self) -> str:
+        """Text form used in logs and JSON output: 'file (Line N): content # message'"""
+        if self.line is None:
+            return self.message
+        if self.content is None:
+            return f"{self.file} (Line {self.line}): {self.message}"
+        return f"{self.file} (Line {self.line}): {self.content} # {self.message}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict form for JSON storage"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Diagnostic":
+        """Rebuild a diagnostic stored with to_dict"""
+        diagnostic = cls(data["file"], data["line"], data["message"], severity=data["severity"], rule_id=data["rule_id"])
+        diagnostic.column = data["column"]
+        diagnostic.content = data["content"]
+        return diagnostic
+
+    def __str__(self) -> str:
+        return self.format()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Diagnostic):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self) -> str:
+        return f"Diagnostic({self.file!r}, {self.line!r}, {self.message!r}, severity={self.severity!r}, rule_id={self.rule_id!r})"
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Module for parsing crontab time fields into integer bitmasks
+"""
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+RANGE_PARTS_COUNT = 2
+FIELD_CACHE_SIZE = 4096
+
+# Field indexes
+MINUTE = 0
+HOUR = 1
+DAY = 2
+MONTH = 3
+WEEKDAY = 4
+
+# (name used in range messages, name used in format messages, min value, max value)
+FIELDS = (
+    ("minutes", "minute", 0, 59),
+    ("hours", "hour", 0, 23),
+    ("day of month", "day of month", 1, 31),
+    ("month", "month", 1, 12),
+    ("day of week", "day of week", 0, 7),
+)
+
+# Special keywords and the schedules they stand for (@reboot has none)
+KEYWORD_SCHEDULES = {
+    "@yearly": ("0", "0", "1", "1", "*"),
+    "@annually": ("0", "0", "1", "1", "*"),
+    "@monthly": ("0", "0", "1", "*", "*"),
+    "@weekly": ("0", "0", "*", "*", "0"),
+    "@daily": ("0", "0", "*", "*", "*"),
+    "@midnight": ("0", "0", "*", "*", "*"),
+    "@hourly": ("0", "*", "*", "*", "*"),
+}
+
+FEBRUARY = 2
+MARCH = 3
+# Days per month in a common year
+MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+# Sakamoto's month offsets for the day of week of a date
+MONTH_OFFSETS = (0, 3, 2, 5, 0, 3, 5, 1, 4, 6, 2, 4)
+# One copy of a 7-bit weekday pattern per week of a month (5 weeks cover 31 days)
+WEEK_REPEAT = sum(1 << (7 * week) for week in range(5))
+# The Gregorian calendar repeats every 400 years: a schedule that does not fire within them never does
+SEARCH_YEARS = 400
+
+
+def is_number(value: str) -> bool:
+    """Check value is a non-empty string of ASCII digits"""
+    return value.isdigit() and value.isascii()
+
+
+def is_field_number(field: int, value: str) -> bool:
+    """Check value is a number token accepted for the field (minutes allow a leading zero, other fields do not)"""
+    if not is_number(value):
+        return False
+    _, _, min_val, max_val = FIELDS[field]
+    if field == MINUTE:
+        return len(value) <= RANGE_PARTS_COUNT and int(value) <= max_val
+    return str(int(value)) == value and min_val <= int(value) <= max_val
+
+
+def is_field_step(field: int, value: str) -> bool:
+    """Check value is a step token accepted for the field (minute steps may be any number)"""
+    if field == MINUTE:
+        return is_number(value)
+    if field == WEEKDAY:
+        return len(value) == 1 and is_number(value) and int(value) <= FIELDS[WEEKDAY][3]
+    if not is_number(value) or str(int(value)) != value:
+        return False
+    return int(value) <= FIELDS[field][3] and (field == HOUR or int(value) >= 1)
+
+
+def range_mask(start: int, end: int, step: int, min_val: int) -> int:
+    """Bitmask with bits for start..end every step, bit 0 standing for min_val"""
+    mask = 0
+    for value in range(start, end + 1, step):
+        mask |= 1 << (value - min_val)
+    return mask
+
+
+def check_part_logic(field: int, part: str) -> List[str]:
+    """Range, bound and step errors for one list element"""
+    errors: List[str] = []
+    name, _, min_val, max_val = FIELDS[field]
+    if part.startswith("*/"):
+        step_part = part[2:]
+        if is_number(step_part):
+            step_val = int(step_part)
+            if step_val <= 0:
+                errors.append(f"step value must be positive in {name}: '{part}'")
+            if step_val > max_val:
+                errors.append(f"step value {step_val} exceeds maximum {max_val} for {name}: '{part}'")
+        else:
+            errors.append(f"invalid step value in {name}: '{part}'")
+        return errors
+    if "-" in part:
+        range_parts = part.split("-")
+        if len(range_parts) == RANGE_PARTS_COUNT and is_number(range_parts[0]) and is_number(range_parts[1]):
+            start_val, end_val = int(range_parts[0]), int(range_parts[1])
+            if start_val > end_val:
+                errors.append(f"invalid range {start_val}-{end_val} in {name}: start > end")
+            if start_val < min_val or start_val > max_val:
+                errors.append(f"range start {start_val} out of bounds ({min_val}-{max_val}) for {name}: '{part}'")
+            if end_val < min_val or end_val > max_val:
+                errors.append(f"range end {end_val} out of bounds ({min_val}-{max_val}) for {name}: '{part}'")
+        return errors
+    if is_number(part):
+        num_val = int(part)
+        if num_val < min_val or num_val > max_val:
+            errors.append(f"value {num_val} out of bounds ({min_val}-{max_val}) for {name}: '{part}'")
+    return errors
+
+
+def compile_part(field: int, part: str, is_only_part: bool) -> Tuple[Optional[int], List[str]]:
+    """
+    Compile one list element to a bitmask
+    Returns (None, []) when the element does not match the field format,
+    (None, errors) for well-formed elements that select nothing (zero step, reversed range)
+    """
+    name, _, min_val, max_val = FIELDS[field]
+    if part.startswith("*/"):
+        if not is_only_part or not is_field_step(field, part[2:]):
+            return None, []
+        return range_mask(min_val, max_val, int(part[2:]), min_val), []
+    span, has_step, step_str = part.partition("/")
+    if has_step and not is_field_step(field, step_str):
+        return None, []
+    start_str, is_range, end_str = span.partition("-")
+    if not is_field_number(field, start_str) or (is_range and not is_field_number(field, end_str)):
+        return None, []
+    step = int(step_str) if has_step else 1
+    if step == 0:
+        return None, [f"step value must be positive in {name}: '{part}'"]
+    start = int(start_str)
+    # A single number with a step runs to the end of the field, a single number alone selects itself
+    end = int(end_str) if is_range else max_val if has_step else start
+    if start > end:
+        return None, [f"invalid range {start}-{end} in {name}: start > end"]
+    return range_mask(start, end, step, min_val), []
+
+
+def compile_field(field: int, value: str, is_system_crontab: bool = False) -> Tuple[int, List[str]]:
+    """
+    Validate and compile a single time field in one pass
+    Returns: (bitmask, errors); bitmask is 0 when there are errors
+    """
+    name, format_name, min_val, max_val = FIELDS[field]
+    original_value = value
+    # Dash prefix in minutes field suppresses syslog logging - only for system crontab
+    if field == MINUTE and is_system_crontab and value.startswith("-"):
+        value = value[1:]
+    if value == "*":
+        return range_mask(min_val, max_val, 1, min_val), []
+
+    errors: List[str] = []
+    parts = value.split(",")
+    in_list = len(parts) > 1
+    seen_values = set()
+    for part in parts:
+        part_stripped = part.strip()
+        if in_list:
+            if not part_stripped:
+                errors.append(f"empty value in {name} list: '{value}'")
+                continue
+            if part_stripped in seen_values:
+                errors.append(f"duplicate value '{part_stripped}' in {name} list: '{value}'")
+            seen_values.add(part_stripped)
+        errors.extend(check_part_logic(field, part_stripped))
+    if errors:
+        return 0, errors
+
+    mask = 0
+    for index, part in enumerate(parts):
+        part_mask, part_errors = compile_part(field, part, not in_list)
+        # Day of week steps are only accepted on the first list element
+        if (part_mask is None and not part_errors) or (field == WEEKDAY and index > 0 and "/" in part):
+            return 0, [f"invalid {format_name} format: '{original_value}'"]
+        errors.extend(part_errors)
+        mask |= part_mask or 0
+    if errors:
+        return 0, errors
+    return mask, []
+
+
+class FieldCache:
+    """
+    Bounded LRU cache of compiled time fields keyed by (field, token, system crontab flag)
+    The same few tokens ('*', '0', '*/5', '1-5') make up most schedules, so repeated
+    tokens cost a dictionary lookup instead of a parse.
+    """
+
+    def __init__(self, maxsize: int = FIELD_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.entries: OrderedDict[Tuple[int, str, bool], Tuple[int, Tuple[str, ...]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def resize(self, maxsize: int) -> None:
+        """Change the number of kept entries (0 disables caching)"""
+        self.maxsize = maxsize
+        while len(self.entries) > max(maxsize, 0):
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop cached entries and reset counters"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries), "maxsize": self.maxsize}
+
+    def parse(self, field: int, value: str, is_system_crontab: bool = False) -> Tuple[int, List[str]]:
+        """compile_field with caching"""
+        # The system crontab flag only changes how minutes are read
+        key = (field, value, is_system_crontab and field == MINUTE)
+        cached = self.entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return cached[0], list(cached[1])
+        self.misses += 1
+        mask, errors = compile_field(field, value, is_system_crontab)
+        if self.maxsize > 0:
+            self.entries[key] = (mask, tuple(errors))
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return mask, errors
+
+
+FIELD_CACHE = FieldCache()
+
+
+def parse_field(field: int, value: str, is_system_crontab: bool = False) -> Tuple[int, List[str]]:
+    """
+    Validate and compile a single time field, answering repeated tokens from FIELD_CACHE
+    Returns: (bitmask, errors); bitmask is 0 when there are errors
+    """
+    return FIELD_CACHE.parse(field, value, is_system_crontab)
+
+
+def next_bit(mask: int, start: int) -> int:
+    """Lowest set bit of mask at or above start, -1 when there is none"""
+    rest = mask >> start
+    if not rest:
+        return -1
+    return start + (rest & -rest).bit_length() - 1
+
+
+def days_in_month(year: int, month: int) -> int:
+    """Number of days in a month (1-12) of the Gregorian calendar"""
+    if month == FEBRUARY and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return 29
+    return MONTH_DAYS[month - 1]
+
+
+def first_weekday(year: int, month: int) -> int:
+    """Day of week (0-6, Sunday = 0) of the first day of a month"""
+    if month < MARCH:
+        year -= 1
+    return (year + year // 4 - year // 100 + year // 400 + MONTH_OFFSETS[month - 1] + 1) % 7
+
+
+class CronExpression:
+    """
+    Five crontab time fields compiled to integer bitmasks
+    Bit n of each mask stands for the field minimum + n: minutes 60 bits, hours 24,
+    days of month 31, months 12, days of week 8 (both 0 and 7 are Sunday).
+    day_star/weekday_star record a field starting with '*', which selects
+    Vixie cron day matching: both day fields must match when either is starred,
+    otherwise either may match.
+    """
+
+    __slots__ = ("minutes", "hours", "days", "months", "weekdays", "day_star", "weekday_star")
+
+    def __init__(self, masks: Sequence[int], day_star: bool = False, weekday_star: bool = False) -> None:
+        self.minutes, self.hours, self.days, self.months, self.weekdays = masks
+        self.day_star = day_star
+        self.weekday_star = weekday_star
+
+    @classmethod
+    def parse(cls, *fields: str, is_system_crontab: bool = False) -> Tuple[Optional["CronExpression"], List[str]]:
+        """
+        Parse the five time fields (minute, hour, day, month, weekday) once
+        Returns: (expression or None, errors) with errors in field order
+        """
+        errors: List[str] = []
+        masks: List[int] = []
+        for field, value in enumerate(fields):
+            mask, field_errors = parse_field(field, value, is_system_crontab)
+            errors.extend(field_errors)
+            masks.append(mask)
+        if errors:
+            return None, errors
+        return cls(masks, day_star=fields[DAY].startswith("*"), weekday_star=fields[WEEKDAY].startswith("*")), errors
+
+    @classmethod
+    def from_keyword(cls, keyword: str) -> Optional["CronExpression"]:
+        """Expression for a special keyword such as @daily (None for @reboot and unknown keywords)"""
+        schedule = KEYWORD_SCHEDULES.get(keyword)
+        if schedule is None:
+            return None
+        expression, _ = cls.parse(*schedule)
+        return expression
+
+    @property
+    def weekday_mask(self) -> int:
+        """Day of week bitmask with 7 folded into 0 (7 bits, Sunday = bit 0)"""
+        return (self.weekdays | (self.weekdays >> 7)) & 0x7F
+
+    def values(self, field: int) -> List[int]:
+        """Sorted values selected in a field"""
+        mask = (self.minutes, self.hours, self.days, self.months, self.weekdays)[field]
+        min_val = FIELDS[field][2]
+        return [bit + min_val for bit in range(mask.bit_length()) if mask >> bit & 1]
+
+    def matches_day(self, day: int, weekday: int) -> bool:
+        """Check day of month (1-31) and day of week (0-6, Sunday = 0) using Vixie cron semantics"""
+        day_match = bool(self.days >> (day - 1) & 1)
+        weekday_match = bool(self.weekday_mask >> weekday & 1)
+        if self.day_star or self.weekday_star:
+            return day_match and weekday_match
+        return day_match or weekday_match
+
+    def matches(self, minute: int, hour: int, day: int, month: int, weekday: int) -> bool:
+        """Check if the expression fires at the given time (weekday 0-6, Sunday = 0)"""
+        return bool(self.minutes >> minute & 1 and self.hours >> hour & 1 and self.months >> (month - 1) & 1) and self.matches_day(day, weekday)
+
+    def month_days(self, year: int, month: int) -> int:
+        """Bit d - 1 set for every day d of the month the expression fires on, using Vixie cron semantics"""
+        start = first_weekday(year, month)
+        weekday_mask = self.weekday_mask
+        # Rotate so bit 0 is the weekday of the 1st, then repeat the pattern over the weeks of the month
+        weekday_days = (((weekday_mask >> start) | (weekday_mask << (7 - start))) & 0x7F) * WEEK_REPEAT
+        days = self.days & weekday_days if self.day_star or self.weekday_star else self.days | weekday_days
+        return days & ((1 << days_in_month(year, month)) - 1)
+
+    def next_fire(self, after: "datetime") -> Optional["datetime"]:
+        """
+        First time the expression fires strictly after the given time, None if it never fires
+        Jumps to the next selected month, day, hour and minute using the field bitmasks.
+        Times are wall-clock: seconds are dropped and tzinfo is kept without DST adjustment.
+        """
+        from datetime import datetime
+
+        year, month, day, hour, minute = after.year, after.month, after.day, after.hour, after.minute + 1
+        last_year = year + SEARCH_YEARS
+        while year <= last_year:
+            found = next_bit(self.months, month - 1)
+            if found < 0:
+                year, month, day, hour, minute = year + 1, 1, 1, 0, 0
+                continue
+            if found != month - 1:
+                month, day, hour, minute = found + 1, 1, 0, 0
+            found = next_bit(self.month_days(year, month), day - 1)
+            if found < 0:
+                month, day, hour, minute = month + 1, 1, 0, 0
+                continue
+            if found != day - 1:
+                day, hour, minute = found + 1, 0, 0
+            found = next_bit(self.hours, hour)
+            if found < 0:
+                day, hour, minute = day + 1, 0, 0
+                continue
+            if found != hour:
+                hour, minute = found, 0
+            found = next_bit(self.minutes, minute)
+            if found < 0:
+                hour, minute = hour + 1, 0
+                continue
+            return datetime(year, month, day, hour, found, tzinfo=after.tzinfo)
+        return None
+
+    def iter_fires(self, after: "datetime") -> Iterator["datetime"]:
+        """Fire times strictly after the given time in order (see next_fire); endless unless the expression never fires"""
+        current = self.next_fire(after)
+        while current is not None:
+            yield current
+            current = self.next_fire(current)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CronExpression):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"CronExpression({fields})"
@@ -3,62 +3,106 @@
 Main entry point for checkcrontab
 """
 
-import argparse
-import glob
-import json
 import logging
 import os
 import platform
 import re
 import sys
-import tempfile
+import time
 import traceback
-from typing import Any, Dict, List, Optional, Tuple
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-try:
-    # Use as python3 -m checkcrontab  # type: ignore
-    from . import __description__ as DESCRIPTION  # type: ignore
-    from . import __url__ as REPO_URL  # type: ignore
-    from . import __version__ as VERSION  # type: ignore
-    from . import checker  # type: ignore
-    from . import logger as log
-except ImportError:
-    # Use as python3 checkcrontab/main.py
-    try:
-        from checkcrontab import __description__ as DESCRIPTION
-        from checkcrontab import __url__ as REPO_URL
-        from checkcrontab import __version__ as VERSION
-        from checkcrontab import (
-            checker,  # type: ignore[import-not-found,no-redef]
-        )
-        from checkcrontab import (
-            logger as log,  # type: ignore[import-not-found,no-redef]
-        )
-    except Exception as e:
-        logging.warning(f"{type(e).__name__} {str(e)}\n{traceback.format_exc()}")
-        sys.exit(2)
+from typing import TYPE_CHECKING, AbstractSet, Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+from . import __description__ as DESCRIPTION
+from . import __version__ as VERSION
+from . import cache, checker, expression, server
+from . import logger as log
+from .diagnostic import RULE_FILE_ACCESS, RULE_FILENAME, RULE_MISSING_NEWLINE, RULE_PERMISSIONS, Diagnostic
+from .profiling import PHASES, PROFILER
+from .sarif import SarifWriter, gen_sarif_output  # noqa: F401
+
+if TYPE_CHECKING:
+    import argparse
+
+    from . import analyze
 
 logger = logging.getLogger(__name__)
 
-SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
-SARIF_VERSION = "2.1.0"
+PARALLEL_MIN_FILES = 8
+# Command line path for standard input and the name it is reported under
+STDIN_PATH = "-"
+STDIN_NAME = "<stdin>"
+STDIN_TWICE_ERROR = "Standard input (-) can only be given once, as a path or to -S or -U"
+# Threads looking up user crontabs at once, most of the time is spent waiting for `crontab -l`
+USER_JOBS = 16
+USERNAME_RE = r"^[a-zA-Z][a-zA-Z0-9_-]{0,31}$"
+# Cron spool directories holding one crontab per user, named after the user; the first one wins
+SPOOL_DIRS = ("/var/spool/cron/crontabs", "/var/spool/cron")
+# Root filesystems (--root) listed at once
+ROOT_JOBS = 8
+
+# (file_info, errors counted in totals, rows with errors counted in totals)
+CheckResult = Tuple[Dict[str, Any], List[Diagnostic], int]
+# (path or name, is_system_crontab, found by username, content held in memory or None to read the file,
+#  user names the user field is checked against or None for the system user database)
+CrontabSource = Tuple[str, bool, bool, Optional[str], Optional[FrozenSet[str]]]
+# check_path arguments: (crontab, output_format)
+CheckTask = Tuple[CrontabSource, str]
 
 
-def check_file(file_path: str, is_system_crontab: bool = False) -> Tuple[int, List[str]]:
+def check_file(
+    file_path: str, is_system_crontab: bool = False, schedules: Optional[List[Tuple[int, str, expression.CronExpression]]] = None, users: Optional[AbstractSet[str]] = None
+) -> Tuple[int, List[Diagnostic]]:
     """
     Check crontab file line by line
+    schedules: when given, (line number, line, parsed schedule) is appended for every valid line with a schedule
+    users: user names the user field is checked against instead of the system user database
     Returns: (rows_checked_count, errors_list)
     """
-    errors = []
-    rows_checked = 0
-
     try:
         with open(file_path) as f:
             lines = f.readlines()
     except Exception as e:
         logging.warning(f"{type(e).__name__} {str(e)}\n{traceback.format_exc()}")
-        return 0, [f"Error reading file: {e}"]
+        return 0, [Diagnostic(os.path.basename(file_path), None, f"Error reading file: {e}", rule_id=RULE_FILE_ACCESS)]
+    return check_lines(lines, file_path, is_system_crontab, schedules, users)
+
+
+def check_text(
+    text: str,
+    name: str = STDIN_NAME,
+    is_system_crontab: bool = False,
+    schedules: Optional[List[Tuple[int, str, expression.CronExpression]]] = None,
+    users: Optional[AbstractSet[str]] = None,
+) -> Tuple[int, List[Diagnostic]]:
+    """
+    Check crontab content held in memory, such as piped input or `crontab -l` output, reported under name
+    Line endings are read like a file opened in text mode.
+    Returns: (rows_checked_count, errors_list)
+    """
+    import io
+
+    return check_lines(io.StringIO(text, newline=None).readlines(), name, is_system_crontab, schedules, users)
+
+
+def check_lines(
+    lines: Iterable[str],
+    file_path: str,
+    is_system_crontab: bool = False,
+    schedules: Optional[List[Tuple[int, str, expression.CronExpression]]] = None,
+    users: Optional[AbstractSet[str]] = None,
+) -> Tuple[int, List[Diagnostic]]:
+    """
+    Check crontab lines, each with its line ending, reported under file_path
+    schedules: when given, (line number, line, parsed schedule) is appended for every valid line with a schedule
+    users: user names the user field is checked against instead of the system user database
+    Returns: (rows_checked_count, errors_list)
+    """
+    if not isinstance(lines, list):
+        lines = list(lines)
+    errors: List[Diagnostic] = []
+    rows_checked = 0
+    source = checker.LineSource(os.path.basename(file_path), file_path, lines, users)
+    started = time.perf_counter()
 
     i = 0
     while i < len(lines):
@@ -97,39 +141,39 @@ def check_file(file_path: str, is_system_crontab: bool = False) -> Tuple[int, Li
         # This is a line to check
         rows_checked += 1
 
-        # Check line using unified function with system crontab flag
-        line_errors, line_warnings = checker.check_line(line, line_number, os.path.basename(file_path), file_path, is_system_crontab=is_system_crontab)
-
-        # Output result immediately in order of processing
-        line_content = checker.get_line_content(file_path, line_number) if file_path else line
-        line_content = checker.clean_line_for_output(line_content)
+        # Check line using unified function with system crontab flag, reusing the loaded lines for output
+        line_errors, line_warnings, schedule = checker.check_entry(line, line_number, source, is_system_crontab=is_system_crontab)
+        if schedules is not None and schedule is not None and not line_errors:
+            schedules.append((line_number, line, schedule))
 
         if line_errors:
             # Output all errors for this line
             for error in line_errors:
-                logger.error(error)
+                logger.error(error.format())
             errors.extend(line_errors)
 
         if line_warnings:
             # Output all warnings for this line
             for warning in line_warnings:
-                logger.warning(warning)
+                logger.warning(warning.format())
         if logger.isEnabledFor(logging.DEBUG) and not line_errors and not line_warnings:
             # Output valid lines in debug mode
-            logger.debug(f"{os.path.basename(file_path)} (Line {line_number}): {line_content} # valid")
+            line_content = checker.clean_line_for_output(checker.get_line_content(file_path, line_number, lines))
+            logger.debug(f"{source.file_name} (Line {line_number}): {line_content} # valid")
 
     # Check if file ends with newline (RFC compliance)
     if lines and not lines[-1].endswith("\n"):
-        error_msg = f"{os.path.basename(file_path)} (Line {len(lines) + 1}): File should end with newline"
-        errors.append(error_msg)
-        logger.error(error_msg)
+        newline_error = Diagnostic(source.file_name, len(lines) + 1, "File should end with newline", rule_id=RULE_MISSING_NEWLINE)
+        errors.append(newline_error)
+        logger.error(newline_error.format())
 
+    if PROFILER.record_files:
+        PROFILER.add_file(file_path, rows_checked, len(lines), time.perf_counter() - started)
     return rows_checked, errors
 
 
 def find_user_crontab(username: str) -> Optional[str]:
-    """Find user crontab file path or get content via crontab command"""
-    # First try to find existing file
+    """Find user crontab file path"""
     possible_paths = [
         f"/var/spool/cron/crontabs/{username}",
         f"/var/spool/cron/{username}",
@@ -138,183 +182,931 @@ def find_user_crontab(username: str) -> Optional[str]:
     for path in possible_paths:
         if os.path.exists(path):
             return path
+    return None
 
-    # If no file found, try to get via crontab command
-    crontab_content = checker.get_crontab(username)
-    if crontab_content:
-        # Create temporary file with crontab content (context manager per SIM115)
-        with tempfile.NamedTemporaryFile(mode="w", suffix=f".{username}", delete=False) as tmp:
-            tmp.write(crontab_content)
-            temp_path = tmp.name
-        return temp_path
+
+def user_crontab(username: str, timeout: float = checker.CRONTAB_TIMEOUT) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Find a user crontab file, or else get its content via crontab command and keep it in memory
+    timeout: seconds to wait for the crontab command
+    Returns: (file path, None), (name, content) or None when the user has no crontab
+    """
+    path = find_user_crontab(username)
+    if path:
+        return path, None
+    content = checker.get_crontab(username, timeout)
+    if content:
+        return f"crontab -u {username} -l", content
     return None
 
 
-def gen_sarif_output(files_data: List[Dict[str, Any]], total_errors: int, total_warnings: int = 0) -> Dict[str, Any]:
-    """Generate SARIF format output"""
-    results = []
+def user_crontabs(
+    usernames: List[str], jobs: int = USER_JOBS, timeout: float = checker.CRONTAB_TIMEOUT, deadline: Optional[float] = None
+) -> Dict[str, Optional[Tuple[str, Optional[str]]]]:
+    """
+    Look up the crontabs of many users at once with a pool of `jobs` threads
+    timeout: seconds to wait for the crontab command of one user
+    deadline: seconds to wait for all users, the ones not looked up by then are reported as timed out
+    Returns: username -> user_crontab result, in the order of usernames
+    """
+    unique = list(dict.fromkeys(usernames))
+    found: Dict[str, Optional[Tuple[str, Optional[str]]]] = {}
+    if jobs <= 1 or len(unique) <= 1:
+        end = None if deadline is None else time.monotonic() + deadline
+        for username in unique:
+            if end is not None and time.monotonic() >= end:
+                logger.warning(f"Deadline passed before looking up the crontab of {username}")
+                found[username] = None
+            else:
+                found[username] = user_crontab(username, timeout)
+        return found
 
-    for file_data in files_data:
-        file_path = file_data["file"]
-        errors = file_data.get("errors", [])
+    import concurrent.futures
 
-        for error in errors:
-            # Parse error message to extract line number and message
-            line_match = re.search(r"Line (\d+):", error)
-            line_number = int(line_match.group(1)) if line_match else 1
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(jobs, len(unique)))
+    futures = [executor.submit(user_crontab, username, timeout) for username in unique]
+    try:
+        done, _ = concurrent.futures.wait(futures, timeout=deadline)
+    finally:
+        # Lookups not started yet are dropped; running ones end within the per-user timeout
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+    for username, future in zip(unique, futures):
+        if future in done:
+            found[username] = future.result()
+        else:
+            logger.warning(f"Deadline passed before looking up the crontab of {username}")
+            found[username] = None
+    return found
 
-            # Extract the actual error message
-            message_match = re.search(r"# (.+)$", error)
-            message = message_match.group(1) if message_match else error
 
-            result = {
-                "ruleId": "crontab-syntax-error",
-                "level": "error",
-                "message": {"text": message},
-                "locations": [{"physicalLocation": {"artifactLocation": {"uri": file_path}, "region": {"startLine": line_number, "startColumn": 1}}}],
-            }
-            results.append(result)
-
-    sarif_output = {
-        "$schema": SARIF_SCHEMA,
-        "version": SARIF_VERSION,
-        "runs": [
-            {
-                "tool": {
-                    "driver": {
-                        "name": "checkcrontab",
-                        "version": VERSION,
-                        "informationUri": REPO_URL,
-                    }
-                },
-                "results": results,
-            }
-        ],
-    }
+def scan_spool(spool_dirs: Iterable[str] = SPOOL_DIRS) -> Optional[List[Tuple[str, str]]]:
+    """
+    List the user crontabs in the cron spool with one directory read per spool directory
+    Returns: (username, path) sorted by spool directory and name, or None when a spool directory exists but cannot be read
+    """
+    found: Dict[str, str] = {}
+    unreadable = False
+    for spool_dir in spool_dirs:
+        try:
+            with os.scandir(spool_dir) as entries:
+                names = sorted((entry.name, entry.path) for entry in entries if entry.is_file(follow_symlinks=False))
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.warning(f"Failed to read cron spool {spool_dir}: {e}")
+            unreadable = True
+            continue
+        for name, path in names:
+            if not re.match(USERNAME_RE, name):
+                logger.debug(f"Skipping {path}: not named after a user")
+            elif name not in found:
+                found[name] = path
+    if unreadable and not found:
+        return None
+    return list(found.items())
 
-    return sarif_output
+
+def all_user_crontabs(args: "argparse.Namespace") -> List[Tuple[str, Optional[str]]]:
+    """
+    Crontabs of every user: spool files named after users in the passwd map,
+    or `crontab -l` output of every passwd user when the spool cannot be read
+    Returns: (path or name, content or None)
+    """
+    try:
+        users = checker.USER_DB.names()
+    except OSError as e:
+        logger.error(f"Failed to list users: {e}")
+        return []
+    spool = scan_spool(SPOOL_DIRS)
+    if spool is None:
+        logger.info("Cron spool is not readable, running crontab -l for every user")
+        found = user_crontabs(sorted(users), args.user_jobs, args.user_timeout, args.user_deadline)
+        return [result for result in found.values() if result]
+    crontabs: List[Tuple[str, Optional[str]]] = []
+    for username, path in spool:
+        if username in users:
+            crontabs.append((path, None))
+        else:
+            logger.warning(f"Skipping {path}: user {username} does not exist")
+    return crontabs
+
+
+def expand_roots(patterns: List[str]) -> List[str]:
+    """Root directories from --root values, glob patterns expanded in sorted order, as absolute paths without duplicates"""
+    import glob
+
+    roots: List[str] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.escape(pattern) != pattern else [pattern]
+        if not matches:
+            logger.warning(f"No directories match root {pattern}")
+        for match in matches:
+            if not checker.STAT_CACHE.get(match).is_dir():
+                logger.warning(f"Root {match} is not a directory")
+            elif os.path.abspath(match) not in roots:
+                roots.append(os.path.abspath(match))
+    return roots
+
+
+def root_crontabs(root: str) -> Tuple[List[CrontabSource], List[str]]:
+    """
+    Crontabs of a root filesystem such as an unpacked container image: etc/crontab and etc/cron.d,
+    and the spool directories, with spool owners and user fields checked against the root's own etc/passwd
+    Returns: (crontabs, warnings)
+    """
+    sources: List[CrontabSource] = []
+    try:
+        users: Optional[FrozenSet[str]] = frozenset(checker.load_passwd(os.path.join(root, "etc", "passwd")))
+    except OSError:
+        # Without a passwd file users cannot be checked against the root: the system user database
+        # is used for user fields and every spool file is taken
+        users = None
+    files, warnings = get_files(os.path.join(root, "etc", "crontab"))
+    cron_d_files, cron_d_warnings = get_files(os.path.join(root, "etc", "cron.d"))
+    warnings += cron_d_warnings
+    for file in files + cron_d_files:
+        sources.append((file, is_system_path(file, root), False, None, users))
+    spool = scan_spool([os.path.join(root, spool_dir.lstrip("/")) for spool_dir in SPOOL_DIRS])
+    if spool is None:
+        warnings.append(f"Failed to read the cron spool of {root}")
+        return sources, warnings
+    for username, path in spool:
+        if users is None or username in users:
+            sources.append((path, False, True, None, users))
+        else:
+            warnings.append(f"Skipping {path}: user {username} does not exist in {root}")
+    return sources, warnings
+
+
+def roots_crontabs(roots: List[str], jobs: int = ROOT_JOBS) -> List[CrontabSource]:
+    """Crontabs of many root filesystems, listed in a thread pool and returned root by root in the given order"""
+    if jobs > 1 and len(roots) > 1:
+        import concurrent.futures
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(jobs, len(roots))) as executor:
+            found = list(executor.map(root_crontabs, roots))
+    else:
+        found = [root_crontabs(root) for root in roots]
+    sources: List[CrontabSource] = []
+    for root, (root_sources, warnings) in zip(roots, found):
+        for warning in warnings:
+            logger.warning(warning)
+        if not root_sources:
+            logger.warning(f"No crontabs found under root {root}")
+        sources += root_sources
+    return sources
 
 
 def get_files(path: str) -> Tuple[List[str], List[str]]:
-    """Get list of files from path (file or directory)"""
+    """
+    Get list of files from path (file or directory)
+    Directory entries are kept in checker.STAT_CACHE, so later checks stat each file at most once (twice for a symlink)
+    """
     files = []
     errors = []
-    if not os.path.exists(path):
+    snapshot = checker.STAT_CACHE.get(path)
+    if not snapshot.exists():
         # Path does not exist; no files to add.
         pass
-    elif os.path.isfile(path):
+    elif snapshot.is_file():
         files.append(path)
-    elif os.path.isdir(path):
-        for file in glob.glob(os.path.join(path, "*")):
-            if os.path.isfile(file):
-                base = os.path.basename(file)
-                error = checker.check_filename(base)
+    elif snapshot.is_dir():
+        try:
+            with os.scandir(path) as entries:
+                # Hidden files are skipped like by the shell pattern "*"
+                listing = [entry for entry in entries if not entry.name.startswith(".")]
+        except OSError as e:
+            logger.debug(f"Failed to list {path}: {e}")
+            listing = []
+        for entry in listing:
+            if entry.is_file():
+                error = checker.check_filename(entry.name)
                 if not error:
-                    files.append(file)
+                    checker.STAT_CACHE.add(entry)
+                    files.append(entry.path)
                 else:
                     errors.append(error)
     return files, errors
 
 
-def main() -> int:
-    """Main function"""
-    parser = argparse.ArgumentParser(
-        description=DESCRIPTION,
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Usage examples:
-    %(prog)s                                  # Check system crontab
-    %(prog)s filename                         # Check system and file crontab
-    %(prog)s username                         # Check system and user crontab
-    %(prog)s file1 file2 username             # Check multiple files and user crontab
-    %(prog)s -S file1 -U file2 -u username    # Check crontab with type flags
-    %(prog)s -u username1 -u username2        # Check specific usernames
-    %(prog)s filename -j | jq '.total_errors' # Check crontab and return JSON
-        """,
-    )
+def error_lines(errors: List[Diagnostic]) -> Set[int]:
+    """Line numbers with errors; the missing final newline is not a line of its own"""
+    return {error.line for error in errors if error.line is not None and error.rule_id != RULE_MISSING_NEWLINE}
 
-    parser.add_argument("arguments", nargs="*", help="Paths to crontab files or usernames")
-    parser.add_argument("-S", "--system", action="append", metavar="FILENAME", help="System crontab files")
-    parser.add_argument("-U", "--user", action="append", metavar="FILENAME", help="User crontab files")
-    parser.add_argument("-u", "--username", action="append", metavar="USERNAME", help="Usernames to check")
-    parser.add_argument("-v", "--version", action="version", version="%(prog)s " + VERSION)
+
+def check_path(source: CrontabSource, output_format: str = "text") -> CheckResult:
+    """
+    Run filename, owner/permission and syntax checks for a single crontab file
+    source: (path, is_system_crontab, by_username, content, users) as returned by collect_files
+    by_username: the crontab was found by username, so it is named after its user rather than by cron.d rules
+    With content, the crontab is checked from memory under the name path and file checks are skipped
+    Returns: (file_info, errors counted in totals, rows with errors counted in totals)
+    """
+    path, is_system_crontab, by_username, content, users = source
+    snapshot = checker.STAT_CACHE.get(path) if content is None else None
+    if snapshot is not None and not snapshot.exists():
+        file_info = {
+            "file": path,
+            "is_system_crontab": is_system_crontab,
+            "rows": 0,
+            "rows_warnings": 0,
+            "warnings_count": 0,
+            "rows_errors": 0,
+            "errors_count": 1,
+            "errors": [Diagnostic(os.path.basename(path), None, f"File {path} does not exist", rule_id=RULE_FILE_ACCESS)],
+            "success": False,
+        }
+        if output_format == "text":
+            logger.warning(f"File {path} does not exist")
+        return file_info, [], 0
+    if not by_username and content is None:
+        base = os.path.basename(path)
+        error = checker.check_filename(base)
+        if error:
+            filename_error = Diagnostic(os.path.basename(path), 0, error, rule_id=RULE_FILENAME)
+            file_info = {
+                "file": path,
+                "is_system_crontab": is_system_crontab,
+                "rows": 0,
+                "rows_warnings": 0,
+                "warnings_count": 0,
+                "rows_errors": 1,
+                "errors_count": 1,
+                "errors": [filename_error],
+                "success": False,
+            }
+            if output_format == "text":
+                logger.error(error)
+            return file_info, [filename_error], 0
+    file_level_errors: List[Diagnostic] = []
+    if platform.system().lower() == "linux" and is_system_crontab and content is None:
+        with PROFILER.phase("permission_checks"):
+            errors = checker.check_owner_and_permissions(path, snapshot=snapshot)
+        for err in errors:
+            permission_error = Diagnostic(os.path.basename(path), 0, err, rule_id=RULE_PERMISSIONS)
+            logger.error(permission_error.format())
+            file_level_errors.append(permission_error)
+
+    with PROFILER.phase("parsing"):
+        if content is None:
+            rows_checked, file_errors = check_file(path, is_system_crontab=is_system_crontab, users=users)
+        else:
+            rows_checked, file_errors = check_text(content, path, is_system_crontab=is_system_crontab, users=users)
+
+    if file_level_errors:
+        file_errors = file_errors + file_level_errors
+
+    # Note: warnings are logged directly in check_file, so we don't need to track them here
+    rows_errors = len(error_lines(file_errors))
+    file_info = {
+        "file": path,
+        "is_system_crontab": is_system_crontab,
+        "rows": rows_checked,
+        "rows_warnings": 0,
+        "warnings_count": 0,
+        "rows_errors": rows_errors,
+        "errors_count": len(file_errors),
+        "errors": file_errors,
+        "success": len(file_errors) == 0,
+    }
+    # Standard output
+    if output_format == "text" and len(file_errors) > 0:
+        logger.error(f"{path}: {rows_errors}/{rows_checked} lines with errors. Total {len(file_errors)} errors.")
+    elif output_format == "text":
+        logger.info(f"{path}: 0/{rows_checked} lines without errors. No errors.")
+    return file_info, file_errors, rows_errors
+
+
+class RecordCollector(logging.Handler):
+    """Logging handler that keeps records so a worker process can hand them back to the parent"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Render the message now and drop anything that may not pickle
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        self.records.append(record)
+
+
+def encode_result(result: CheckResult) -> List[Any]:
+    """JSON-compatible form of a check result for the result cache"""
+    file_info, counted_errors, counted_rows_errors = result
+    return [{**file_info, "errors": [error.to_dict() for error in file_info["errors"]]}, [error.to_dict() for error in counted_errors], counted_rows_errors]
+
+
+def decode_result(data: List[Any]) -> CheckResult:
+    """Rebuild a check result stored with encode_result"""
+    file_info, counted_errors, counted_rows_errors = data
+    file_info["errors"] = [Diagnostic.from_dict(error) for error in file_info["errors"]]
+    return file_info, [Diagnostic.from_dict(error) for error in counted_errors], counted_rows_errors
+
+
+def check_path_worker(task: Tuple[CrontabSource, str, int, Optional[str]]) -> Tuple[CheckResult, List[logging.LogRecord]]:
+    """
+    Run check_path collecting log records instead of printing them
+    With a cache directory, results and their log records are served from and stored in the result cache
+    """
+    source, output_format, level, cache_dir = task
+    path, is_system_crontab, by_username, content, users = source
+    result_cache = cache.ResultCache(cache_dir) if cache_dir and not by_username and content is None else None
+    # A root's user names are part of the key, the system user database is covered by the passwd file
+    extra = () if users is None else (sorted(users),)
+    key = result_cache.key(path, is_system_crontab, output_format, level, *extra, snapshot=checker.STAT_CACHE.get(path)) if result_cache else None
+    if result_cache and key:
+        entry = result_cache.get(key)
+        if entry is not None:
+            records = [logging.makeLogRecord({"name": name, "levelno": levelno, "levelname": logging.getLevelName(levelno), "msg": msg}) for name, levelno, msg in entry["logs"]]
+            result = decode_result(entry["result"])
+            if PROFILER.record_files:
+                PROFILER.add_cached_file(path, result[0]["rows"])
+            return result, records
+    root_logger = logging.getLogger()
+    collector = RecordCollector()
+    saved_handlers, saved_level = root_logger.handlers[:], root_logger.level
+    root_logger.handlers = [collector]
+    root_logger.setLevel(level)
+    try:
+        result = check_path(source, output_format)
+    finally:
+        root_logger.handlers = saved_handlers
+        root_logger.setLevel(saved_level)
+    if result_cache and key:
+        result_cache.put(key, {"result": encode_result(result), "logs": [[record.name, record.levelno, record.getMessage()] for record in collector.records]})
+    return result, collector.records
+
+
+def check_path_pool_worker(
+    task: Tuple[CrontabSource, str, int, Optional[str]],
+) -> Tuple[CheckResult, List[logging.LogRecord], Tuple[Dict[str, float], List[Dict[str, Any]]]]:
+    """check_path_worker in a worker process, also returning the phase times and file records to merge into the parent's PROFILER"""
+    mark = PROFILER.mark()
+    result, records = check_path_worker(task)
+    return result, records, PROFILER.since(mark)
+
+
+def replay_records(records: List[logging.LogRecord]) -> None:
+    """Emit log records collected by check_path_worker through the local handlers"""
+    for record in records:
+        logging.getLogger(record.name).handle(record)
+
+
+def resolve_jobs(jobs: int, files_count: int) -> int:
+    """Resolve --jobs value (0 = CPU count) to the number of worker processes to use"""
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    if files_count < PARALLEL_MIN_FILES:
+        # Process start-up costs more than checking a handful of files
+        return 1
+    return max(1, min(jobs, files_count))
+
+
+def init_worker(passwd_file: Optional[str], field_cache_size: int, record_files: bool = False) -> None:
+    """Apply run-wide checker settings in a freshly started worker process"""
+    checker.USER_DB.configure(passwd_file)
+    expression.FIELD_CACHE.resize(field_cache_size)
+    PROFILER.start(record_files=record_files)
+
+
+def iter_check_paths(tasks: List[CheckTask], jobs: int = 1, cache_dir: Optional[str] = None) -> Iterator[CheckResult]:
+    """
+    Check files serially or across a process pool, optionally through the result cache
+    Results are yielded and their log output replayed in input order as soon as each file is done
+    """
+    level = logging.getLogger().getEffectiveLevel()
+    worker_tasks = [(*task, level, cache_dir) for task in tasks]
+    done = 0
+    if jobs > 1:
+        import concurrent.futures
+        import concurrent.futures.process
+
+        try:
+            # Waiting for the workers is charged to parsing here, their own phase times are summed apart
+            with PROFILER.phase("parsing"), concurrent.futures.ProcessPoolExecutor(
+                max_workers=jobs, initializer=init_worker, initargs=(checker.USER_DB.passwd_file, expression.FIELD_CACHE.maxsize, PROFILER.record_files)
+            ) as executor:
+                for result, records, timings in executor.map(check_path_pool_worker, worker_tasks, chunksize=max(1, len(tasks) // (jobs * 4))):
+                    replay_records(records)
+                    PROFILER.merge(*timings)
+                    done += 1
+                    yield result
+        except (OSError, concurrent.futures.process.BrokenProcessPool) as e:
+            logger.debug(f"Parallel check unavailable ({type(e).__name__}: {e}), checking remaining files serially")
+    for worker_task in worker_tasks[done:]:
+        if cache_dir:
+            result, records = check_path_worker(worker_task)
+            replay_records(records)
+            yield result
+        else:
+            yield check_path(*worker_task[:2])
+
+
+def check_paths(tasks: List[CheckTask], jobs: int = 1, cache_dir: Optional[str] = None) -> List[CheckResult]:
+    """Check files like iter_check_paths and return all results"""
+    return list(iter_check_paths(tasks, jobs, cache_dir))
+
+
+class Summary:
+    """Running totals over per-file check results, also per root filesystem when roots are given"""
+
+    def __init__(self, keep_files: bool = True, roots: Optional[List[str]] = None) -> None:
+        self.keep_files = keep_files
+        self.roots: Dict[str, Dict[str, Any]] = {root: {"root": root, "total_files": 0, "total_rows": 0, "total_errors": 0} for root in roots or []}
+        self.files: List[Dict[str, Any]] = []
+        self.total_files = 0
+        self.total_rows = 0
+        self.total_rows_errors = 0
+        self.total_errors = 0
+        self.total_warnings = 0
+        self.error_lines: Set[int] = set()
+
+    def add(self, result: CheckResult) -> None:
+        """Count one file's result"""
+        file_info, counted_errors, counted_rows_errors = result
+        if self.keep_files:
+            self.files.append(file_info)
+        self.total_files += 1
+        self.total_rows += file_info["rows"]
+        self.total_rows_errors += counted_rows_errors
+        self.total_errors += len(counted_errors)
+        self.error_lines |= error_lines(counted_errors)
+        root = self.root_of(file_info["file"])
+        if root is not None:
+            self.roots[root]["total_files"] += 1
+            self.roots[root]["total_rows"] += file_info["rows"]
+            self.roots[root]["total_errors"] += len(counted_errors)
+
+    def root_of(self, path: str) -> Optional[str]:
+        """Innermost root the file is in, None when it is not under any"""
+        found = None
+        for root in self.roots:
+            if path.startswith(root.rstrip(os.sep) + os.sep) and (found is None or len(root) > len(found)):
+                found = root
+        return found
+
+    def output_data(self) -> Dict[str, Any]:
+        """Build the output document (without files when they are not kept)"""
+        output_data: Dict[str, Any] = {
+            "success": self.total_errors == 0,
+            "total_files": self.total_files,
+            "total_rows": self.total_rows,
+            "total_rows_errors": self.total_rows_errors,
+            "total_errors": self.total_errors,
+            "total_warnings": self.total_warnings,
+        }
+        if self.keep_files:
+            output_data["files"] = self.files
+        output_data["rows_errors"] = len(self.error_lines)
+        if self.roots:
+            output_data["roots"] = [{**totals, "success": totals["total_errors"] == 0} for totals in self.roots.values()]
+        return output_data
+
+
+def summarize(results: Iterable[CheckResult]) -> Dict[str, Any]:
+    """Build the output document from per-file check results"""
+    summary = Summary()
+    for result in results:
+        summary.add(result)
+    return summary.output_data()
+
+
+def write_jsonl(record: Dict[str, Any]) -> None:
+    """Print one compact JSON Lines record"""
+    import json
+
+    print(json.dumps(record, separators=(",", ":"), default=str), flush=True)
+
+
+def timings_block(started: float) -> Dict[str, Any]:
+    """
+    Wall time per run phase and parse time per file since started
+    With worker processes, parsing is the time spent waiting for them and worker_phases their summed phase times.
+    Files served from the result cache are listed with cached set and no parse time.
+    """
+    phases = PROFILER.elapsed()
+    files = [
+        entry if entry["cached"] else {**entry, "parse_s": round(entry["parse_s"], 6), "lines_per_s": round(entry["lines"] / entry["parse_s"]) if entry["parse_s"] > 0 else None}
+        for entry in PROFILER.files
+    ]
+    lines = sum(entry["lines"] for entry in PROFILER.files if not entry["cached"])
+    parsing_s = phases.get("parsing", 0.0)
+    block: Dict[str, Any] = {
+        "total_s": round(time.perf_counter() - started, 6),
+        "phases": {name: round(phases.get(name, 0.0), 6) for name in PHASES},
+        "lines": lines,
+        "lines_per_s": round(lines / parsing_s) if parsing_s > 0 else None,
+        "files": files,
+    }
+    if PROFILER.worker_times:
+        block["worker_phases"] = {name: round(PROFILER.worker_times.get(name, 0.0), 6) for name in PHASES if name in PROFILER.worker_times}
+    return block
+
+
+def render_output(output_data: Dict[str, Any], output_format: str, timings: Optional[Callable[[], Dict[str, Any]]] = None) -> None:
+    """
+    Print the output document in the selected format (text goes to the log)
+    timings: called last, its result is added as the "timings" key of the JSON document
+    """
+    if output_format == "jsonl":
+        for file_info in output_data["files"]:
+            write_jsonl({"type": "file", **file_info})
+        write_jsonl({"type": "summary", **{key: value for key, value in output_data.items() if key != "files"}})
+    elif output_format == "sarif":
+        with SarifWriter(sys.stdout) as writer:
+            for file_info in output_data["files"]:
+                writer.add_file(file_info)
+    elif output_format == "json":
+        import json
+
+        if timings is not None:
+            output_data = {**output_data, "timings": timings()}
+        print(json.dumps(output_data, indent=2, default=str), flush=True)
+    # Standard output
+    else:
+        for totals in output_data.get("roots", []):
+            (logger.info if totals["success"] else logger.error)(f"Root {totals['root']}: {totals['total_errors']} errors in {totals['total_files']} files")
+        if output_data["total_errors"] == 0:
+            logger.info("All checks passed successfully!")
+        else:
+            logger.error(f"Total: {output_data['rows_errors']} lines with errors found in {output_data['total_rows']} checked lines")
+
+
+def is_system_path(full_path: str, root: Optional[str] = None) -> bool:
+    """Guess crontab type from an absolute path, or from its path inside a root filesystem"""
+    if root is not None:
+        full_path = "/" + os.path.relpath(full_path, root)
+    return bool(full_path == "/etc/crontab" or full_path.startswith("/etc/cron.d") or "system" in os.path.basename(full_path))
+
+
+def watch_files(args: "argparse.Namespace", cache_dir: Optional[str] = None) -> int:
+    """Re-check crontab files and directories from the command line whenever they change"""
+    # Watched path -> crontab type (None: guess from the changed file path)
+    targets: Dict[str, Optional[bool]] = {}
+    for path in args.system or []:
+        if path != STDIN_PATH:
+            targets[os.path.abspath(path)] = True
+    for path in args.user or []:
+        if path != STDIN_PATH:
+            targets[os.path.abspath(path)] = False
+    for path in args.arguments:
+        if path != STDIN_PATH and os.path.exists(path):
+            targets[os.path.abspath(path)] = None
+    if not targets:
+        logger.error("Watch mode needs crontab files or directories to watch")
+        return 2
+
+    def on_change(path: str) -> None:
+        is_system_crontab = targets.get(path, targets.get(os.path.dirname(path)))
+        if path not in targets and checker.check_filename(os.path.basename(path)):
+            # cron ignores such names in crontab directories (editor backups, temporary files)
+            logger.debug(f"{path}: ignored by cron, not checked")
+            return
+        if is_system_crontab is None:
+            is_system_crontab = is_system_path(path)
+        checker.STAT_CACHE.clear()
+        render_output(summarize(check_paths([((path, is_system_crontab, False, None, None), args.format)], cache_dir=cache_dir)), args.format)
+
+    from . import watch
+
+    try:
+        watch.watch_paths(list(targets), on_change)
+    except OSError as e:
+        logger.error(f"Watch mode is not available: {e}")
+        return 2
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def serve_main(argv: List[str]) -> int:
+    """Run the resident checker server (checkcrontab serve --socket PATH)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="checkcrontab serve", description="Answer check requests over a Unix socket, keeping caches warm between checks")
+    parser.add_argument("--socket", metavar="PATH", default=os.environ.get(server.SOCKET_ENV), help=f"Unix socket path (default: ${server.SOCKET_ENV})")
     parser.add_argument("-d", "--debug", action="store_true", help="Debug output")
     parser.add_argument("-n", "--no-colors", action="store_true", help="Disable colored output")
-    parser.add_argument("--format", choices=["text", "json", "sarif"], default="text", help="Output format (default: text)")
-    parser.add_argument("-j", dest="format", action="store_const", const="json", help="Shortcut for JSON output (same as --format json)")
-    parser.add_argument("--strict", action="store_true", help="Treat warnings as errors")
-    parser.add_argument("--exit-zero", action="store_true", help="Always exit with code 0")
+    args = parser.parse_args(argv)
+    log.setup_logging(args.debug, args.no_colors)
+    if not args.socket:
+        logger.error(f"Socket path is required: use --socket PATH or set ${server.SOCKET_ENV}")
+        return 2
 
-    args = parser.parse_args()
+    def run_request(request_argv: List[str]) -> int:
+        checker.USER_DB.refresh()
+        return run(request_argv)
 
-    # Setup logging
-    log.setup_logging(args.debug, args.no_colors, args.format in ["json", "sarif"])
+    try:
+        server.serve(args.socket, run_request)
+    except OSError as e:
+        logger.error(f"Failed to start server: {e}")
+        return 2
+    except KeyboardInterrupt:
+        pass
+    return 0
 
-    # Prepare list of files to check with their types
-    files_list: List[Tuple[str, bool]] = []  # (file_path, is_system_crontab)
-    files_temp: List[str] = []  # Track temporary files for cleanup
+
+def add_file_arguments(parser: "argparse.ArgumentParser") -> None:
+    """Arguments selecting the crontabs to read, resolved by collect_files"""
+    parser.add_argument("arguments", nargs="*", help="Paths to crontab files or usernames, - for standard input")
+    parser.add_argument("-S", "--system", action="append", metavar="FILENAME", help="System crontab files (- for standard input)")
+    parser.add_argument("-U", "--user", action="append", metavar="FILENAME", help="User crontab files (- for standard input)")
+    parser.add_argument("-u", "--username", action="append", metavar="USERNAME", help="Usernames to check")
+    parser.add_argument(
+        "--root",
+        action="append",
+        metavar="DIR",
+        help="Check etc/crontab, etc/cron.d and the cron spool under DIR, a root filesystem such as an unpacked container image (repeatable, glob patterns allowed)",
+    )
+    parser.add_argument("--all-users", action="store_true", help="Check the crontabs of all users found in the cron spool")
+    parser.add_argument("--user-jobs", type=int, default=USER_JOBS, metavar="N", help=f"Number of user crontabs looked up at once (default: {USER_JOBS})")
+    parser.add_argument(
+        "--user-timeout", type=float, default=checker.CRONTAB_TIMEOUT, metavar="SECONDS", help=f"Time limit for the crontab command of one user (default: {checker.CRONTAB_TIMEOUT})"
+    )
+    parser.add_argument("--user-deadline", type=float, metavar="SECONDS", help="Time limit for looking up all user crontabs (default: none)")
+
+
+def stdin_given_twice(args: "argparse.Namespace") -> bool:
+    """Whether - (standard input) is given more than once among the paths, -S and -U; it can only be read once"""
+    return [*args.arguments, *(args.system or []), *(args.user or [])].count(STDIN_PATH) > 1
+
+
+def is_file_or_dir(path: str) -> bool:
+    """Command line argument names a file or directory rather than a username"""
+    snapshot = checker.STAT_CACHE.get(path)
+    return snapshot.is_file() or snapshot.is_dir()
+
+
+def collect_files(args: "argparse.Namespace", roots: Optional[List[str]] = None) -> List[CrontabSource]:
+    """
+    Resolve the command line paths, directories, usernames and root filesystems to crontabs
+    Standard input and `crontab -l` output are read into memory, nothing is written to disk
+    roots: --root values already expanded by expand_roots
+    Returns: list of (path or name, is_system_crontab, found by username, content or None, users or None) without duplicates
+    """
+    # Stat results are reused from here until the files are checked, taken afresh on every run
+    checker.STAT_CACHE.clear()
+    # Prepare list of crontabs to check with their types
+    files_list: List[CrontabSource] = []
+
+    # Look up all usernames at once; the results are added below in command line order
+    usernames = list(args.username or [])
+    usernames += [path for path in args.arguments if path != STDIN_PATH and not is_file_or_dir(path) and re.match(USERNAME_RE, path)]
+    found_users = user_crontabs(usernames, args.user_jobs, args.user_timeout, args.user_deadline) if usernames else {}
 
     # Add files with explicit flags
     if args.system:
         for path in args.system:
-            if os.path.isdir(path):
+            if path == STDIN_PATH:
+                files_list.append((STDIN_NAME, True, False, sys.stdin.read(), None))
+            elif checker.STAT_CACHE.get(path).is_dir():
                 files, warnings = get_files(path)
                 for warning in warnings:
                     logger.warning(warning)
                 for file in files:
-                    files_list.append((file, True))
+                    files_list.append((file, True, False, None, None))
             else:
-                files_list.append((path, True))
+                files_list.append((path, True, False, None, None))
 
     if args.user:
         for path in args.user:
-            files_list.append((path, False))
+            if path == STDIN_PATH:
+                files_list.append((STDIN_NAME, False, False, sys.stdin.read(), None))
+            else:
+                files_list.append((path, False, False, None, None))
 
     # Add usernames with explicit flag
     if args.username:
         for username in args.username:
-            crontab_path = find_user_crontab(username)
-            if crontab_path:
-                files_temp.append(crontab_path)
-                files_list.append((crontab_path, False))  # User crontab
+            found = found_users[username]
+            if found:
+                crontab_path, content = found
+                files_list.append((crontab_path, False, True, content, None))  # User crontab
                 logger.info(f"Found user crontab for {username}: {crontab_path}")
             else:
                 logger.warning(f"User crontab not found for: {username}")
 
+    # Add every user crontab in the cron spool
+    if args.all_users:
+        for crontab_path, content in all_user_crontabs(args):
+            files_list.append((crontab_path, False, True, content, None))
+
+    # Add the crontabs of root filesystems
+    if roots is None:
+        roots = expand_roots(args.root) if args.root else []
+    files_list += roots_crontabs(roots)
+
     # Add arguments with smart detection
     for path in args.arguments:
-        if os.path.isfile(path):
+        if path == STDIN_PATH:
+            files_list.append((STDIN_NAME, False, False, sys.stdin.read(), None))
+        elif checker.STAT_CACHE.get(path).is_file():
             # First check if it's an existing file
             full_path = os.path.abspath(path)
-            is_system_crontab = bool(full_path == "/etc/crontab" or full_path.startswith("/etc/cron.d") or "system" in os.path.basename(full_path))
-            files_list.append((full_path, is_system_crontab))
-        elif os.path.isdir(path):
+            files_list.append((full_path, is_system_path(full_path), False, None, None))
+        elif checker.STAT_CACHE.get(path).is_dir():
             # If directory, add all files inside as system crontabs
             files, warnings = get_files(path)
             for warning in warnings:
                 logger.warning(warning)
             for file in files:
                 full_path = os.path.abspath(file)
-                is_system_crontab = bool(full_path == "/etc/crontab" or full_path.startswith("/etc/cron.d") or "system" in os.path.basename(full_path))
-                files_list.append((full_path, is_system_crontab))
-        elif re.compile(r"^[a-zA-Z][a-zA-Z0-9_-]{0,31}$").match(path):
+                files_list.append((full_path, is_system_path(full_path), False, None, None))
+        elif re.match(USERNAME_RE, path):
             # If not a file, treat as username
-            crontab_path = find_user_crontab(path)
-            if crontab_path:
-                files_temp.append(crontab_path)
-                files_list.append((crontab_path, False))  # User crontab
+            found = found_users[path]
+            if found:
+                crontab_path, content = found
+                files_list.append((crontab_path, False, True, content, None))  # User crontab
                 logger.info(f"{path} user found: {crontab_path}")
             else:
                 logger.warning(f"{path} user not found or has no crontab")
         else:
             logger.warning(f"{path} File not found and is not a valid username")
 
+    # Remove duplicates while preserving order
+    seen = set()
+    unique_file_list: List[CrontabSource] = []
+    for source in files_list:
+        if source[0] not in seen:
+            seen.add(source[0])
+            unique_file_list.append(source)
+    return unique_file_list
+
+
+def collect_jobs(args: "argparse.Namespace") -> List["analyze.Job"]:
+    """Valid lines with a schedule from the crontabs selected on the command line; lines with errors are logged and skipped"""
+    from . import analyze
+
+    jobs: List[analyze.Job] = []
+    for path, is_system_crontab, _, content, users in collect_files(args):
+        schedules: List[Tuple[int, str, expression.CronExpression]] = []
+        if content is None:
+            check_file(path, is_system_crontab, schedules, users)
+        else:
+            check_text(content, path, is_system_crontab, schedules, users)
+        jobs.extend(analyze.Job(path, line_number, line, schedule, is_system_crontab) for line_number, line, schedule in schedules)
+    return jobs
+
+
+def analyze_main(argv: List[str]) -> int:
+    """Analyze the schedules of valid crontab lines (checkcrontab analyze density|next|concurrency ...)"""
+    import argparse
+    import json
+
+    from . import analyze
+
+    parser = argparse.ArgumentParser(prog="checkcrontab analyze", description="Analyze the schedules of valid crontab lines")
+    subparsers = parser.add_subparsers(dest="analysis", metavar="ANALYSIS")
+    subparsers.required = True
+    density_parser = subparsers.add_parser("density", help="Job starts per minute of the day or week: peak minutes, top files and lines, heatmap")
+    density_parser.add_argument("--by", choices=sorted(analyze.DENSITY_PERIODS), default="day", help="Count starts per minute of the day or of the week (default: day)")
+    density_parser.add_argument("--top", type=int, default=analyze.DEFAULT_TOP, metavar="N", help=f"Number of peak minutes, files and lines to show (default: {analyze.DEFAULT_TOP})")
+    next_parser = subparsers.add_parser("next", help="Next run times of every line")
+    next_parser.add_argument("--count", type=int, default=analyze.DEFAULT_RUNS, metavar="N", help=f"Number of run times per line (default: {analyze.DEFAULT_RUNS})")
+    next_parser.add_argument("--after", type=analyze.timestamp, metavar="TIME", help="List runs after this local time, e.g. '2025-01-31 23:59' (default: now)")
+    concurrency_parser = subparsers.add_parser("concurrency", help="Jobs running at once per minute of the day or week, given their runtimes: peak, jobs in it, self-overlaps")
+    concurrency_parser.add_argument("--by", choices=sorted(analyze.DENSITY_PERIODS), default="day", help="Forecast a day (every line runs daily) or a week (default: day)")
+    concurrency_parser.add_argument("--runtimes", metavar="FILENAME", help="JSON object mapping commands or line fingerprints to runtimes such as 90, '45s', '15m', '2h'")
+    concurrency_parser.add_argument(
+        "--default-runtime",
+        type=analyze.parse_duration,
+        default=analyze.DEFAULT_RUNTIME,
+        metavar="DURATION",
+        help=f"Runtime of jobs missing from the runtimes file (default: {analyze.DEFAULT_RUNTIME}s)",
+    )
+    for subparser in (density_parser, next_parser, concurrency_parser):
+        add_file_arguments(subparser)
+        subparser.add_argument("--format", choices=["text", "json"], default="text", help="Output format (default: text)")
+        subparser.add_argument("-d", "--debug", action="store_true", help="Debug output")
+        subparser.add_argument("-n", "--no-colors", action="store_true", help="Disable colored output")
+    args = parser.parse_args(argv)
+    log.setup_logging(args.debug, args.no_colors)
+    if stdin_given_twice(args):
+        logger.error(STDIN_TWICE_ERROR)
+        return 2
+
+    runtimes: Dict[str, int] = {}
+    if args.analysis == "concurrency" and args.runtimes:
+        try:
+            runtimes = analyze.load_runtimes(args.runtimes)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to read runtimes: {e}")
+            return 1
+
+    jobs = collect_jobs(args)
+    if args.analysis == "concurrency":
+        report = analyze.concurrency(jobs, runtimes, args.by, args.default_runtime)
+        render = analyze.render_concurrency
+    elif args.analysis == "next":
+        report = analyze.next_runs(jobs, args.after or analyze.now(), max(args.count, 0))
+        render = analyze.render_next
+    else:
+        report = analyze.density(jobs, args.by, max(args.top, 0))
+        render = analyze.render_density
+    if args.format == "json":
+        print(json.dumps(report, indent=2), flush=True)
+    else:
+        print(render(report), flush=True)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function"""
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["serve"] and not os.path.exists("serve"):
+        return serve_main(argv[1:])
+    if argv[:1] == ["analyze"] and not os.path.exists("analyze"):
+        return analyze_main(argv[1:])
+    # Forward to a resident server when one is configured and running
+    socket_path = os.environ.get(server.SOCKET_ENV)
+    if socket_path:
+        exit_code = server.forward(argv, socket_path)
+        if exit_code is not None:
+            return exit_code
+    return run(argv)
+
+
+def run(argv: List[str]) -> int:
+    """Check crontabs as requested by command line arguments"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description=DESCRIPTION,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Usage examples:
+    %(prog)s                                  # Check system crontab
+    %(prog)s filename                         # Check system and file crontab
+    %(prog)s username                         # Check system and user crontab
+    %(prog)s file1 file2 username             # Check multiple files and user crontab
+    %(prog)s -S file1 -U file2 -u username    # Check crontab with type flags
+    %(prog)s -u username1 -u username2        # Check specific usernames
+    %(prog)s filename -j | jq '.total_errors' # Check crontab and return JSON
+    crontab -l | %(prog)s -                   # Check crontab from standard input
+    %(prog)s --watch /etc/crontab /etc/cron.d # Re-check files when they change
+    %(prog)s serve --socket /run/checkcrontab.sock  # Keep a warm checker running for repeated calls
+        """,
+    )
+
+    add_file_arguments(parser)
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s " + VERSION)
+    parser.add_argument("-d", "--debug", action="store_true", help="Debug output")
+    parser.add_argument("-n", "--no-colors", action="store_true", help="Disable colored output")
+    parser.add_argument("--format", choices=["text", "json", "jsonl", "sarif"], default="text", help="Output format (default: text)")
+    parser.add_argument("-j", dest="format", action="store_const", const="json", help="Shortcut for JSON output (same as --format json)")
+    parser.add_argument("--strict", action="store_true", help="Treat warnings as errors")
+    parser.add_argument("--exit-zero", action="store_true", help="Always exit with code 0")
+    parser.add_argument("--passwd", metavar="FILENAME", help="Resolve users from this passwd file instead of the system user database")
+    parser.add_argument("--systemctl", action="store_true", help="Ask systemctl about the cron service when no cron process is found in /proc")
+    parser.add_argument(
+        "--field-cache-size", type=int, default=expression.FIELD_CACHE_SIZE, metavar="N", help=f"Number of parsed time fields to cache, 0 disables (default: {expression.FIELD_CACHE_SIZE})"
+    )
+    parser.add_argument("--cache-dir", metavar="DIR", default=os.environ.get(cache.CACHE_DIR_ENV), help=f"Cache per-file results in DIR (default: ${cache.CACHE_DIR_ENV})")
+    parser.add_argument("--cache-max-size", type=int, default=cache.CACHE_MAX_SIZE_MB, metavar="MB", help=f"Evict least recently used cache entries above this size (default: {cache.CACHE_MAX_SIZE_MB})")
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the result cache")
+    parser.add_argument("--watch", action="store_true", help="Keep running and re-check files and directories when they change (Linux only)")
+    parser.add_argument("--jobs", type=int, default=0, metavar="N", help="Number of parallel worker processes (default: 0 = CPU count)")
+    parser.add_argument("--timings", action="store_true", help="Add wall time per run phase and parse time per file to --format json output")
+    parser.add_argument(
+        "--profile", metavar="DIR", help="Profile discovery, system checks, parsing and rendering separately; write one pstats file per phase to DIR and a summary to stderr (checks run in one process)"
+    )
+
+    args = parser.parse_args(argv)
+
+    # Setup logging
+    log.setup_logging(args.debug, args.no_colors, args.format in ["json", "jsonl", "sarif"])
+    if stdin_given_twice(args):
+        logger.error(STDIN_TWICE_ERROR)
+        return 2
+    if args.passwd != checker.USER_DB.passwd_file:
+        checker.USER_DB.configure(args.passwd)
+    if args.passwd is not None and checker.USER_DB.passwd_error is not None:
+        logger.error(f"Failed to read passwd file {args.passwd}: {checker.USER_DB.passwd_error}")
+        return 2
+    expression.FIELD_CACHE.resize(args.field_cache_size)
+    started = time.perf_counter()
+    PROFILER.start(profile=bool(args.profile), record_files=args.timings)
+
+    with PROFILER.phase("discovery"):
+        roots = expand_roots(args.root) if args.root else []
+        files_list = collect_files(args, roots)
+
     # Add system crontab on Linux if not already included
     if platform.system().lower() == "linux":
         is_github = os.getenv("GITHUB_ACTIONS") == "true"
         # Only check daemon and permissions on Linux and not in GitHub Actions
         if not is_github:
-            for w in checker.check_daemon():
+            with PROFILER.phase("daemon_check"):
+                daemon_warnings = checker.check_daemon(args.systemctl)
+            for w in daemon_warnings:
                 logger.warning(w)
         # if not any(file_path == "/etc/crontab" for file_path, _ in files_list):
         #    files_list.insert(0, ("/etc/crontab", True))
@@ -324,152 +1116,51 @@ Usage examples:
     if len(files_list) == 0:
         logger.warning("No files to check.")
 
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_file_list: List[Tuple[str, bool]] = []
-    for path, is_system in files_list:
-        if path not in seen:
-            seen.add(path)
-            unique_file_list.append((path, is_system))
-    files_list = unique_file_list
-
-    total_rows = 0
-    total_rows_errors = 0
-    total_errors = 0
-    total_warnings = 0
-    all_errors: List[str] = []
-    # all_warnings: List[str] = []
-
-    # Prepare output structure if needed
-    output_data: Dict[str, Any] = {"success": True, "total_files": len(files_list), "total_rows": 0, "total_rows_errors": 0, "total_errors": 0, "total_warnings": 0, "files": []}
-
-    for path, is_system_crontab in files_list:
-        if os.path.exists(path):
-            if path not in files_temp:
-                base = os.path.basename(path)
-                error = checker.check_filename(base)
-                if error:
-                    msg = error
-                    file_info = {
-                        "file": path,
-                        "is_system_crontab": is_system_crontab,
-                        "rows": 0,
-                        "rows_warnings": 0,
-                        "warnings_count": 0,
-                        "rows_errors": 1,
-                        "errors_count": 1,
-                        "errors": [f"{os.path.basename(path)} (Line 0): {msg}"],
-                        "success": False,
-                    }
-                    output_data["files"].append(file_info)
-                    all_errors.append(f"{os.path.basename(path)} (Line 0): {msg}")
-                    total_errors += 1
-                    if args.format == "text":
-                        logger.error(msg)
-                    continue
-            file_level_errors: List[str] = []
-            if platform.system().lower() == "linux" and is_system_crontab:
-                errors = checker.check_owner_and_permissions(path)
-                for err in errors:
-                    err_msg = f"{os.path.basename(path)} (Line 0): {err}"
-                    logger.error(err_msg)
-                    file_level_errors.append(err_msg)
-
-            rows_checked, file_errors = check_file(path, is_system_crontab=is_system_crontab)
-
-            if file_level_errors:
-                file_errors = file_errors + file_level_errors
-
-            total_rows += rows_checked
-            total_errors += len(file_errors)
-            all_errors.extend(file_errors)
-            # Note: warnings are logged directly in check_file, so we don't need to track them here
-            unique_error_lines = set()
-            for error in file_errors:
-                if "File should end with newline" in error:
-                    continue
-                match = re.search(r"Line (\d+)", error)
-                if match:
-                    unique_error_lines.add(int(match.group(1)))
-            rows_errors = len(unique_error_lines)
-            total_rows_errors += rows_errors
-            # Add file info to output structure
-            file_info = {
-                "file": path,
-                "is_system_crontab": is_system_crontab,
-                "rows": rows_checked,
-                "rows_warnings": 0,
-                "warnings_count": 0,
-                "rows_errors": rows_errors,
-                "errors_count": len(file_errors),
-                "errors": file_errors,
-                "success": len(file_errors) == 0,
-            }
-            output_data["files"].append(file_info)
-            # Standard output
-            if args.format == "text" and len(file_errors) > 0:
-                logger.error(f"{path}: {rows_errors}/{rows_checked} lines with errors. Total {len(file_errors)} errors.")
-            elif args.format == "text":
-                logger.info(f"{path}: 0/{rows_checked} lines without errors. No errors.")
-        else:
-            file_info = {
-                "file": path,
-                "is_system_crontab": is_system_crontab,
-                "rows": 0,
-                "rows_warnings": 0,
-                "warnings_count": 0,
-                "rows_errors": 0,
-                "errors_count": 1,
-                "errors": [f"File {path} does not exist"],
-                "success": False,
-            }
-            output_data["files"].append(file_info)
-            if args.format == "text":
-                logger.warning(f"File {path} does not exist")
-
-    # Update output structure and generate final output
-    output_data["total_rows"] = total_rows
-    output_data["total_rows_errors"] = total_rows_errors
-    output_data["total_errors"] = total_errors
-    output_data["total_warnings"] = total_warnings
-    output_data["success"] = total_errors == 0
-
-    # Calculate unique error lines
-    unique_error_lines = set()
-    for error in all_errors:
-        if "File should end with newline" in error:
-            continue
-        match = re.search(r"Line (\d+)", error)
-        if match:
-            unique_error_lines.add(int(match.group(1)))
-    output_data["rows_errors"] = len(unique_error_lines)
-
-    # Generate output based on format
-    if args.format == "json":
-        print(json.dumps(output_data, indent=2))
+    tasks = [(source, args.format) for source in files_list]
+    cache_dir = None if args.no_cache else args.cache_dir
+    # Worker processes are not profiled, so profiling checks everything in this process
+    results = iter_check_paths(tasks, 1 if args.profile else resolve_jobs(args.jobs, len(tasks)), cache_dir)
+    # Streaming formats write each file as soon as it is checked, keeping only running totals
+    summary = Summary(keep_files=args.format not in ("jsonl", "sarif"), roots=roots)
+    if args.format == "jsonl":
+        for result in results:
+            summary.add(result)
+            with PROFILER.phase("rendering"):
+                write_jsonl({"type": "file", **result[0]})
     elif args.format == "sarif":
-        sarif_output = gen_sarif_output(output_data["files"], total_errors)
-        print(json.dumps(sarif_output, indent=2))
-    # Standard output
-    elif total_errors == 0:
-        logger.info("All checks passed successfully!")
+        with SarifWriter(sys.stdout) as writer:
+            for result in results:
+                summary.add(result)
+                with PROFILER.phase("rendering"):
+                    writer.add_file(result[0])
     else:
-        unique_error_lines = set()
-        for error in all_errors:
-            if "File should end with newline" in error:
-                continue
-            match = re.search(r"Line (\d+)", error)
-            if match:
-                unique_error_lines.add(int(match.group(1)))
-        rows_errors = len(unique_error_lines)
-        logger.error(f"Total: {rows_errors} lines with errors found in {total_rows} checked lines")
-
-    # Clean up temporary files
-    for temp_file in files_temp:
+        for result in results:
+            summary.add(result)
+    output_data = summary.output_data()
+    total_errors = output_data["total_errors"]
+    total_warnings = output_data["total_warnings"]
+    if cache_dir:
+        cache.ResultCache(cache_dir, args.cache_max_size * 1024 * 1024).evict()
+    user_db_stats = checker.USER_DB.stats()
+    logger.debug(f"User database cache: {user_db_stats['hits']} hits, {user_db_stats['misses']} misses")
+    field_cache_stats = expression.FIELD_CACHE.stats()
+    logger.debug(f"Time field cache: {field_cache_stats['hits']} hits, {field_cache_stats['misses']} misses, {field_cache_stats['size']}/{field_cache_stats['maxsize']} entries")
+
+    with PROFILER.phase("rendering"):
+        if args.format == "jsonl":
+            write_jsonl({"type": "summary", **output_data})
+        elif args.format != "sarif":
+            render_output(output_data, args.format, (lambda: timings_block(started)) if args.timings else None)
+    if args.profile:
         try:
-            os.unlink(temp_file)
-        except Exception as e:
-            logger.debug(f"Failed to remove temporary file {temp_file}: {e}")
+            PROFILER.report(args.profile, sys.stderr)
+        except OSError as e:
+            logger.error(f"Failed to write profile to {args.profile}: {e}")
+        # Watch mode re-checks without profiling
+        PROFILER.start()
+
+    if args.watch:
+        return watch_files(args, cache_dir)
 
     # Determine exit code based on flags and results
     if args.exit_zero:
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Module for per-phase timing and profiling of a run
+"""
+
+import contextlib
+import os
+import time
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterator, List, Tuple
+
+if TYPE_CHECKING:
+    import cProfile
+
+# Run phases in report order
+PHASES = ("discovery", "daemon_check", "permission_checks", "parsing", "rendering")
+PROFILE_TOP = 15
+
+
+class PhaseProfiler:
+    """
+    Wall time per run phase and, when profiling, one cProfile per phase
+    Phases may nest; time is charged to the innermost phase only.
+    With record_files, check_file also records its parse time per file.
+    Phase times of worker processes overlap each other, they are summed apart in worker_times.
+    """
+
+    def __init__(self) -> None:
+        self.profiling = False
+        self.record_files = False
+        self.times: Dict[str, float] = {}
+        self.worker_times: Dict[str, float] = {}
+        self.files: List[Dict[str, Any]] = []
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.stack: List[Tuple[str, float]] = []
+
+    def start(self, profile: bool = False, record_files: bool = False) -> None:
+        """Forget earlier runs; with profile, collect cProfile data from now on"""
+        self.times = {}
+        self.worker_times = {}
+        self.files = []
+        self.profiles = {}
+        self.stack = []
+        self.profiling = profile
+        self.record_files = record_files
+        if profile:
+            import cProfile
+
+            self.profiles = {name: cProfile.Profile() for name in PHASES}
+
+    def _pause(self, now: float) -> None:
+        name, since = self.stack[-1]
+        self.times[name] = self.times.get(name, 0.0) + now - since
+        if self.profiling:
+            self.profiles[name].disable()
+
+    def _resume(self, name: str, now: float) -> None:
+        self.stack.append((name, now))
+        if self.profiling:
+            self.profiles[name].enable()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Charge the time spent in the block to the named phase"""
+        now = time.perf_counter()
+        if self.stack:
+            self._pause(now)
+        self._resume(name, now)
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._pause(now)
+            self.stack.pop()
+            if self.stack:
+                outer, _ = self.stack.pop()
+                self._resume(outer, now)
+
+    def elapsed(self) -> Dict[str, float]:
+        """Time per phase so far, including the running part of active phases"""
+        times = dict(self.times)
+        if self.stack:
+            name, since = self.stack[-1]
+            times[name] = times.get(name, 0.0) + time.perf_counter() - since
+        return times
+
+    def add_file(self, path: str, rows: int, lines: int, seconds: float) -> None:
+        """Record the parse time of one file"""
+        self.files.append({"file": path, "rows": rows, "lines": lines, "parse_s": seconds, "cached": False})
+
+    def add_cached_file(self, path: str, rows: int) -> None:
+        """Record a file whose result was served from the result cache without parsing"""
+        self.files.append({"file": path, "rows": rows, "cached": True})
+
+    def mark(self) -> Tuple[Dict[str, float], int]:
+        """Position to collect what is recorded from now on with since()"""
+        return dict(self.times), len(self.files)
+
+    def since(self, mark: Tuple[Dict[str, float], int]) -> Tuple[Dict[str, float], List[Dict[str, Any]]]:
+        """Phase times and file records added after mark"""
+        times, files = mark
+        return {name: value - times.get(name, 0.0) for name, value in self.times.items() if value != times.get(name, 0.0)}, self.files[files:]
+
+    def merge(self, times: Dict[str, float], files: List[Dict[str, Any]]) -> None:
+        """Add phase times (to worker_times) and file records collected in a worker process"""
+        for name, value in times.items():
+            self.worker_times[name] = self.worker_times.get(name, 0.0) + value
+        self.files.extend(files)
+
+    def report(self, directory: str, stream: IO[str], top: int = PROFILE_TOP) -> List[str]:
+        """Write one pstats file per profiled phase to directory and a top-N summary to stream, returns the files written"""
+        import pstats
+
+        if not self.profiling:
+            return []
+        os.makedirs(directory, exist_ok=True)
+        written = []
+        for name in PHASES:
+            if name not in self.times:
+                continue
+            path = os.path.join(directory, f"{name}.pstats")
+            self.profiles[name].dump_stats(path)
+            written.append(path)
+            stream.write(f"=== {name}: {self.times[name]:.6f}s ({path}) ===\n")
+            pstats.Stats(self.profiles[name], stream=stream).sort_stats("cumulative").print_stats(top)
+        stream.flush()
+        return written
+
+
+PROFILER = PhaseProfiler()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Module for SARIF 2.1.0 output
+"""
+
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+from . import __url__ as REPO_URL
+from . import __version__ as VERSION
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+SARIF_INDENT = 2
+
+
+def sarif_results(file_info: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """SARIF result objects for one file's errors"""
+    file_path = file_info["file"]
+    for error in file_info.get("errors", []):
+        yield {
+            "ruleId": error.rule_id,
+            "level": error.severity,
+            "message": {"text": error.message},
+            "locations": [{"physicalLocation": {"artifactLocation": {"uri": file_path}, "region": {"startLine": max(error.line or 1, 1), "startColumn": error.column}}}],
+        }
+
+
+def sarif_document(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """SARIF log with a single checkcrontab run"""
+    return {
+        "$schema": SARIF_SCHEMA,
+        "version": SARIF_VERSION,
+        "runs": [
+            {
+                "tool": {
+                    "driver": {
+                        "name": "checkcrontab",
+                        "version": VERSION,
+                        "informationUri": REPO_URL,
+                    }
+                },
+                "results": results,
+            }
+        ],
+    }
+
+
+def gen_sarif_output(files_data: List[Dict[str, Any]], total_errors: int, total_warnings: int = 0) -> Dict[str, Any]:
+    """Generate SARIF format output"""
+    return sarif_document([result for file_info in files_data for result in sarif_results(file_info)])
+
+
+class SarifWriter:
+    """
+    Write a SARIF log incrementally: run header, then each result as it is added, then the closing brackets
+    The output is byte-identical to json.dumps(gen_sarif_output(...), indent=2) for the same files,
+    but only one result is held in memory at a time.
+    """
+
+    def __init__(self, stream: IO[str]) -> None:
+        import json
+
+        self.json = json
+        self.stream = stream
+        self.count = 0
+        # Split an empty document around its results list to get the header and footer
+        document = json.dumps(sarif_document([]), indent=SARIF_INDENT)
+        marker = '"results": []'
+        position = document.index(marker) + len(marker) - 1
+        self.header, self.footer = document[:position], document[position + 1 :]
+        results_line = self.header[self.header.rindex("\n") + 1 :]
+        self.list_indent = results_line[: len(results_line) - len(results_line.lstrip(" "))]
+        self.item_indent = self.list_indent + " " * SARIF_INDENT
+        self.started = False
+
+    def begin(self) -> None:
+        """Write the document header up to the opening bracket of the results list"""
+        if not self.started:
+            self.stream.write(self.header)
+            self.started = True
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """Write one result object"""
+        self.begin()
+        text = self.json.dumps(result, indent=SARIF_INDENT).replace("\n", "\n" + self.item_indent)
+        self.stream.write(("," if self.count else "") + "\n" + self.item_indent + text)
+        self.count += 1
+
+    def add_file(self, file_info: Dict[str, Any]) -> None:
+        """Write the results for one file's errors"""
+        for result in sarif_results(file_info):
+            self.add(result)
+
+    def close(self) -> None:
+        """Close the results list and the document"""
+        self.begin()
+        if self.count:
+            self.stream.write("\n" + self.list_indent)
+        self.stream.write("]" + self.footer + "\n")
+        self.stream.flush()
+
+    def __enter__(self) -> "SarifWriter":
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type: Optional[type], *exc_info: object) -> None:
+        if exc_type is None:
+            self.close()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Module for the resident checker server and its thin client
+"""
+
+import contextlib
+import io
+import logging
+import os
+import sys
+import threading
+import traceback
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    import socket
+
+logger = logging.getLogger(__name__)
+
+SOCKET_ENV = "CHECKCRONTAB_SOCKET"
+# Client environment variables that change the result of a check
+FORWARDED_ENV = ("GITHUB_ACTIONS", "CHECKCRONTAB_CACHE_DIR")
+# Options that cannot run inside the server ("-" reads the caller's stdin)
+LOCAL_ONLY_ARGS = ("serve", "--watch", "-")
+FORWARD_TIMEOUT = 60.0
+MAX_REQUEST_SIZE = 1024 * 1024
+ACCEPT_TIMEOUT = 0.5
+
+
+def recv_line(sock: "socket.socket", limit: int = 0) -> bytes:
+    """Read up to the first newline (or end of stream)"""
+    chunks = []
+    size = 0
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+        if chunk.endswith(b"\n"):
+            break
+        if limit and size > limit:
+            raise ValueError(f"request larger than {limit} bytes")
+    return b"".join(chunks)
+
+
+def forward(argv: List[str], socket_path: str) -> Optional[int]:
+    """
+    Run a check in the server listening on socket_path and print its output
+    Returns the exit code, or None when no server answered and the check should run locally.
+    """
+    import json
+    import socket
+
+    if not hasattr(socket, "AF_UNIX") or any(arg in LOCAL_ONLY_ARGS for arg in argv):
+        return None
+    request = {"argv": argv, "cwd": os.getcwd(), "env": {name: os.environ[name] for name in FORWARDED_ENV if name in os.environ}}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(FORWARD_TIMEOUT)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            response: Dict[str, Any] = json.loads(recv_line(sock))
+    except (OSError, ValueError):
+        return None
+    sys.stdout.write(response["stdout"])
+    sys.stdout.flush()
+    sys.stderr.write(response["stderr"])
+    sys.stderr.flush()
+    return int(response["exit_code"])
+
+
+@contextlib.contextmanager
+def request_context(cwd: str, env: Dict[str, str]) -> Iterator[Dict[str, io.StringIO]]:
+    """Run one request in the client's directory and environment with captured output and logging"""
+    streams = {"stdout": io.StringIO(), "stderr": io.StringIO()}
+    root_logger = logging.getLogger()
+    saved_handlers, saved_level = root_logger.handlers[:], root_logger.level
+    saved_env = {name: os.environ.get(name) for name in FORWARDED_ENV}
+    saved_cwd = os.getcwd()
+    saved_stdout, saved_stderr = sys.stdout, sys.stderr
+    try:
+        os.chdir(cwd)
+        for name in FORWARDED_ENV:
+            os.environ.pop(name, None)
+            if name in env:
+                os.environ[name] = env[name]
+        # setup_logging() attaches fresh handlers to the captured streams
+        root_logger.handlers = []
+        sys.stdout, sys.stderr = streams["stdout"], streams["stderr"]
+        yield streams
+    finally:
+        sys.stdout, sys.stderr = saved_stdout, saved_stderr
+        root_logger.handlers = saved_handlers
+        root_logger.setLevel(saved_level)
+        for name, value in saved_env.items():
+            os.environ.pop(name, None)
+            if value is not None:
+                os.environ[name] = value
+        os.chdir(saved_cwd)
+
+
+def handle_request(request: Dict[str, Any], run: Callable[[List[str]], int]) -> Dict[str, Any]:
+    """Run a check request and return its exit code and output"""
+    argv = request.get("argv")
+    if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+        return {"exit_code": 2, "stdout": "", "stderr": "Invalid request: argv must be a list of strings\n"}
+    if any(arg in LOCAL_ONLY_ARGS for arg in argv):
+        return {"exit_code": 2, "stdout": "", "stderr": "Invalid request: serve and --watch must run locally\n"}
+    exit_code = 2
+    with request_context(str(request.get("cwd") or "/"), dict(request.get("env") or {})) as streams:
+        try:
+            exit_code = run(argv)
+        except SystemExit as e:
+            # argparse exits for --help, --version and usage errors
+            exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 2)
+            if isinstance(e.code, str):
+                streams["stderr"].write(f"{e.code}\n")
+        except Exception as e:
+            streams["stderr"].write(f"{type(e).__name__} {str(e)}\n{traceback.format_exc()}")
+    return {"exit_code": exit_code, "stdout": streams["stdout"].getvalue(), "stderr": streams["stderr"].getvalue()}
+
+
+def remove_stale_socket(socket_path: str) -> None:
+    """Remove a socket file left by a server that is no longer running"""
+    import socket
+
+    if not os.path.exists(socket_path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+            return
+    raise OSError(f"Another server is already listening on {socket_path}")
+
+
+def serve(socket_path: str, run: Callable[[List[str]], int], stop: Optional[threading.Event] = None) -> None:
+    """
+    Answer check requests on a Unix socket until stop is set or the process is interrupted
+    Requests are handled one at a time, so process-wide caches stay warm between them.
+    Protocol: one JSON line {"argv": [...], "cwd": "...", "env": {...}} per connection,
+    answered with one JSON line {"exit_code": N, "stdout": "...", "stderr": "..."}.
+    """
+    import json
+    import socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix sockets are not available on this platform")
+    remove_stale_socket(socket_path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        # Only the owner may connect: requests run with the server's privileges
+        old_umask = os.umask(0o177)
+        try:
+            listener.bind(socket_path)
+        finally:
+            os.umask(old_umask)
+        try:
+            listener.listen(16)
+            listener.settimeout(ACCEPT_TIMEOUT)
+            logger.info(f"Listening on {socket_path}")
+            while stop is None or not stop.is_set():
+                try:
+                    conn, _ = listener.accept()
+                except socket.timeout:
+                    continue
+                with conn:
+                    conn.settimeout(FORWARD_TIMEOUT)
+                    try:
+                        request = json.loads(recv_line(conn, MAX_REQUEST_SIZE))
+                        response = handle_request(request, run) if isinstance(request, dict) else {"exit_code": 2, "stdout": "", "stderr": "Invalid request\n"}
+                        conn.sendall(json.dumps(response).encode("utf-8") + b"\n")
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Failed to handle request: {e}")
+        finally:
+            with contextlib.suppress(OSError):
+                os.unlink(socket_path)
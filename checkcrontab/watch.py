@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Module for watching crontab files with Linux inotify
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Events that mean a file's content, permissions or presence changed
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+READ_SIZE = 64 * 1024
+
+# Changes are reported once a file has been quiet this long, or at the latest after WATCH_MAX_DELAY
+WATCH_DEBOUNCE = 0.2
+WATCH_MAX_DELAY = 2.0
+
+
+class Inotify:
+    """Minimal inotify wrapper over libc via ctypes"""
+
+    def __init__(self) -> None:
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    def add_watch(self, path: str, mask: int = WATCH_MASK) -> int:
+        """Watch a file or directory, returns the watch descriptor"""
+        wd: int = self.libc.inotify_add_watch(self.fd, os.fsencode(path), ctypes.c_uint32(mask))
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return wd
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """Read pending events as (watch descriptor, mask, name)"""
+        try:
+            data = os.read(self.fd, READ_SIZE)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + name_len].rstrip(b"\0"))
+            offset += name_len
+            events.append((wd, mask, name))
+        return events
+
+    def close(self) -> None:
+        """Close the inotify descriptor"""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self) -> "Inotify":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def watch_paths(
+    paths: List[str],
+    on_change: Callable[[str], None],
+    debounce: float = WATCH_DEBOUNCE,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """
+    Call on_change(path) for every changed file under the given files and directories
+    Files are watched through their parent directory so editors replacing them by rename are seen.
+    Bursts of events for a file are reported once, after debounce seconds without new events.
+    Runs until stop is set or the process is interrupted.
+    """
+    with Inotify() as inotify:
+        watched_dirs: Dict[int, str] = {}
+        # Directory -> names to report (None: every file in the directory)
+        wanted: Dict[str, Optional[Set[str]]] = {}
+        for target in paths:
+            full_path = os.path.abspath(target)
+            name: Optional[str] = None
+            if os.path.isdir(full_path):
+                directory = full_path
+            else:
+                directory, name = os.path.dirname(full_path), os.path.basename(full_path)
+            if directory not in wanted:
+                watched_dirs[inotify.add_watch(directory)] = directory
+                wanted[directory] = set() if name else None
+            names = wanted[directory]
+            if name is None:
+                wanted[directory] = None
+            elif names is not None:
+                names.add(name)
+        logger.info(f"Watching {len(paths)} path(s) for changes")
+
+        pending: Dict[str, float] = {}
+        first_seen = 0.0
+        while stop is None or not stop.is_set():
+            timeout = debounce if pending else 0.5
+            ready, _, _ = select.select([inotify.fd], [], [], timeout)
+            now = time.monotonic()
+            if ready:
+                for wd, mask, name in inotify.read_events():
+                    if mask & IN_Q_OVERFLOW:
+                        logger.warning("inotify queue overflow, some changes may have been missed")
+                        continue
+                    event_dir = watched_dirs.get(wd)
+                    if event_dir is None or not name or mask & (IN_ISDIR | IN_IGNORED):
+                        continue
+                    names = wanted[event_dir]
+                    if names is not None and name not in names:
+                        continue
+                    if not pending:
+                        first_seen = now
+                    pending[os.path.join(event_dir, name)] = now
+            if pending and (not ready or now - first_seen >= WATCH_MAX_DELAY):
+                quiet = [path for path, seen in pending.items() if now - seen >= debounce or now - first_seen >= WATCH_MAX_DELAY]
+                for path in quiet:
+                    del pending[path]
+                    on_change(path)
+                first_seen = min(pending.values()) if pending else 0.0
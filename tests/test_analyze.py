@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# mypy: ignore-errors
+"""
+Tests for analyze module (schedule density)
+"""
+
+import json
+import random
+
+import pytest
+
+from checkcrontab import analyze
+from checkcrontab import main as check_crontab
+from checkcrontab.expression import CronExpression
+
+
+def expr(text):
+    """Expression for five time fields"""
+    expression, errors = CronExpression.parse(*text.split())
+    assert errors == []
+    return expression
+
+
+def starts(mask):
+    """Slots set in a mask"""
+    return list(analyze.set_bits(mask))
+
+
+@pytest.mark.parametrize(
+    "schedule, expected",
+    [
+        ("0 * * * *", [hour * 60 for hour in range(24)]),
+        ("*/20 9 * * *", [540, 560, 580]),
+        ("59 23 * * *", [1439]),
+        ("* * * * *", list(range(1440))),
+    ],
+)
+def test_day_mask(schedule, expected):
+    """Test minutes of the day selected by minute and hour fields"""
+    assert starts(analyze.day_mask(expr(schedule))) == expected
+
+
+def test_week_mask_day_fields():
+    """Test weekday restrictions apply, 7 counts as Sunday, and a day-of-month restriction counts on every weekday"""
+    assert starts(analyze.week_mask(expr("30 1 * * 1,7"))) == [90, 1440 + 90]
+    assert len(starts(analyze.week_mask(expr("0 0 1 * 1")))) == 7
+    assert len(starts(analyze.week_mask(expr("0 0 1 * *")))) == 7
+
+
+def test_sliced_counter_matches_naive_count():
+    """Test bit-sliced counting gives the same per-slot counts as a plain loop, also for large counts"""
+    rng = random.Random(7)
+    counter = analyze.SlicedCounter()
+    expected = [0] * 200
+    for _ in range(300):
+        mask = rng.getrandbits(200)
+        count = rng.choice([1, 2, 3, 1000, 123457])
+        counter.add(mask, count)
+        for slot in analyze.set_bits(mask):
+            expected[slot] += count
+    assert counter.counts(200) == expected
+
+
+def test_density_peaks_and_top_lines():
+    """Test peak minutes are ordered by starts and the files and lines starting jobs in them are ranked"""
+    jobs = [
+        analyze.Job("a", 1, "0 2 * * * backup", expr("0 2 * * *")),
+        analyze.Job("a", 2, "0 2 * * * rotate", expr("0 2 * * *")),
+        analyze.Job("b", 1, "*/30 * * * * poll", expr("*/30 * * * *")),
+        analyze.Job("b", 2, "15 3 * * * report", expr("15 3 * * *")),
+    ]
+    report = analyze.density(jobs, "day", top=2)
+    assert report["jobs"] == 4
+    assert report["starts"] == 2 + 48 + 1
+    assert report["peak_minutes"] == [{"minute": "02:00", "slot": 120, "starts": 3}, {"minute": "00:00", "slot": 0, "starts": 1}]
+    assert report["top_files"] == [{"file": "a", "starts": 2}, {"file": "b", "starts": 2}]
+    assert [(entry["file"], entry["line"], entry["starts"]) for entry in report["top_lines"]] == [("b", 1, 2), ("a", 1, 1)]
+    assert len(report["histogram"]) == analyze.MINUTES_PER_DAY
+
+
+def test_density_week_labels():
+    """Test week slots are labelled with the weekday"""
+    report = analyze.density([analyze.Job("a", 1, "0 12 * * 5 x", expr("0 12 * * 5"))], "week")
+    assert report["peak_minutes"] == [{"minute": "Fri 12:00", "slot": 5 * 1440 + 720, "starts": 1}]
+    assert len(report["histogram"]) == analyze.MINUTES_PER_WEEK
+    text = analyze.render_density(report)
+    assert "Fri" in text and "'@' = 1 starts per minute" in text
+
+
+def test_cli_analyze_density(tmp_path, capsys):
+    """Test the analyze subcommand reads crontabs like a check run and skips invalid lines"""
+    crontab = tmp_path / "crontab"
+    crontab.write_text("0 2 * * * /usr/bin/backup.sh\n0 2 * * * /usr/bin/rotate.sh\n99 2 * * * /usr/bin/broken.sh\n@reboot /usr/bin/start.sh\n")
+    assert check_crontab.main(["analyze", "density", "--format", "json", "-U", str(crontab)]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["jobs"] == 2
+    assert report["peak_minutes"][0] == {"minute": "02:00", "slot": 120, "starts": 2}
+    assert report["top_files"] == [{"file": str(crontab), "starts": 2}]
+
+
+def test_cli_analyze_next(tmp_path, capsys):
+    """Test the next runs of every line are listed after the given time"""
+    crontab = tmp_path / "crontab"
+    crontab.write_text("0 2 * * * /usr/bin/backup.sh\n0 0 30 2 * /usr/bin/never.sh\n")
+    assert check_crontab.main(["analyze", "next", "--after", "2025-01-31 23:59", "--count", "2", "--format", "json", "-U", str(crontab)]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["after"] == "2025-01-31 23:59:00"
+    assert [entry["runs"] for entry in report["jobs"]] == [["2025-02-01 02:00:00", "2025-02-02 02:00:00"], []]
+
+
+def naive_timeline(jobs, runtimes, slots):
+    """Running jobs per minute by expanding every run over the minutes it covers, two periods deep for wrap-around"""
+    timeline = [0] * slots
+    for job in jobs:
+        width = max(1, -(-runtimes[job.line] // 60))
+        mask = analyze.day_mask(job.expression) if slots == analyze.MINUTES_PER_DAY else analyze.week_mask(job.expression)
+        for start in analyze.set_bits(mask):
+            for minute in range(start, start + width):
+                timeline[minute % slots] += 1
+    return timeline
+
+
+@pytest.mark.parametrize("period", ["day", "week"])
+def test_concurrency_matches_naive_sweep(period):
+    """Test the sweep over start and end minutes equals counting every covered minute, across the period end and for runs longer than it"""
+    rng = random.Random(11)
+    schedules = ["*/7 * * * *", "50 23 * * *", "0 */6 * * 1,5", "15 3 1 * *", "30 12 * * 0", "59 23 * * 6"]
+    jobs = []
+    runtimes = {}
+    for index, schedule in enumerate(schedules * 3):
+        line = f"{schedule} /usr/bin/job{index}"
+        jobs.append(analyze.Job("f", index + 1, line, expr(schedule)))
+        runtimes[line] = rng.choice([1, 59, 60, 61, 3600, 7 * 3600, 2 * 86400, 8 * 86400])
+    slots = analyze.DENSITY_PERIODS[period]
+    report = analyze.concurrency(jobs, {job.fingerprint: runtimes[job.line] for job in jobs}, period)
+    assert report["timeline"] == naive_timeline(jobs, runtimes, slots)
+    assert report["peak"] == max(report["timeline"])
+    assert sum(entry["runs"] for entry in report["running_at_peak"]) == report["peak"]
+
+
+def test_concurrency_peak_jobs_and_self_overlap():
+    """Test the jobs running at the peak are named and a job outlasting its interval is flagged"""
+    jobs = [
+        analyze.Job("a", 1, "*/10 * * * * /usr/bin/poll", expr("*/10 * * * *")),
+        analyze.Job("a", 2, "0 2 * * * /usr/bin/backup.sh", expr("0 2 * * *")),
+        analyze.Job("b", 1, "2 2 * * * /usr/bin/report", expr("2 2 * * *")),
+    ]
+    report = analyze.concurrency(jobs, {"/usr/bin/poll": 25 * 60, "/usr/bin/backup.sh": 3 * 3600}, "day")
+    assert report["peak"] == 5
+    assert report["peak_minute"] == "02:02"
+    assert [(entry["file"], entry["line"], entry["runs"], entry["runtime_from"]) for entry in report["running_at_peak"]] == [("a", 1, 3, "command"), ("a", 2, 1, "command"), ("b", 1, 1, "default")]
+    assert [(entry["line"], entry["shortest_gap_minutes"]) for entry in report["self_overlaps"]] == [(1, 10)]
+    assert report["defaulted"] == 1
+
+
+@pytest.mark.parametrize("value, seconds", [(90, 90), (1.5, 2), ("45", 45), ("45s", 45), ("15m", 900), (" 2H ", 7200), ("1.5h", 5400), ("1d", 86400)])
+def test_parse_duration(value, seconds):
+    """Test runtimes are read as seconds with an optional unit, rounded up"""
+    assert analyze.parse_duration(value) == seconds
+
+
+@pytest.mark.parametrize("value", ["", "m", "ten", "-5", True])
+def test_parse_duration_rejects(value):
+    """Test malformed and negative runtimes are rejected"""
+    with pytest.raises(ValueError):
+        analyze.parse_duration(value)
+
+
+def test_job_command_and_fingerprint():
+    """Test the command skips the user in system crontabs and the fingerprint ignores spacing"""
+    user_job = analyze.Job("f", 1, "0 2 * * *  /usr/bin/backup.sh --full", expr("0 2 * * *"))
+    system_job = analyze.Job("f", 2, "@daily root /usr/bin/backup.sh --full", expr("0 0 * * *"), is_system_crontab=True)
+    assert user_job.command == system_job.command == "/usr/bin/backup.sh --full"
+    assert user_job.fingerprint == analyze.Job("g", 9, "0 2 * * * /usr/bin/backup.sh --full", expr("0 2 * * *")).fingerprint
+    assert len(user_job.fingerprint) == analyze.FINGERPRINT_LENGTH
+
+
+def test_cli_analyze_concurrency(tmp_path, capsys):
+    """Test runtimes are read from the sidecar file and a bad file fails the run"""
+    crontab = tmp_path / "crontab"
+    crontab.write_text("0 2 * * * /usr/bin/backup.sh\n30 2 * * * /usr/bin/report\n")
+    runtimes = tmp_path / "runtimes.json"
+    runtimes.write_text(json.dumps({"/usr/bin/backup.sh": "1h"}))
+    assert check_crontab.main(["analyze", "concurrency", "--runtimes", str(runtimes), "--format", "json", "-U", str(crontab)]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert (report["peak"], report["peak_minute"]) == (2, "02:30")
+    runtimes.write_text(json.dumps({"/usr/bin/backup.sh": "soon"}))
+    assert check_crontab.main(["analyze", "concurrency", "--runtimes", str(runtimes), "-U", str(crontab)]) == 1
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# mypy: ignore-errors
+"""
+Tests for the benchmark corpus generators
+"""
+
+import importlib.util
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+from checkcrontab import main as check_crontab
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def load_benchmark(name):
+    """Import a script from benchmarks/ (not a package)"""
+    spec = importlib.util.spec_from_file_location(f"benchmarks_{name}", ROOT / "benchmarks" / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+corpus = load_benchmark("corpus")
+
+
+@pytest.mark.parametrize("kind", sorted(corpus.GENERATORS))
+def test_corpus_is_valid_crontab(kind, tmp_path):
+    """Test every corpus kind checks clean, so benchmarks do not time error reporting"""
+    path = tmp_path / kind
+    lines = corpus.write_corpus(str(path), kind, 300)
+    assert lines >= 300
+    logging.disable(logging.CRITICAL)
+    try:
+        rows, errors = check_crontab.check_file(str(path), is_system_crontab=kind in corpus.SYSTEM_KINDS)
+    finally:
+        logging.disable(logging.NOTSET)
+    assert rows > 0
+    assert errors == []
+
+
+def test_corpus_is_reproducible():
+    """Test the same kind, size and seed give the same lines and another seed does not"""
+    assert corpus.generate_lines("user", 200) == corpus.generate_lines("user", 200)
+    assert corpus.generate_lines("user", 200, seed=1) != corpus.generate_lines("user", 200)
+
+
+def test_regression_compare_applies_tolerances():
+    """Test scenarios are judged on normalized time against their own tolerance"""
+    regression = load_benchmark("regression")
+    baseline = {"scenarios": {"fast": {"normalized": 1.0, "tolerance": 0.5}, "slow": {"normalized": 1.0, "tolerance": 0.2}, "quick": {"normalized": 4.0}}}
+    result = {"scenarios": {"fast": {"normalized": 1.4}, "slow": {"normalized": 1.4}, "quick": {"normalized": 1.0}, "added": {"normalized": 2.0}}}
+    rows = {row["scenario"]: row for row in regression.compare(result, baseline)}
+    assert [rows[name]["status"] for name in ("fast", "slow", "quick", "added")] == ["ok", "fail", "faster", "new"]
+    table = regression.format_table(list(rows.values()))
+    assert "slow" in table and "+40%" in table and "FAIL" in table
+
+
+def test_throughput_run_command_checks_exit_status():
+    """Test the CLI scenario accepts exit codes 0 and 1 (findings) and fails on anything else"""
+    throughput = load_benchmark("throughput")
+    env = {"PATH": "/usr/bin:/bin"}
+    for code in (0, 1):
+        throughput.run_command([sys.executable, "-c", f"raise SystemExit({code})"], env)
+    with pytest.raises(RuntimeError, match="exited with 2"):
+        throughput.run_command([sys.executable, "-c", "raise SystemExit(2)"], env)
+    with pytest.raises(RuntimeError, match="exited with -9"):
+        throughput.run_command([sys.executable, "-c", "import os; os.kill(os.getpid(), 9)"], env)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# mypy: ignore-errors
+"""
+Tests for cache module (on-disk per-file result cache)
+"""
+
+import os
+
+from checkcrontab import cache, checker
+
+
+def test_result_cache_key_changes_with_content_and_type(tmp_path):
+    """Test the key covers file content and crontab type"""
+    crontab = tmp_path / "job"
+    crontab.write_text("0 2 * * * echo ok\n")
+    result_cache = cache.ResultCache(str(tmp_path / "cache"))
+    key = result_cache.key(str(crontab), False, "text", 20)
+    assert key == result_cache.key(str(crontab), False, "text", 20)
+    assert key != result_cache.key(str(crontab), True, "text", 20)
+    assert key != result_cache.key(str(crontab), False, "json", 20)
+    crontab.write_text("0 3 * * * echo ok\n")
+    assert key != result_cache.key(str(crontab), False, "text", 20)
+    assert result_cache.key(str(tmp_path / "missing"), False, "text", 20) is None
+
+
+def test_result_cache_key_changes_with_mode(tmp_path):
+    """Test the key covers file permissions"""
+    crontab = tmp_path / "job"
+    crontab.write_text("0 2 * * * echo ok\n")
+    result_cache = cache.ResultCache(str(tmp_path / "cache"))
+    os.chmod(crontab, 0o644)
+    key = result_cache.key(str(crontab), True, "text", 20)
+    os.chmod(crontab, 0o600)
+    assert key != result_cache.key(str(crontab), True, "text", 20)
+
+
+def test_result_cache_key_changes_with_passwd_file(tmp_path):
+    """Test the key covers the passwd file used for user checks"""
+    crontab = tmp_path / "job"
+    crontab.write_text("0 2 * * * root echo ok\n")
+    passwd = tmp_path / "passwd"
+    passwd.write_text("root:x:0:0::/root:/bin/sh\n")
+    result_cache = cache.ResultCache(str(tmp_path / "cache"))
+    key = result_cache.key(str(crontab), True, "text", 20)
+    try:
+        checker.USER_DB.configure(str(passwd))
+        assert key != result_cache.key(str(crontab), True, "text", 20)
+    finally:
+        checker.USER_DB.configure(None)
+
+
+def test_result_cache_put_get(tmp_path):
+    """Test entries round-trip and unknown keys miss"""
+    result_cache = cache.ResultCache(str(tmp_path / "cache"))
+    entry = {"result": [{"file": "job"}, [], 0], "logs": [["checkcrontab.main", 20, "ok"]]}
+    result_cache.put("ab" * 32, entry)
+    assert result_cache.get("ab" * 32) == entry
+    assert result_cache.get("cd" * 32) is None
+
+
+def test_result_cache_evict_least_recently_used(tmp_path):
+    """Test eviction removes the oldest entries until under the size limit"""
+    result_cache = cache.ResultCache(str(tmp_path / "cache"), max_size=10 ** 6)
+    for n in range(10):
+        key = f"{n:02d}" * 32
+        result_cache.put(key, {"result": [], "logs": [], "pad": "x" * 1000})
+        os.utime(result_cache.entry_path(key), (n, n))
+    assert result_cache.evict() == 0
+    result_cache.max_size = 5000
+    assert result_cache.evict() > 0
+    remaining = sorted(os.path.basename(path) for _, _, path in result_cache.entries())
+    assert remaining
+    assert sum(size for _, size, _ in result_cache.entries()) <= 5000 * cache.CACHE_EVICT_RATIO
+    assert remaining[-1] == f"{'09' * 32}.json"
@@ -6,10 +6,14 @@ Tests for checker module helper functions
 
 import importlib
 import importlib.util
+import os
+import stat
 import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 # Import the checker module
 PACKAGE_ROOT = Path(__file__).resolve().parents[1] / "checkcrontab"
 package_spec = importlib.util.spec_from_file_location(
@@ -117,40 +121,90 @@ def test_check_kind_symlink(tmp_path):
 
 @patch("checkcrontab.checker.subprocess.run")
 def test_check_daemon_timeout(mock_run):
-    """Test check_daemon with timeout"""
+    """Test check_daemon_systemctl with timeout"""
     mock_run.side_effect = __import__('subprocess').TimeoutExpired(cmd="test", timeout=5)
-    errors = checker.check_daemon()
+    errors = checker.check_daemon_systemctl()
     assert len(errors) == 1
     assert "timeout" in errors[0]
 
 
 @patch("checkcrontab.checker.subprocess.run")
 def test_check_daemon_systemctl_not_found(mock_run):
-    """Test check_daemon when systemctl not found"""
+    """Test check_daemon_systemctl when systemctl not found"""
     mock_run.side_effect = FileNotFoundError()
-    errors = checker.check_daemon()
+    errors = checker.check_daemon_systemctl()
     assert len(errors) == 1
     assert "systemctl not found" in errors[0]
 
 
 @patch("checkcrontab.checker.subprocess.run")
 def test_check_daemon_subprocess_error(mock_run):
-    """Test check_daemon with subprocess error"""
+    """Test check_daemon_systemctl with subprocess error"""
     mock_run.side_effect = __import__('subprocess').SubprocessError("test error")
-    errors = checker.check_daemon()
+    errors = checker.check_daemon_systemctl()
     assert len(errors) == 1
     assert "SubprocessError" in errors[0]
 
 
 @patch("checkcrontab.checker.subprocess.run")
 def test_check_daemon_generic_exception(mock_run):
-    """Test check_daemon with generic exception"""
+    """Test check_daemon_systemctl with generic exception"""
     mock_run.side_effect = RuntimeError("test error")
-    errors = checker.check_daemon()
+    errors = checker.check_daemon_systemctl()
     assert len(errors) == 1
     assert "RuntimeError" in errors[0]
 
 
+def fake_proc(tmp_path, processes):
+    """procfs tree with a comm and cmdline file per pid"""
+    proc = tmp_path / "proc"
+    for pid, (comm, cmdline) in processes.items():
+        (proc / str(pid)).mkdir(parents=True)
+        (proc / str(pid) / "comm").write_text(comm + "\n")
+        (proc / str(pid) / "cmdline").write_bytes("\0".join(cmdline).encode() + b"\0")
+    (proc / "self").mkdir()
+    return proc
+
+
+@pytest.mark.parametrize(
+    "processes, expected",
+    [
+        ({1: ("init", ["/sbin/init"]), 42: ("crond", ["/usr/sbin/crond", "-n"])}, (42, "crond")),
+        ({7: ("cron", ["/usr/sbin/cron", "-f"])}, (7, "cron")),
+        ({9: ("fcron", ["/usr/sbin/fcron"])}, (9, "fcron")),
+        ({3: ("busybox", ["/bin/busybox", "crond", "-f"])}, (3, "busybox crond")),
+        ({3: ("busybox", ["/bin/busybox", "sh"]), 4: ("bash", ["bash"])}, None),
+    ],
+)
+def test_find_daemon_in_proc(tmp_path, processes, expected):
+    """Test cron daemons are recognized by process name, busybox by its applet"""
+    assert checker.find_daemon(str(fake_proc(tmp_path, processes)), ()) == expected
+
+
+def test_find_daemon_pidfile(tmp_path):
+    """Test a pidfile naming a cron process is used and a stale one is ignored"""
+    proc = fake_proc(tmp_path, {5: ("bash", ["bash"]), 8: ("cronie", ["cronie"])})
+    stale = tmp_path / "stale.pid"
+    stale.write_text("5\n")
+    pidfile = tmp_path / "crond.pid"
+    pidfile.write_text("8\n")
+    assert checker.find_daemon(str(proc), (str(tmp_path / "missing.pid"), str(stale), str(pidfile))) == (8, "cronie")
+
+
+@patch("checkcrontab.checker.subprocess.run")
+def test_check_daemon_uses_proc_before_systemctl(mock_run, monkeypatch):
+    """Test systemctl is only run on request and only when no cron process is found"""
+    monkeypatch.setattr(checker, "find_daemon", lambda: (42, "crond"))
+    assert checker.check_daemon(systemctl=True) == []
+    monkeypatch.setattr(checker, "find_daemon", lambda: None)
+    assert checker.check_daemon() == []
+    mock_run.assert_not_called()
+    mock_run.side_effect = FileNotFoundError()
+    assert checker.check_daemon(systemctl=True) == ["Cron daemon: systemctl not found"]
+    monkeypatch.setattr(checker, "find_daemon", MagicMock(side_effect=PermissionError()))
+    assert checker.check_daemon() == ["Cron daemon: cannot read /proc: PermissionError"]
+
+
 # ============================================================================
 # check_owner_and_permissions tests
 # ============================================================================
@@ -182,75 +236,40 @@ def test_check_owner_and_permissions_directory(tmp_path):
     assert any("not a regular_file" in e for e in errors)
 
 
-@patch("checkcrontab.checker.os.stat")
-@patch("checkcrontab.checker.os.path.exists")
-@patch("checkcrontab.checker.os.path.lexists")
-@patch("checkcrontab.checker.os.path.islink")
-def test_check_owner_and_permissions_wrong_perms(mock_islink, mock_lexists, mock_exists, mock_stat, tmp_path):
-    """Test check_owner_and_permissions with wrong permissions"""
-    mock_lexists.return_value = True
-    mock_exists.return_value = True
-    mock_islink.return_value = False
+def fake_stat(mode, uid=0):
+    """stat result with the given st_mode and st_uid"""
+    return os.stat_result((mode, 0, 0, 1, uid, 0, 0, 0, 0, 0))
 
-    # Mock stat to return wrong permissions
-    mock_stat_info = MagicMock()
-    mock_stat_info.st_mode = 0o100755  # Regular file with wrong permissions
-    mock_stat_info.st_uid = 0
-    mock_stat.return_value = mock_stat_info
 
+def test_check_owner_and_permissions_wrong_perms(tmp_path):
+    """Test check_owner_and_permissions with wrong permissions"""
     f = tmp_path / "testfile"
     f.write_text("test")
+    snapshot = checker.FileStat(str(f), fake_stat(0o100755), fake_stat(0o100755))  # Regular file with wrong permissions
 
-    errors = checker.check_owner_and_permissions(str(f))
+    errors = checker.check_owner_and_permissions(str(f), snapshot=snapshot)
     assert any("wrong permissions" in e for e in errors)
 
 
-@patch("checkcrontab.checker.os.stat")
-@patch("checkcrontab.checker.os.path.exists")
-@patch("checkcrontab.checker.os.path.lexists")
-@patch("checkcrontab.checker.os.path.islink")
-def test_check_owner_and_permissions_wrong_owner(mock_islink, mock_lexists, mock_exists, mock_stat, tmp_path):
+def test_check_owner_and_permissions_wrong_owner(tmp_path):
     """Test check_owner_and_permissions with wrong owner"""
-    mock_lexists.return_value = True
-    mock_exists.return_value = True
-    mock_islink.return_value = False
-
-    # Mock stat to return wrong owner
-    mock_stat_info = MagicMock()
-    mock_stat_info.st_mode = 0o100644  # Correct permissions
-    mock_stat_info.st_uid = 1000  # Wrong owner (not root)
-    mock_stat.return_value = mock_stat_info
-
     f = tmp_path / "testfile"
     f.write_text("test")
+    snapshot = checker.FileStat(str(f), fake_stat(0o100644, uid=1000), fake_stat(0o100644, uid=1000))  # Wrong owner (not root)
 
-    errors = checker.check_owner_and_permissions(str(f), owner_uid=0)
+    errors = checker.check_owner_and_permissions(str(f), owner_uid=0, snapshot=snapshot)
     assert any("wrong owner" in e for e in errors)
 
 
-@patch("checkcrontab.checker.os.lstat")
-@patch("checkcrontab.checker.os.path.exists")
-@patch("checkcrontab.checker.os.path.lexists")
-@patch("checkcrontab.checker.os.path.islink")
-@patch("checkcrontab.checker.os.path.realpath")
-def test_check_owner_and_permissions_symlink_wrong_owner(mock_realpath, mock_islink, mock_lexists, mock_exists, mock_lstat, tmp_path):
+def test_check_owner_and_permissions_symlink_wrong_owner(tmp_path):
     """Test check_owner_and_permissions with symlink having wrong owner"""
-    mock_lexists.return_value = True
-    mock_exists.return_value = True
-    mock_islink.return_value = True
-
-    # Mock lstat for symlink
-    mock_lstat_info = MagicMock()
-    mock_lstat_info.st_uid = 1000  # Wrong symlink owner
-    mock_lstat.return_value = mock_lstat_info
-
     target = tmp_path / "target"
     target.write_text("test")
-    mock_realpath.return_value = str(target)
-
     link = tmp_path / "link"
+    link.symlink_to(target)
+    snapshot = checker.FileStat(str(link), fake_stat(0o120777, uid=1000), fake_stat(0o100644))  # Wrong symlink owner
 
-    errors = checker.check_owner_and_permissions(str(link), owner_uid=0)
+    errors = checker.check_owner_and_permissions(str(link), owner_uid=0, snapshot=snapshot)
     assert any("wrong symlink owner" in e for e in errors)
 
 
@@ -320,34 +339,34 @@ def test_get_crontab_generic_exception(mock_run):
 
 
 # ============================================================================
-# validate_time_field_logic tests
+# Field range and step message tests
 # ============================================================================
 
 
-def test_validate_time_field_logic_invalid_step_zero():
-    """Test validate_time_field_logic with step value 0"""
-    errors = checker.validate_time_field_logic("*/0", "minutes", 0, 59)
+def test_check_minutes_invalid_step_zero():
+    """Test check_minutes with step value 0"""
+    errors = checker.check_minutes("*/0")
     assert len(errors) > 0
     assert any("must be positive" in e for e in errors)
 
 
-def test_validate_time_field_logic_invalid_step_too_large():
-    """Test validate_time_field_logic with step value exceeding max"""
-    errors = checker.validate_time_field_logic("*/100", "minutes", 0, 59)
+def test_check_minutes_invalid_step_too_large():
+    """Test check_minutes with step value exceeding max"""
+    errors = checker.check_minutes("*/100")
     assert len(errors) > 0
     assert any("exceeds maximum" in e for e in errors)
 
 
-def test_validate_time_field_logic_range_out_of_bounds_start():
-    """Test validate_time_field_logic with range start out of bounds"""
-    errors = checker.validate_time_field_logic("25-30", "hours", 0, 23)
+def test_check_hours_range_out_of_bounds_start():
+    """Test check_hours with range start out of bounds"""
+    errors = checker.check_hours("25-30")
     assert len(errors) > 0
     assert any("range start" in e and "out of bounds" in e for e in errors)
 
 
-def test_validate_time_field_logic_range_out_of_bounds_end():
-    """Test validate_time_field_logic with range end out of bounds"""
-    errors = checker.validate_time_field_logic("20-25", "hours", 0, 23)
+def test_check_hours_range_out_of_bounds_end():
+    """Test check_hours with range end out of bounds"""
+    errors = checker.check_hours("20-25")
     assert len(errors) > 0
     assert any("range end" in e and "out of bounds" in e for e in errors)
 
@@ -357,37 +376,78 @@ def test_validate_time_field_logic_range_out_of_bounds_end():
 # ============================================================================
 
 
-@patch("checkcrontab.checker.subprocess.run")
-def test_check_user_exists_timeout(mock_run):
-    """Test check_user_exists with timeout"""
-    mock_run.side_effect = __import__('subprocess').TimeoutExpired(cmd="test", timeout=5)
-    # Should return True (default to exists on error)
-    result = checker.check_user_exists("testuser")
-    assert result is True
-
-
-@patch("checkcrontab.checker.subprocess.run")
-def test_check_user_exists_file_not_found(mock_run):
-    """Test check_user_exists when id command not found"""
-    mock_run.side_effect = FileNotFoundError()
-    result = checker.check_user_exists("testuser")
-    assert result is True
-
-
-@patch("checkcrontab.checker.subprocess.run")
-def test_check_user_exists_subprocess_error(mock_run):
-    """Test check_user_exists with subprocess error"""
-    mock_run.side_effect = __import__('subprocess').SubprocessError("test")
-    result = checker.check_user_exists("testuser")
-    assert result is True
-
-
-@patch("checkcrontab.checker.subprocess.run")
-def test_check_user_exists_generic_exception(mock_run):
-    """Test check_user_exists with generic exception"""
-    mock_run.side_effect = RuntimeError("test")
-    result = checker.check_user_exists("testuser")
-    assert result is True
+@pytest.mark.skipif(checker.pwd is None, reason="pwd module is not available")
+@patch("checkcrontab.checker.pwd.getpwnam")
+def test_check_user_exists_not_found(mock_getpwnam):
+    """Test check_user_exists when the user database has no such user"""
+    checker.USER_DB.clear()
+    mock_getpwnam.side_effect = KeyError("testuser")
+    assert checker.check_user_exists("testuser") is False
+
+
+@pytest.mark.skipif(checker.pwd is None, reason="pwd module is not available")
+@patch("checkcrontab.checker.pwd.getpwnam")
+def test_check_user_exists_lookup_error(mock_getpwnam):
+    """Test check_user_exists with unexpected lookup error"""
+    checker.USER_DB.clear()
+    mock_getpwnam.side_effect = RuntimeError("test")
+    # Should return True (default to exists on error) and not cache the answer
+    assert checker.check_user_exists("testuser") is True
+    assert "testuser" not in checker.USER_DB.cache
+
+
+@pytest.mark.skipif(checker.pwd is None, reason="pwd module is not available")
+@patch("checkcrontab.checker.pwd.getpwnam")
+def test_check_user_exists_cached(mock_getpwnam):
+    """Test repeated lookups are answered from the cache"""
+    checker.USER_DB.clear()
+    mock_getpwnam.side_effect = lambda name: {"www-data": MagicMock()}[name]
+    for _ in range(3):
+        assert checker.check_user_exists("www-data") is True
+        assert checker.check_user_exists("ghost") is False
+    assert mock_getpwnam.call_count == 2
+    assert checker.USER_DB.stats() == {"hits": 4, "misses": 2, "size": 2}
+    checker.USER_DB.clear()
+
+
+def test_user_database_passwd_file(tmp_path):
+    """Test users are resolved from a supplied passwd file, read once"""
+    passwd = tmp_path / "passwd"
+    passwd.write_text("# comment\nbackup:x:34:34:backup:/var/backups:/usr/sbin/nologin\n+nis\n")
+    user_db = checker.UserDatabase(str(passwd))
+    with patch("checkcrontab.checker.load_passwd", wraps=checker.load_passwd) as mock_load:
+        assert user_db.exists("backup") is True
+        assert user_db.exists("www-data") is False
+        assert user_db.exists("nis") is False
+    assert mock_load.call_count == 1
+
+
+def test_user_database_unreadable_passwd_file(tmp_path, caplog):
+    """Test an unreadable passwd file does not report users as missing and is tried and reported once"""
+    user_db = checker.UserDatabase(str(tmp_path / "missing"))
+    with patch("checkcrontab.checker.load_passwd", wraps=checker.load_passwd) as mock_load:
+        assert user_db.exists("backup") is True
+        assert user_db.exists("www-data") is True
+        with pytest.raises(FileNotFoundError):
+            user_db.names()
+    assert mock_load.call_count == 1
+    assert len([r for r in caplog.records if r.levelname == "WARNING"]) == 1
+    assert "Traceback" not in caplog.text
+
+
+def test_user_database_configure_reads_passwd_file(tmp_path):
+    """Test configure reads the passwd file at once and keeps a read error"""
+    user_db = checker.UserDatabase()
+    user_db.configure(str(tmp_path / "missing"))
+    assert isinstance(user_db.passwd_error, FileNotFoundError)
+    passwd = tmp_path / "passwd"
+    passwd.write_text("alice:x:1000:1000::/home/alice:/bin/sh\n")
+    with patch("checkcrontab.checker.load_passwd", wraps=checker.load_passwd) as mock_load:
+        user_db.configure(str(passwd))
+        assert user_db.passwd_error is None
+        assert user_db.names() == {"alice"}
+        assert user_db.exists("bob") is False
+    assert mock_load.call_count == 1
 
 
 # ============================================================================
@@ -423,6 +483,23 @@ def test_get_line_content_out_of_bounds(tmp_path):
     assert result == ""
 
 
+def test_get_line_content_from_loaded_lines():
+    """Test get_line_content uses preloaded lines without touching the file"""
+    lines = ["0 1 * * * cmd\n", "60 1 * * * cmd\n"]
+    assert checker.get_line_content("/nonexistent/file", 2, lines) == "60 1 * * * cmd"
+    assert checker.get_line_content("/nonexistent/file", 3, lines) == ""
+
+
+def test_check_line_with_loaded_lines():
+    """Test check_entry takes line content from the source's preloaded lines"""
+    lines = ["60 1 * * *\tcmd \\\n", "  --flag\n"]
+    source = checker.LineSource("test", "/nonexistent/test", lines)
+    with patch("checkcrontab.checker.open", side_effect=AssertionError("file must not be reopened"), create=True):
+        errors, warnings, _ = checker.check_entry("60 1 * * *\tcmd \n  --flag", 1, source)
+    assert len(errors) == 1
+    assert errors[0].format().startswith("test (Line 1): 60 1 * * * cmd \\ # ")
+
+
 # ============================================================================
 # check_command warning path tests
 # ============================================================================
@@ -463,73 +540,59 @@ def test_check_line_special_legacy():
 # ============================================================================
 
 
-@patch("checkcrontab.checker.os.lstat")
-@patch("checkcrontab.checker.os.path.exists")
-@patch("checkcrontab.checker.os.path.lexists")
-@patch("checkcrontab.checker.os.path.islink")
-@patch("checkcrontab.checker.os.path.realpath")
-@patch("checkcrontab.checker.os.stat")
-def test_check_owner_and_permissions_symlink_correct_owner(mock_stat, mock_realpath, mock_islink, mock_lexists, mock_exists, mock_lstat, tmp_path):
+def test_check_owner_and_permissions_symlink_correct_owner(tmp_path):
     """Test check_owner_and_permissions with symlink having correct owner"""
-    mock_lexists.return_value = True
-    mock_exists.return_value = True
-    mock_islink.return_value = True
-
-    # Mock lstat for symlink with correct owner
-    mock_lstat_info = MagicMock()
-    mock_lstat_info.st_uid = 0  # Correct owner (root)
-    mock_lstat.return_value = mock_lstat_info
-
-    # Mock stat for target file
-    mock_stat_info = MagicMock()
-    mock_stat_info.st_mode = 0o100644  # Regular file with correct permissions
-    mock_stat_info.st_uid = 0
-    mock_stat.return_value = mock_stat_info
-
     target = tmp_path / "target"
     target.write_text("test")
-    mock_realpath.return_value = str(target)
-
     link = tmp_path / "link"
+    link.symlink_to(target)
+    snapshot = checker.FileStat(str(link), fake_stat(0o120777), fake_stat(0o100644))  # Link and target owned by root
 
-    errors = checker.check_owner_and_permissions(str(link), owner_uid=0)
+    errors = checker.check_owner_and_permissions(str(link), owner_uid=0, snapshot=snapshot)
     # Should have no errors
     assert errors == []
 
 
-@patch("checkcrontab.checker.os.lstat")
-@patch("checkcrontab.checker.os.path.exists")
-@patch("checkcrontab.checker.os.path.lexists")
-@patch("checkcrontab.checker.os.path.islink")
-def test_check_owner_and_permissions_symlink_lstat_exception(mock_islink, mock_lexists, mock_exists, mock_lstat, tmp_path):
+def test_check_owner_and_permissions_symlink_lstat_exception(tmp_path):
     """Test check_owner_and_permissions with lstat raising exception"""
-    mock_lexists.return_value = True
-    mock_islink.return_value = True
-    mock_lstat.side_effect = OSError("Permission denied")
-
     link = tmp_path / "link"
+    snapshot = checker.FileStat(str(link), error=PermissionError("Permission denied"))
 
-    errors = checker.check_owner_and_permissions(str(link), owner_uid=0)
+    errors = checker.check_owner_and_permissions(str(link), owner_uid=0, snapshot=snapshot)
     assert len(errors) > 0
-    assert any("failed to stat symlink" in e for e in errors)
+    assert any("failed to stat" in e and "Permission denied" in e for e in errors)
 
 
-@patch("checkcrontab.checker.os.stat")
-@patch("checkcrontab.checker.os.path.exists")
-@patch("checkcrontab.checker.os.path.lexists")
-@patch("checkcrontab.checker.os.path.islink")
-def test_check_owner_and_permissions_stat_exception(mock_islink, mock_lexists, mock_exists, mock_stat, tmp_path):
-    """Test check_owner_and_permissions with stat raising exception"""
-    mock_lexists.return_value = True
-    mock_exists.return_value = True
-    mock_islink.return_value = False
-    mock_stat.side_effect = OSError("Permission denied")
+def test_check_owner_and_permissions_stat_exception(tmp_path):
+    """Test check_owner_and_permissions with stat of the symlink target raising exception"""
+    link = tmp_path / "link"
+    link.symlink_to(tmp_path / "target")
+    snapshot = checker.FileStat(str(link), fake_stat(0o120777), None, PermissionError("Permission denied"))
 
-    f = tmp_path / "testfile"
+    errors = checker.check_owner_and_permissions(str(link), owner_uid=0, snapshot=snapshot)
+    assert errors == [f"failed to stat {tmp_path / 'target'}: Permission denied"]
 
-    errors = checker.check_owner_and_permissions(str(f), owner_uid=0)
-    assert len(errors) > 0
-    assert any("Permission denied" in e for e in errors)
+
+def test_check_owner_and_permissions_two_hop_symlink(tmp_path):
+    """Test messages about a chain of symlinks name the final file, not the link in between"""
+    target = tmp_path / "target"
+    target.write_text("test")
+    (tmp_path / "middle").symlink_to(target)
+    link = tmp_path / "link"
+    link.symlink_to("middle")
+    snapshot = checker.FileStat(str(link), fake_stat(0o120777), fake_stat(0o100600))
+
+    errors = checker.check_owner_and_permissions(str(link), owner_uid=0, snapshot=snapshot)
+    assert errors == [f"wrong permissions (0o600): sudo chmod 644 {target}"]
+
+
+def test_link_target_stops_on_loop(tmp_path):
+    """Test link_target ends on a symlink loop and on a broken chain"""
+    (tmp_path / "a").symlink_to("b")
+    (tmp_path / "b").symlink_to("a")
+    assert checker.link_target(str(tmp_path / "a")) == str(tmp_path / "a")
+    (tmp_path / "c").symlink_to("missing")
+    assert checker.link_target(str(tmp_path / "c")) == str(tmp_path / "missing")
 
 
 def test_check_special_user_warning_nonexistent_user():
@@ -564,21 +627,25 @@ def test_check_line_multiline_continuation_with_backslash():
 
 
 # Note: These are difficult to test in a portable way as creating special files
-# requires root privileges. We'll mock the check_kind function instead.
-def test_check_owner_permissions_with_special_file_types():
+# requires root privileges. We'll pass stat snapshots of them instead.
+@pytest.mark.parametrize("file_type", [stat.S_IFCHR, stat.S_IFBLK, stat.S_IFSOCK, stat.S_IFIFO, stat.S_IFDIR])
+def test_check_owner_permissions_with_special_file_types(file_type):
     """Test check_owner_and_permissions with special file types"""
-    # These would require root to create, so we test via mocking
-    with patch("checkcrontab.checker.check_kind") as mock_check_kind:
-        with patch("checkcrontab.checker.os.path.lexists", return_value=True):
-            with patch("checkcrontab.checker.os.path.islink", return_value=False):
-                with patch("checkcrontab.checker.os.stat") as mock_stat:
-                    mock_stat_info = MagicMock()
-                    mock_stat_info.st_mode = 0o100644
-                    mock_stat_info.st_uid = 0
-                    mock_stat.return_value = mock_stat_info
-
-                    # Test each special file type
-                    for file_type in ["char_device", "block_device", "socket", "fifo", "unknown"]:
-                        mock_check_kind.return_value = file_type
-                        errors = checker.check_owner_and_permissions("/dev/test", owner_uid=0)
-                        assert any("not a regular_file" in e for e in errors)
+    snapshot = checker.FileStat("/dev/test", fake_stat(file_type | 0o644), fake_stat(file_type | 0o644))
+    errors = checker.check_owner_and_permissions("/dev/test", owner_uid=0, snapshot=snapshot)
+    assert any("not a regular_file" in e for e in errors)
+
+
+def test_user_database_refresh_on_passwd_change(tmp_path):
+    """Test refresh() drops cached answers only when the passwd file changed"""
+    passwd = tmp_path / "passwd"
+    passwd.write_text("alice:x:1000:1000::/home/alice:/bin/sh\n")
+    db = checker.UserDatabase(str(passwd))
+    db.refresh()
+    assert db.exists("bob") is False
+    db.refresh()
+    assert db.stats()["size"] == 1
+    passwd.write_text("alice:x:1000:1000::/home/alice:/bin/sh\nbob:x:1001:1001::/home/bob:/bin/sh\n")
+    os.utime(passwd, ns=(0, 10**18))
+    db.refresh()
+    assert db.exists("bob") is True
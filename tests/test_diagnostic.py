@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# mypy: ignore-errors
+"""
+Tests for diagnostic module (structured check results)
+"""
+
+import pickle
+
+from checkcrontab import checker
+from checkcrontab.diagnostic import RULE_MISSING_NEWLINE, SEVERITY_WARNING, Diagnostic
+
+
+def test_diagnostic_format_variants():
+    """Test the text form with and without line content and location"""
+    assert Diagnostic.on_line("job", 3, "bad minute", "61 * * * * echo").format() == "job (Line 3): 61 * * * * echo # bad minute"
+    assert Diagnostic("job", 4, "File should end with newline", rule_id=RULE_MISSING_NEWLINE).format() == "job (Line 4): File should end with newline"
+    assert str(Diagnostic("job", None, "File /tmp/job does not exist")) == "File /tmp/job does not exist"
+
+
+def test_diagnostic_is_slotted_and_round_trips():
+    """Test records have no __dict__ and survive dict and pickle round trips"""
+    diagnostic = Diagnostic.on_line("job", 2, "unknown user", "0 * * * * bob echo", severity=SEVERITY_WARNING)
+    diagnostic.column = 11
+    assert not hasattr(diagnostic, "__dict__")
+    assert Diagnostic.from_dict(diagnostic.to_dict()) == diagnostic
+    assert pickle.loads(pickle.dumps(diagnostic)) == diagnostic
+    assert len({diagnostic, Diagnostic.from_dict(diagnostic.to_dict())}) == 1
+
+
+def test_check_entry_returns_diagnostics():
+    """Test check_entry reports structured records and check_line keeps the string form"""
+    errors, warnings, _ = checker.check_entry("61 * * * * echo", 7, checker.LineSource("job"))
+    assert warnings == []
+    assert [(error.file, error.line, error.severity, error.message) for error in errors] == [("job", 7, "error", "value 61 out of bounds (0-59) for minutes: '61'")]
+    assert checker.check_line("61 * * * * echo", 7, "job")[0] == ["job (Line 7): 61 * * * * echo # value 61 out of bounds (0-59) for minutes: '61'"]
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# mypy: ignore-errors
+"""
+Tests for expression module (time fields compiled to bitmasks)
+"""
+
+import itertools
+import pickle
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from checkcrontab import checker
+from checkcrontab.expression import DAY, HOUR, MINUTE, MONTH, WEEKDAY, CronExpression, FieldCache, first_weekday, parse_field
+
+# ============================================================================
+# parse_field tests
+# ============================================================================
+
+
+@pytest.mark.parametrize(
+    "field, value, expected",
+    [
+        (MINUTE, "*", list(range(60))),
+        (MINUTE, "*/15", [0, 15, 30, 45]),
+        (MINUTE, "05", [5]),
+        (MINUTE, "1-5/2", [1, 3, 5]),
+        (MINUTE, "50/3", [50, 53, 56, 59]),
+        (HOUR, "1,2,20-23", [1, 2, 20, 21, 22, 23]),
+        (DAY, "*/10", [1, 11, 21, 31]),
+        (MONTH, "2-12/5", [2, 7, 12]),
+        (WEEKDAY, "1-5/2,7", [1, 3, 5, 7]),
+    ],
+)
+def test_parse_field_values(field, value, expected):
+    """Test fields compile to the selected values"""
+    mask, errors = parse_field(field, value)
+    assert errors == []
+    min_val = 1 if field in (DAY, MONTH) else 0
+    assert [bit + min_val for bit in range(mask.bit_length()) if mask >> bit & 1] == expected
+
+
+def test_parse_field_dash_prefix_only_for_system_crontab():
+    """Test the syslog-suppressing dash prefix in minutes"""
+    assert parse_field(MINUTE, "-0", is_system_crontab=True) == (1, [])
+    assert parse_field(MINUTE, "-0") == (0, ["invalid minute format: '-0'"])
+
+
+@pytest.mark.parametrize(
+    "field, value, message",
+    [
+        (MINUTE, "60", "value 60 out of bounds (0-59) for minutes: '60'"),
+        (HOUR, "05", "invalid hour format: '05'"),
+        (MINUTE, "*/5,10", "invalid minute format: '*/5,10'"),
+        (WEEKDAY, "1,2-6/2", "invalid day of week format: '1,2-6/2'"),
+        (MINUTE, "1-5/0", "step value must be positive in minutes: '1-5/0'"),
+        (HOUR, "5-1/2", "invalid range 5-1 in hours: start > end"),
+        (MONTH, "jan", "invalid month format: 'jan'"),
+    ],
+)
+def test_parse_field_errors(field, value, message):
+    """Test invalid fields report a single error and no bitmask"""
+    assert parse_field(field, value) == (0, [message])
+
+
+# ============================================================================
+# CronExpression tests
+# ============================================================================
+
+
+def test_cron_expression_parse_reports_errors_in_field_order():
+    """Test all field errors are reported from one parse"""
+    expression, errors = CronExpression.parse("60", "*", "0", "*", "8")
+    assert expression is None
+    assert errors == [
+        "value 60 out of bounds (0-59) for minutes: '60'",
+        "value 0 out of bounds (1-31) for day of month: '0'",
+        "value 8 out of bounds (0-7) for day of week: '8'",
+    ]
+
+
+def test_cron_expression_values_and_stars():
+    """Test compiled expression keeps values and day star flags"""
+    expression, errors = CronExpression.parse("0", "*/6", "*", "1,7", "0")
+    assert errors == []
+    assert expression.values(HOUR) == [0, 6, 12, 18]
+    assert expression.values(MONTH) == [1, 7]
+    assert expression.day_star is True
+    assert expression.weekday_star is False
+    assert not hasattr(expression, "__dict__")
+
+
+def test_cron_expression_vixie_day_matching():
+    """Test day of month/day of week OR semantics"""
+    both, _ = CronExpression.parse("0", "0", "13", "*", "5")
+    # Friday the 1st and Monday the 13th both match when both day fields are restricted
+    assert both.matches(0, 0, 1, 3, 5)
+    assert both.matches(0, 0, 13, 3, 1)
+    assert not both.matches(0, 0, 2, 3, 1)
+    starred, _ = CronExpression.parse("0", "0", "*/2", "*", "5")
+    # A starred day of month field requires both to match
+    assert starred.matches(0, 0, 3, 3, 5)
+    assert not starred.matches(0, 0, 2, 3, 1)
+
+
+def test_cron_expression_sunday_as_seven():
+    """Test 7 and 0 both mean Sunday"""
+    expression, _ = CronExpression.parse("0", "0", "*", "*", "7")
+    assert expression.weekday_mask == 1
+    assert expression.matches(0, 0, 5, 1, 0)
+
+
+def test_cron_expression_from_keyword():
+    """Test special keywords map to schedules"""
+    assert CronExpression.from_keyword("@daily") == CronExpression.parse("0", "0", "*", "*", "*")[0]
+    assert CronExpression.from_keyword("@weekly").values(WEEKDAY) == [0]
+    assert CronExpression.from_keyword("@reboot") is None
+
+
+def test_cron_expression_pickle():
+    """Test expressions survive pickling (used by worker processes)"""
+    expression, _ = CronExpression.parse("*/5", "1-3", "*", "*", "1-5")
+    assert pickle.loads(pickle.dumps(expression)) == expression
+
+
+# ============================================================================
+# check_entry tests
+# ============================================================================
+
+
+def test_check_entry_returns_expression():
+    """Test check_entry returns the parsed schedule for valid lines only"""
+    errors, warnings, expression = checker.check_entry("*/30 * * * * /usr/bin/true", 1, checker.LineSource("test"))
+    assert errors == [] and warnings == []
+    assert expression.values(MINUTE) == [0, 30]
+    assert checker.check_entry("61 * * * * /usr/bin/true", 1, checker.LineSource("test"))[2] is None
+    assert checker.check_entry("@reboot /usr/bin/true", 1, checker.LineSource("test"))[2] is None
+    assert checker.check_entry("@hourly root /usr/bin/true", 1, checker.LineSource("test"), is_system_crontab=True)[2].values(MINUTE) == [0]
+    assert checker.check_entry("SHELL=/bin/sh", 1, checker.LineSource("test")) == ([], [], None)
+
+
+# ============================================================================
+# FieldCache tests
+# ============================================================================
+
+
+def test_field_cache_hits_and_copies():
+    """Test repeated tokens are served from the cache as independent lists"""
+    cache = FieldCache(maxsize=8)
+    assert cache.parse(MINUTE, "61") == (0, ["value 61 out of bounds (0-59) for minutes: '61'"])
+    _, errors = cache.parse(MINUTE, "61")
+    errors.append("mutated")
+    assert cache.parse(MINUTE, "61")[1] == ["value 61 out of bounds (0-59) for minutes: '61'"]
+    assert cache.stats() == {"hits": 2, "misses": 1, "size": 1, "maxsize": 8}
+
+
+def test_field_cache_system_flag_only_keys_minutes():
+    """Test the system crontab flag is part of the key for minutes only"""
+    cache = FieldCache(maxsize=8)
+    assert cache.parse(MINUTE, "-5", True) == (1 << 5, [])
+    assert cache.parse(MINUTE, "-5", False)[1] == ["invalid minute format: '-5'"]
+    cache.parse(HOUR, "5", True)
+    cache.parse(HOUR, "5", False)
+    assert cache.stats()["misses"] == 3
+
+
+def test_field_cache_eviction_and_resize():
+    """Test least recently used entries are evicted and size is configurable"""
+    cache = FieldCache(maxsize=2)
+    cache.parse(MINUTE, "1")
+    cache.parse(MINUTE, "2")
+    cache.parse(MINUTE, "1")
+    cache.parse(MINUTE, "3")
+    assert list(cache.entries) == [(MINUTE, "1", False), (MINUTE, "3", False)]
+    cache.resize(0)
+    cache.parse(MINUTE, "4")
+    assert cache.stats()["size"] == 0
+
+
+# ============================================================================
+# Next fire time tests
+# ============================================================================
+
+
+def scan_next_fire(expression, after):
+    """Reference next fire time by checking every following minute"""
+    current = after.replace(second=0, microsecond=0)
+    for _ in range(366 * 24 * 60):
+        current += timedelta(minutes=1)
+        if expression.matches(current.minute, current.hour, current.day, current.month, (current.weekday() + 1) % 7):
+            return current
+    return None
+
+
+def test_first_weekday():
+    """Test the day of week of the first of the month over leap and century years"""
+    for year in (1900, 2000, 2023, 2024, 2100):
+        for month in range(1, 13):
+            assert first_weekday(year, month) == (datetime(year, month, 1).weekday() + 1) % 7
+
+
+@pytest.mark.parametrize(
+    "fields, after, expected",
+    [
+        ("0 2 * * *", datetime(2025, 1, 31, 23, 59, 30), datetime(2025, 2, 1, 2, 0)),
+        ("0 2 * * *", datetime(2025, 2, 1, 2, 0), datetime(2025, 2, 2, 2, 0)),
+        ("*/15 9-17 * * 1-5", datetime(2025, 1, 31, 17, 45), datetime(2025, 2, 3, 9, 0)),
+        ("0 0 29 2 *", datetime(2025, 1, 1), datetime(2028, 2, 29, 0, 0)),
+        ("59 23 31 12 *", datetime(2025, 12, 31, 23, 59), datetime(2026, 12, 31, 23, 59)),
+        # Both day fields restricted: either may match
+        ("0 0 13 * 5", datetime(2025, 6, 1), datetime(2025, 6, 6, 0, 0)),
+        # Day of month starred with a step: both must match (odd days that are Mondays)
+        ("0 0 */2 * 1", datetime(2025, 6, 1), datetime(2025, 6, 9, 0, 0)),
+        ("0 0 30 2 *", datetime(2025, 1, 1), None),
+    ],
+)
+def test_next_fire(fields, after, expected):
+    """Test next fire times across day, month and year boundaries with Vixie day matching"""
+    expression, _ = CronExpression.parse(*fields.split())
+    assert expression.next_fire(after) == expected
+
+
+def test_next_fire_matches_minute_scan():
+    """Test next_fire agrees with checking every minute for random schedules and start times"""
+    rng = random.Random(5)
+
+    def field(low, high):
+        kind = rng.random()
+        if kind < 0.3:
+            return "*"
+        if kind < 0.45:
+            return f"*/{rng.randint(2, 7)}"
+        if kind < 0.75:
+            return ",".join(str(rng.randint(low, high)) for _ in range(rng.randint(1, 3)))
+        start = rng.randint(low, high)
+        return f"{start}-{rng.randint(start, high)}"
+
+    for _ in range(25):
+        expression, errors = CronExpression.parse(field(0, 59), field(0, 23), field(1, 31), field(1, 12), field(0, 7))
+        if errors:
+            continue
+        after = datetime(2024, 1, 1) + timedelta(minutes=rng.randrange(2 * 365 * 24 * 60), seconds=rng.randrange(60))
+        expected = scan_next_fire(expression, after)
+        if expected is not None:
+            assert expression.next_fire(after) == expected
+
+
+def test_iter_fires_keeps_tzinfo():
+    """Test consecutive runs are listed in order with the start time's tzinfo"""
+    expression, _ = CronExpression.parse("30", "*/12", "*", "*", "*")
+    after = datetime(2025, 3, 1, 23, 0, tzinfo=timezone.utc)
+    assert list(itertools.islice(expression.iter_fires(after), 3)) == [
+        datetime(2025, 3, 2, 0, 30, tzinfo=timezone.utc),
+        datetime(2025, 3, 2, 12, 30, tzinfo=timezone.utc),
+        datetime(2025, 3, 3, 0, 30, tzinfo=timezone.utc),
+    ]
@@ -4,6 +4,7 @@
 Tests for checkcrontab package
 """
 
+import argparse
 import importlib
 import importlib.util
 import json
@@ -11,6 +12,7 @@ import logging
 import os
 import runpy
 import sys
+import time
 import pytest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -24,6 +26,7 @@ sys.modules["checkcrontab"] = checkcrontab_pkg
 package_spec.loader.exec_module(checkcrontab_pkg)
 
 check_crontab = importlib.import_module("checkcrontab.main")
+Diagnostic = importlib.import_module("checkcrontab.diagnostic").Diagnostic
 checker = importlib.import_module("checkcrontab.checker")
 setup_logging = importlib.import_module("checkcrontab.logger").setup_logging
 
@@ -203,7 +206,7 @@ def test_check_cron_daemon_running(mock_run):
     mock_run.return_value.stdout = "active\n"
 
     # Should not raise any exceptions
-    checker.check_daemon()
+    checker.check_daemon_systemctl()
 
 
 @patch("checkcrontab.checker.subprocess.run")
@@ -213,7 +216,7 @@ def test_check_cron_daemon_not_running(mock_run):
     mock_run.return_value.stdout = "inactive\n"
 
     # Should not raise any exceptions
-    checker.check_daemon()
+    checker.check_daemon_systemctl()
 
 
 @patch("checkcrontab.checker.os.path.exists")
@@ -425,7 +428,7 @@ def test_duplicate_files_processed_once(mock_exists, mock_env, mock_platform, tm
     f.write_text("0 1 * * * echo hi\n")
     calls = []
 
-    def fake_check_file(path, is_system_crontab=False):  # pragma: no cover - simple shim
+    def fake_check_file(path, is_system_crontab=False, users=None):  # pragma: no cover - simple shim
         calls.append((path, is_system_crontab))
         return 1, []
 
@@ -515,18 +518,14 @@ def run_main(args):
         return check_crontab.main()
 
 
-def test_import_fallback_run_as_script(tmp_path, monkeypatch):
-    # Execute main.py as a script so the relative import fails and absolute succeeds
-    script_path = Path(check_crontab.__file__).resolve()
-    # Provide a simple valid file argument to keep runtime short
+def test_run_as_module(tmp_path, monkeypatch):
+    # Execute the package as python3 -m checkcrontab
     valid = tmp_path / "valid_cron"
     valid.write_text("0 0 * * * echo ok\n")
     monkeypatch.setenv("GITHUB_ACTIONS", "true")  # prevent auto /etc/crontab addition
-    with patch("sys.argv", [str(script_path), str(valid)]):
-        try:
-            runpy.run_path(str(script_path), run_name="__main__")
-        except SystemExit as e:  # main exits
-            assert e.code == 0
+    with patch("sys.argv", ["checkcrontab", str(valid)]), pytest.raises(SystemExit) as e:
+        runpy.run_module("checkcrontab", run_name="__main__")
+    assert e.value.code == 0
 
 
 @patch("checkcrontab.main.platform.system", return_value="Linux")
@@ -584,25 +583,18 @@ def test_auto_added_missing_system_file_warning(mock_perm, mock_daemon, mock_exi
 @patch("checkcrontab.main.os.path.exists", return_value=True)
 @patch("checkcrontab.checker.check_daemon")
 @patch("checkcrontab.checker.check_owner_and_permissions")
-def test_temp_file_cleanup_error(mock_perm, mock_daemon, mock_exists, mock_env, mock_platform, monkeypatch, caplog, tmp_path):
-    caplog.set_level("DEBUG")
-    # Create a fake temp file path returned by find_user_crontab
-    temp_file = tmp_path / "crontab.testuser"
-    temp_file.write_text("0 2 * * * echo hi\n")
-
-    def fake_find_user_crontab(username):
-        return str(temp_file)
-
-    monkeypatch.setattr(check_crontab, "find_user_crontab", fake_find_user_crontab)
-
-    # Force os.unlink to raise to hit debug exception path
-    def unlink_raiser(path):  # pragma: no cover - simple helper
-        raise OSError("permission denied")
-
-    monkeypatch.setattr(check_crontab.os, "unlink", unlink_raiser)
-    code = run_main(["--debug", "-u", "testuser"])
-    assert code == 0
-    assert any("Failed to remove temporary file" in r.getMessage() for r in caplog.records if r.levelname == "DEBUG")
+def test_user_crontab_output_checked_in_memory(mock_perm, mock_daemon, mock_exists, mock_env, mock_platform, monkeypatch, capsys):
+    """Test `crontab -l` output is checked without writing a temporary file"""
+    monkeypatch.setattr(check_crontab, "find_user_crontab", lambda username: None)
+    monkeypatch.setattr(check_crontab.checker, "get_crontab", lambda username, timeout: "0 2 * * * echo hi\n61 2 * * * echo bad\n")
+    monkeypatch.setattr("tempfile.NamedTemporaryFile", MagicMock(side_effect=AssertionError("temporary file written")))
+    code = run_main(["--format", "json", "-u", "testuser"])
+    data = json.loads(capsys.readouterr().out)
+    assert code == 1
+    assert data["files"][0]["file"] == "crontab -u testuser -l"
+    assert data["files"][0]["rows"] == 2
+    assert len(data["files"][0]["errors"]) == 1
+    assert "(Line 2)" in data["files"][0]["errors"][0]
 
 
 @patch("checkcrontab.main.platform.system", return_value="Linux")
@@ -696,6 +688,83 @@ def test_json_multiple_files_mixed(mock_perm, mock_daemon, mock_env, mock_platfo
     assert code == 1
 
 
+def _write_many_crontabs(tmp_path, count):
+    paths = []
+    for n in range(count):
+        crontab = tmp_path / f"job{n}"
+        minute = 60 if n % 3 == 0 else n
+        crontab.write_text(f"{minute} 2 * * * echo {n}\n0 3 * * * echo ok\n")
+        paths.append(str(crontab))
+    return paths
+
+
+def test_jobs_parallel_output_matches_serial(tmp_path, monkeypatch, capsys):
+    """Test --jobs pool produces the same JSON document as the serial path"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    paths = _write_many_crontabs(tmp_path, check_crontab.PARALLEL_MIN_FILES * 2)
+    user_args = [arg for path in paths for arg in ("-U", path)]
+    serial_code = run_main(["--format", "json", "--jobs", "1", *user_args])
+    serial_out = capsys.readouterr().out
+    parallel_code = run_main(["--format", "json", "--jobs", "4", *user_args])
+    parallel_out = capsys.readouterr().out
+    assert parallel_out == serial_out
+    assert parallel_code == serial_code == 1
+    assert [f["file"] for f in json.loads(parallel_out)["files"]] == paths
+
+
+def test_jobs_parallel_logs_in_input_order(tmp_path, monkeypatch, caplog):
+    """Test log records from worker processes are replayed in input order"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    paths = _write_many_crontabs(tmp_path, check_crontab.PARALLEL_MIN_FILES)
+    tasks = [((path, False, False, None, None), "text") for path in paths]
+    with caplog.at_level(logging.INFO):
+        results = check_crontab.check_paths(tasks, jobs=3)
+    assert [info["file"] for info, _, _ in results] == paths
+    summaries = [r.getMessage() for r in caplog.records if "lines with" in r.getMessage()]
+    assert [message.split(":")[0] for message in summaries] == paths
+
+
+def test_resolve_jobs():
+    """Test --jobs resolution: auto, small batches and upper bound"""
+    assert check_crontab.resolve_jobs(4, 1) == 1
+    assert check_crontab.resolve_jobs(4, check_crontab.PARALLEL_MIN_FILES - 1) == 1
+    assert check_crontab.resolve_jobs(64, check_crontab.PARALLEL_MIN_FILES) == check_crontab.PARALLEL_MIN_FILES
+    with patch("checkcrontab.main.os.cpu_count", return_value=3):
+        assert check_crontab.resolve_jobs(0, 100) == 3
+
+
+def test_result_cache_serves_unchanged_files(tmp_path, monkeypatch, capsys):
+    """Test --cache-dir serves unchanged files without re-checking and --no-cache bypasses it"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    crontab = tmp_path / "job"
+    crontab.write_text("61 2 * * * echo bad\n")
+    args = ["--format", "json", "--cache-dir", str(tmp_path / "cache"), "-U", str(crontab)]
+    assert run_main(args) == 1
+    first = capsys.readouterr().out
+    with patch("checkcrontab.main.check_file", side_effect=AssertionError("cached file re-checked")):
+        assert run_main(args) == 1
+    assert capsys.readouterr().out == first
+    with patch("checkcrontab.main.check_file", return_value=(1, [])) as mock_check_file:
+        assert run_main([*args, "--no-cache"]) == 0
+    assert mock_check_file.call_count == 1
+    crontab.write_text("0 2 * * * echo ok\n")
+    assert run_main(args) == 0
+
+
+def test_result_cache_replays_logs(tmp_path, monkeypatch, caplog):
+    """Test cached results re-emit their log messages"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    crontab = tmp_path / "job"
+    crontab.write_text("61 2 * * * echo bad\n")
+    tasks = [((str(crontab), False, False, None, None), "text")]
+    check_crontab.check_paths(tasks, cache_dir=str(tmp_path / "cache"))
+    first = [(r.levelno, r.getMessage()) for r in caplog.records]
+    caplog.clear()
+    check_crontab.check_paths(tasks, cache_dir=str(tmp_path / "cache"))
+    assert [(r.levelno, r.getMessage()) for r in caplog.records] == first
+    assert any("value 61 out of bounds" in message for _, message in first)
+
+
 # Additional JSON tests
 @patch("checkcrontab.main.platform.system", return_value="Linux")
 @patch("checkcrontab.main.os.getenv", return_value="false")  # not GitHub so system crontab auto-added
@@ -1035,6 +1104,197 @@ def test_multiple_usernames_with_missing(mock_perm, mock_daemon, mock_exists, mo
     assert any("user3" in r.getMessage() for r in caplog.records if r.levelname == "WARNING")
 
 
+@patch("checkcrontab.main.platform.system", return_value="Linux")
+@patch("checkcrontab.main.os.getenv", return_value="true")
+@patch("checkcrontab.checker.check_daemon")
+@patch("checkcrontab.checker.check_owner_and_permissions")
+def test_usernames_looked_up_concurrently_in_order(mock_perm, mock_daemon, mock_env, mock_platform, tmp_path, capsys, monkeypatch):
+    """Test user crontabs are looked up at once and reported in command line order, whichever finishes first"""
+    names = [f"user{index}" for index in range(8)]
+    for name in names:
+        (tmp_path / name).write_text(f"0 1 * * * echo {name}\n")
+
+    def slow_find_user_crontab(username):
+        time.sleep(0.05 * (len(names) - names.index(username)))
+        return str(tmp_path / username)
+
+    monkeypatch.setattr(check_crontab, "find_user_crontab", slow_find_user_crontab)
+    start = time.monotonic()
+    code = run_main(["--format", "json", "-u", "user0", "-u", "user1", "-u", "user2", "-u", "user3", *names[4:]])
+    elapsed = time.monotonic() - start
+    data = json.loads(capsys.readouterr().out)
+    assert code == 0
+    assert [f["file"] for f in data["files"]] == [str(tmp_path / name) for name in names]
+    assert elapsed < 0.05 * sum(range(1, len(names) + 1))
+
+
+def test_user_crontabs_deadline(monkeypatch, caplog):
+    """Test users not looked up within the deadline are reported and do not hold up the others"""
+
+    def fake_user_crontab(username, timeout):
+        time.sleep(1 if username == "slow" else 0)
+        return (f"/var/spool/cron/{username}", None)
+
+    monkeypatch.setattr(check_crontab, "user_crontab", fake_user_crontab)
+    caplog.set_level(logging.WARNING)
+    start = time.monotonic()
+    found = check_crontab.user_crontabs(["alice", "slow", "bob", "alice"], jobs=4, deadline=0.2)
+    assert time.monotonic() - start < 0.9
+    assert list(found) == ["alice", "slow", "bob"]
+    assert found["slow"] is None
+    assert found["bob"] == ("/var/spool/cron/bob", None)
+    assert any("slow" in r.getMessage() for r in caplog.records if r.levelname == "WARNING")
+    assert check_crontab.user_crontabs(["alice", "bob"], jobs=1, deadline=0) == {"alice": None, "bob": None}
+
+
+def test_unreadable_passwd_option_fails(tmp_path, monkeypatch, caplog):
+    """Test --passwd with a file that cannot be read stops the run with one error"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    crontab = tmp_path / "crontab"
+    crontab.write_text("* * * * * root /bin/true\n* * * * * bob /bin/true\n")
+    try:
+        assert check_crontab.main(["--passwd", str(tmp_path / "missing"), "-S", str(crontab)]) == 2
+    finally:
+        checker.USER_DB.configure(None)
+    errors = [r.getMessage() for r in caplog.records if r.levelname == "ERROR"]
+    assert len(errors) == 1 and "Failed to read passwd file" in errors[0]
+    assert "Traceback" not in caplog.text
+
+
+def test_scan_spool(tmp_path):
+    """Test spool files are listed once, the first spool directory wins and other entries are skipped"""
+    crontabs = tmp_path / "crontabs"
+    crontabs.mkdir()
+    (crontabs / "alice").write_text("0 1 * * * echo alice\n")
+    (crontabs / ".placeholder").write_text("")
+    (tmp_path / "alice").write_text("0 2 * * * echo old\n")
+    (tmp_path / "bob").write_text("0 3 * * * echo bob\n")
+    assert check_crontab.scan_spool([str(crontabs), str(tmp_path), str(tmp_path / "missing")]) == [
+        ("alice", str(crontabs / "alice")),
+        ("bob", str(tmp_path / "bob")),
+    ]
+
+
+@patch("checkcrontab.main.platform.system", return_value="Linux")
+@patch("checkcrontab.main.os.getenv", return_value="true")
+@patch("checkcrontab.checker.check_daemon")
+@patch("checkcrontab.checker.check_owner_and_permissions")
+def test_all_users_from_spool(mock_perm, mock_daemon, mock_env, mock_platform, tmp_path, capsys, monkeypatch, caplog):
+    """Test --all-users checks spool files of known users without running crontab -l"""
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    (spool / "alice").write_text("0 1 * * * echo alice\n")
+    (spool / "ghost").write_text("0 2 * * * echo ghost\n")
+    passwd = tmp_path / "passwd"
+    passwd.write_text("alice:x:1000:1000::/home/alice:/bin/sh\n")
+    monkeypatch.setattr(check_crontab, "SPOOL_DIRS", (str(spool),))
+    monkeypatch.setattr(check_crontab.checker, "get_crontab", MagicMock(side_effect=AssertionError("crontab -l run")))
+    caplog.set_level(logging.WARNING)
+    try:
+        code = run_main(["--format", "json", "--passwd", str(passwd), "--all-users"])
+    finally:
+        checker.USER_DB.configure(None)
+    data = json.loads(capsys.readouterr().out)
+    assert code == 0
+    assert [f["file"] for f in data["files"]] == [str(spool / "alice")]
+    assert any("ghost" in r.getMessage() for r in caplog.records)
+
+
+def test_all_users_falls_back_when_spool_unreadable(tmp_path, monkeypatch):
+    """Test crontab -l is run for every passwd user only when the spool cannot be read"""
+    passwd = tmp_path / "passwd"
+    passwd.write_text("alice:x:1000:1000::/home/alice:/bin/sh\nbob:x:1001:1001::/home/bob:/bin/sh\n")
+    monkeypatch.setattr(check_crontab, "SPOOL_DIRS", (str(tmp_path),))
+    monkeypatch.setattr(check_crontab.os, "scandir", MagicMock(side_effect=PermissionError("denied")))
+    monkeypatch.setattr(check_crontab, "find_user_crontab", lambda username: None)
+    monkeypatch.setattr(check_crontab.checker, "get_crontab", lambda username, timeout: "0 1 * * * echo hi\n" if username == "bob" else None)
+    args = argparse.Namespace(user_jobs=4, user_timeout=1, user_deadline=None)
+    checker.USER_DB.configure(str(passwd))
+    try:
+        assert check_crontab.all_user_crontabs(args) == [("crontab -u bob -l", "0 1 * * * echo hi\n")]
+    finally:
+        checker.USER_DB.configure(None)
+
+
+def make_root(root, crontab=None, cron_d=None, spool=None, passwd=None):
+    """Root filesystem tree with the given etc/crontab, etc/cron.d and var/spool/cron/crontabs files"""
+    (root / "etc" / "cron.d").mkdir(parents=True)
+    (root / "var" / "spool" / "cron" / "crontabs").mkdir(parents=True)
+    if crontab is not None:
+        (root / "etc" / "crontab").write_text(crontab)
+    for name, text in (cron_d or {}).items():
+        (root / "etc" / "cron.d" / name).write_text(text)
+    for name, text in (spool or {}).items():
+        (root / "var" / "spool" / "cron" / "crontabs" / name).write_text(text)
+    if passwd is not None:
+        (root / "etc" / "passwd").write_text("".join(f"{user}:x:1000:1000::/home/{user}:/bin/sh\n" for user in passwd))
+    return root
+
+
+@patch("checkcrontab.main.os.getenv", return_value="true")
+@patch("checkcrontab.checker.check_owner_and_permissions", return_value=[])
+def test_roots_grouped_per_root(mock_perm, mock_env, tmp_path, capsys, monkeypatch, caplog):
+    """Test --root globs check each root's system and spool crontabs, typed by their place in the root and totalled per root"""
+    images = tmp_path / "images"
+    web = make_root(images / "web", crontab="0 2 * * * root /usr/bin/backup.sh\n", spool={"alice": "0 3 * * * echo alice\n", "ghost": "0 4 * * * echo\n"}, passwd=["alice"])
+    worker = make_root(images / "worker", cron_d={"jobs": "61 2 * * * root /usr/bin/broken\n", "jobs.bak": "0 1 * * * root true\n"})
+    (images / "notes.txt").write_text("")
+    caplog.set_level(logging.WARNING)
+    code = run_main(["--format", "json", "--root", str(images / "*"), "--root", str(web)])
+    data = json.loads(capsys.readouterr().out)
+    assert code == 1
+    assert [(f["file"], f["is_system_crontab"]) for f in data["files"]] == [
+        (str(web / "etc" / "crontab"), True),
+        (str(web / "var" / "spool" / "cron" / "crontabs" / "alice"), False),
+        (str(worker / "etc" / "cron.d" / "jobs"), True),
+    ]
+    assert data["roots"] == [
+        {"root": str(web), "total_files": 2, "total_rows": 2, "total_errors": 0, "success": True},
+        {"root": str(worker), "total_files": 1, "total_rows": 1, "total_errors": 1, "success": False},
+    ]
+    messages = [r.getMessage() for r in caplog.records]
+    assert any("ghost" in message for message in messages)
+    assert any("jobs.bak" in message for message in messages)
+    assert any("notes.txt is not a directory" in message for message in messages)
+
+
+@patch("checkcrontab.main.os.getenv", return_value="true")
+@patch("checkcrontab.checker.check_owner_and_permissions", return_value=[])
+@pytest.mark.parametrize("jobs", ["1", "4"])
+def test_root_user_fields_checked_against_root_passwd(mock_perm, mock_env, jobs, tmp_path, caplog):
+    """Test the user field of a root's system crontabs is checked against the root's passwd, also in worker processes"""
+    cron_d = {f"jobs{index}": "0 1 * * * imgonly /bin/true\n" for index in range(check_crontab.PARALLEL_MIN_FILES)}
+    root = make_root(tmp_path / "image", crontab="* * * * * imgonly /bin/true\n0 2 * * * hostonly /bin/true\n", cron_d=cron_d, passwd=["imgonly"])
+    assert not checker.check_user_exists("imgonly")
+    caplog.set_level(logging.WARNING)
+    assert run_main(["--jobs", jobs, "--root", str(root)]) == 0
+    warnings = [r.getMessage() for r in caplog.records if "user does not exist" in r.getMessage()]
+    assert warnings == ["crontab (Line 2): 0 2 * * * hostonly /bin/true # user does not exist: 'hostonly'"]
+
+
+def test_roots_listed_concurrently_in_order(monkeypatch):
+    """Test roots are listed at once and their crontabs returned in the given root order"""
+    roots = [f"/images/{index}" for index in range(6)]
+
+    def slow_root_crontabs(root):
+        time.sleep(0.05 * (len(roots) - roots.index(root)))
+        return [(f"{root}/etc/crontab", True, False, None, None)], []
+
+    monkeypatch.setattr(check_crontab, "root_crontabs", slow_root_crontabs)
+    start = time.monotonic()
+    sources = check_crontab.roots_crontabs(roots)
+    assert time.monotonic() - start < 0.05 * sum(range(1, len(roots) + 1))
+    assert [source[0] for source in sources] == [f"{root}/etc/crontab" for root in roots]
+
+
+def test_is_system_path_in_root():
+    """Test the system crontab heuristic applies to paths inside a root filesystem"""
+    assert check_crontab.is_system_path("/srv/rootfs/etc/crontab", "/srv/rootfs")
+    assert check_crontab.is_system_path("/srv/rootfs/etc/cron.d/jobs", "/srv/rootfs")
+    assert not check_crontab.is_system_path("/srv/rootfs/etc/crontab")
+    assert not check_crontab.is_system_path("/srv/rootfs/var/spool/cron/crontabs/alice", "/srv/rootfs")
+
+
 # ============================================================================
 # Combined flags tests
 # ============================================================================
@@ -1112,19 +1372,12 @@ def test_find_user_crontab_from_tmp(mock_exists):
 
 @patch("checkcrontab.main.checker.get_crontab")
 @patch("checkcrontab.main.os.path.exists", return_value=False)
-def test_find_user_crontab_via_command(mock_exists, mock_get_crontab, tmp_path):
-    """Test find_user_crontab getting crontab via command"""
+def test_user_crontab_via_command(mock_exists, mock_get_crontab):
+    """Test user_crontab keeps the crontab command output in memory when there is no crontab file"""
     mock_get_crontab.return_value = "0 * * * * echo test\n"
 
-    result = check_crontab.find_user_crontab("testuser")
-    assert result is not None
-    assert "testuser" in result
-    # Check that file was created
-    with open(result) as f:
-        assert f.read() == "0 * * * * echo test\n"
-    # Cleanup
-    import os
-    os.unlink(result)
+    assert check_crontab.find_user_crontab("testuser") is None
+    assert check_crontab.user_crontab("testuser") == ("crontab -u testuser -l", "0 * * * * echo test\n")
 
 
 @patch("checkcrontab.main.checker.get_crontab", return_value=None)
@@ -1173,6 +1426,37 @@ def test_get_files_with_single_file(tmp_path):
     assert errors == []
 
 
+def test_files_stated_once(tmp_path, monkeypatch, capsys):
+    """Test files found in a directory are not stat'ed again after os.scandir, and a named file only once"""
+    cron_d = tmp_path / "cron.d"
+    cron_d.mkdir()
+    names = ["job0", "job1", "job2"]
+    for name in names:
+        (cron_d / name).write_text("0 2 * * * root /usr/bin/backup.sh\n")
+    (cron_d / "linked").symlink_to(cron_d / "job0")
+    (cron_d / ".hidden").write_text("")
+    single = tmp_path / "single"
+    single.write_text("0 2 * * * root /usr/bin/backup.sh\n")
+    calls = {}
+
+    def counting(stat_function):
+        def wrapper(path, *args, **kwargs):
+            calls[os.fspath(path)] = calls.get(os.fspath(path), 0) + 1
+            return stat_function(path, *args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    monkeypatch.setattr(os, "stat", counting(os.stat))
+    monkeypatch.setattr(os, "lstat", counting(os.lstat))
+    check_crontab.main(["--format", "json", "--no-cache", "--jobs", "1", "-S", str(cron_d), "-S", str(single)])
+    data = json.loads(capsys.readouterr().out)
+    assert sorted(f["file"] for f in data["files"]) == sorted([str(cron_d / name) for name in [*names, "linked"]] + [str(single)])
+    assert {path: count for path, count in calls.items() if path.startswith(str(cron_d) + os.sep)} == {}
+    assert calls[str(cron_d)] == 1
+    assert calls[str(single)] == 1
+
+
 def test_get_files_with_nonexistent_path():
     """Test get_files with non-existent path"""
     files, errors = check_crontab.get_files("/nonexistent/path")
@@ -1197,7 +1481,7 @@ def test_check_file_read_error(mock_exists, mock_env, mock_platform, tmp_path):
         rows, errors = check_crontab.check_file(str(f))
         assert rows == 0
         assert len(errors) == 1
-        assert "Error reading file" in errors[0]
+        assert "Error reading file" in errors[0].message
 
 
 @patch("checkcrontab.main.platform.system", return_value="Linux")
@@ -1221,7 +1505,7 @@ def test_gen_sarif_output_structure():
         {
             "file": "test.cron",
             "errors": [
-                "test.cron (Line 5): 0 * * * * echo test # value 60 out of bounds"
+                Diagnostic.on_line("test.cron", 5, "value 60 out of bounds", "0 * * * * echo test")
             ]
         }
     ]
@@ -1244,8 +1528,8 @@ def test_gen_sarif_output_structure():
     result = run["results"][0]
     assert result["ruleId"] == "crontab-syntax-error"
     assert result["level"] == "error"
-    assert "message" in result
-    assert "locations" in result
+    assert result["message"] == {"text": "value 60 out of bounds"}
+    assert result["locations"][0]["physicalLocation"]["region"] == {"startLine": 5, "startColumn": 1}
 
 
 def test_gen_sarif_output_no_errors():
@@ -1264,8 +1548,8 @@ def test_gen_sarif_output_multiple_errors():
         {
             "file": "test.cron",
             "errors": [
-                "test.cron (Line 1): 60 * * * * echo test # value 60 out of bounds",
-                "test.cron (Line 2): * 25 * * * echo test # value 25 out of bounds"
+                Diagnostic.on_line("test.cron", 1, "value 60 out of bounds", "60 * * * * echo test"),
+                Diagnostic.on_line("test.cron", 2, "value 25 out of bounds", "* 25 * * * echo test"),
             ]
         }
     ]
@@ -1321,6 +1605,19 @@ def test_check_file_skip_empty_continuation_lines(mock_exists, mock_env, mock_pl
     assert rows == 1
 
 
+def test_check_file_reads_file_once(tmp_path):
+    """Test check_file opens the file once regardless of number of reported lines"""
+    crontab = tmp_path / "many_errors"
+    crontab.write_text("".join(f"60 {n % 24} * * * /bin/job{n}\n" for n in range(50)))
+    real_open = open
+    with patch("builtins.open", side_effect=real_open) as mock_open:
+        rows, errors = check_crontab.check_file(str(crontab))
+    assert rows == 50
+    assert len(errors) == 50
+    assert mock_open.call_count == 1
+    assert errors[10].format().startswith("many_errors (Line 11): 60 10 * * * /bin/job10 # ")
+
+
 @patch("checkcrontab.main.platform.system", return_value="Linux")
 @patch("checkcrontab.main.os.getenv", return_value="true")
 @patch("checkcrontab.main.os.path.exists", return_value=True)
@@ -1470,3 +1767,118 @@ def test_import_error_handling(mock_env, mock_platform):
     # But we can verify the code exists and is reachable
     assert hasattr(check_crontab, "logger")
     assert hasattr(check_crontab, "checker")
+
+
+# ============================================================================
+# Watch mode tests
+# ============================================================================
+
+
+def test_watch_mode_rechecks_changed_files(tmp_path, monkeypatch, capsys):
+    """Test --watch re-checks only the changed file and prints one result per change"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    (tmp_path / "good").write_text("0 2 * * * echo ok\n")
+    (tmp_path / "bad").write_text("61 2 * * * echo bad\n")
+
+    def fake_watch(paths, on_change):
+        assert paths == [str(tmp_path)]
+        on_change(str(tmp_path / "bad"))
+        # Backup files are ignored by cron and not re-checked
+        on_change(str(tmp_path / "bad~"))
+
+    with patch("checkcrontab.watch.watch_paths", side_effect=fake_watch):
+        assert run_main(["--format", "json", "--watch", str(tmp_path)]) == 0
+    decoder = json.JSONDecoder()
+    out = capsys.readouterr().out.strip()
+    initial, end = decoder.raw_decode(out)
+    change = json.loads(out[end:])
+    assert initial["total_files"] == 2
+    assert change["total_files"] == 1
+    assert change["files"][0]["file"] == str(tmp_path / "bad")
+    assert change["success"] is False
+
+
+def test_watch_mode_needs_paths(monkeypatch):
+    """Test --watch without files or directories fails"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    with patch("checkcrontab.watch.watch_paths") as mock_watch:
+        assert run_main(["--watch", "-u", "root"]) == 2
+    mock_watch.assert_not_called()
+
+
+# ============================================================================
+# JSON Lines output tests
+# ============================================================================
+
+
+def test_jsonl_matches_json_totals(tmp_path, monkeypatch, capsys):
+    """Test --format jsonl prints one record per file and a summary equal to the JSON totals"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    paths = _write_many_crontabs(tmp_path, 3)
+    assert run_main(["--format", "json", *paths]) == 1
+    document = json.loads(capsys.readouterr().out)
+    assert run_main(["--format", "jsonl", *paths]) == 1
+    lines = capsys.readouterr().out.splitlines()
+    records = [json.loads(line) for line in lines]
+    assert lines[-1] == json.dumps(records[-1], separators=(",", ":"))
+    assert [record["type"] for record in records] == ["file", "file", "file", "summary"]
+    assert [{key: value for key, value in record.items() if key != "type"} for record in records[:-1]] == document["files"]
+    assert records[-1] == {"type": "summary", **{key: value for key, value in document.items() if key != "files"}}
+
+
+def test_jsonl_streams_records_per_file(tmp_path, monkeypatch):
+    """Test each file record is written before the next file is checked"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    paths = _write_many_crontabs(tmp_path, 3)
+    events = []
+    real_check_file = check_crontab.check_file
+
+    def tracking_check_file(path, is_system_crontab=False, users=None):
+        events.append("check")
+        return real_check_file(path, is_system_crontab, users=users)
+
+    with patch("checkcrontab.main.check_file", side_effect=tracking_check_file), patch("checkcrontab.main.write_jsonl", side_effect=lambda record: events.append(record["type"])):
+        run_main(["--format", "jsonl", "--jobs", "1", *paths])
+    assert events == ["check", "file", "check", "file", "check", "file", "summary"]
+
+
+# ============================================================================
+# In-memory input tests
+# ============================================================================
+
+
+def test_check_text_matches_check_file(tmp_path):
+    """Test content held in memory gives the same findings as the same content in a file, line endings included"""
+    content = "0 2 * * * echo ok\r\n61 2 * * * echo bad\n0 3 * * * echo \\\n  continued\n0 4 * * * echo last"
+    crontab = tmp_path / "job"
+    crontab.write_bytes(content.encode("utf-8"))
+    rows, errors = check_crontab.check_file(str(crontab))
+    text_rows, text_errors = check_crontab.check_text(content, str(crontab))
+    assert (text_rows, [error.to_dict() for error in text_errors]) == (rows, [error.to_dict() for error in errors])
+    assert check_crontab.check_lines(iter(["0 2 * * * echo ok\n"]), "generated")[0] == 1
+
+
+@pytest.mark.parametrize("flag", [[], ["-U"], ["-S"]])
+def test_stdin_dash(flag, monkeypatch, capsys):
+    """Test - reads the crontab from standard input"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    line = "0 2 * * * root echo ok\n" if flag == ["-S"] else "0 2 * * * echo ok\n"
+    monkeypatch.setattr(sys, "stdin", __import__("io").StringIO(line + "99 2 * * * echo bad\n"))
+    code = run_main(["--format", "json", *flag, "-"])
+    data = json.loads(capsys.readouterr().out)
+    assert code == 1
+    assert data["total_files"] == 1
+    assert data["files"][0]["file"] == check_crontab.STDIN_NAME
+    assert data["files"][0]["is_system_crontab"] is (flag == ["-S"])
+    assert data["files"][0]["rows"] == 2
+
+
+@pytest.mark.parametrize("args", [["-", "-"], ["-S", "-", "-U", "-"], ["-U", "-", "-"]])
+def test_stdin_dash_given_twice_rejected(args, monkeypatch, caplog):
+    """Test - given more than once is a usage error instead of a silently dropped flag"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    monkeypatch.setattr(sys, "stdin", __import__("io").StringIO("0 2 * * * echo ok\n"))
+    assert run_main(args) == 2
+    assert check_crontab.STDIN_TWICE_ERROR in caplog.text
+    assert check_crontab.main(["analyze", "density", *args]) == 2
+    assert sys.stdin.read() == "0 2 * * * echo ok\n"
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# mypy: ignore-errors
+"""
+Tests for profiling module (per-phase timing and --profile)
+"""
+
+import io
+import json
+import time
+
+import pytest
+
+from checkcrontab import main as check_crontab
+from checkcrontab.profiling import PROFILER, PhaseProfiler
+
+
+def test_nested_phases_charge_innermost():
+    """Test time spent in a nested phase is not charged to the enclosing one"""
+    profiler = PhaseProfiler()
+    profiler.start()
+    with profiler.phase("parsing"):
+        with profiler.phase("permission_checks"):
+            time.sleep(0.05)
+        time.sleep(0.01)
+    assert profiler.times["permission_checks"] >= 0.05
+    assert profiler.times["parsing"] < 0.05
+    assert profiler.stack == []
+    assert profiler.report("/nonexistent", io.StringIO()) == []
+
+
+def test_profile_report_writes_pstats(tmp_path):
+    """Test each entered phase gets its own pstats file and summary"""
+    pstats = pytest.importorskip("pstats")
+    profiler = PhaseProfiler()
+    profiler.start(profile=True)
+    with profiler.phase("discovery"):
+        sorted(range(1000))
+    stream = io.StringIO()
+    written = profiler.report(str(tmp_path / "prof"), stream)
+    assert written == [str(tmp_path / "prof" / "discovery.pstats")]
+    assert pstats.Stats(written[0]).total_calls > 0
+    assert "=== discovery:" in stream.getvalue()
+
+
+def test_cli_profile(tmp_path, monkeypatch, capsys):
+    """Test --profile writes discovery, parsing and rendering profiles for a run"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    crontab = tmp_path / "crontab"
+    crontab.write_text("0 2 * * * /usr/bin/backup.sh\n")
+    profile_dir = tmp_path / "prof"
+    try:
+        assert check_crontab.main(["--profile", str(profile_dir), "--format", "json", "-U", str(crontab)]) == 0
+    finally:
+        PROFILER.start()
+    assert sorted(path.name for path in profile_dir.iterdir()) == ["discovery.pstats", "parsing.pstats", "rendering.pstats"]
+    captured = capsys.readouterr()
+    assert '"total_files": 1' in captured.out
+    assert "=== parsing:" in captured.err
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_json_timings_block(tmp_path, monkeypatch, capsys, jobs):
+    """Test --timings adds phase times and per-file parse times, also from worker processes"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    for index in range(check_crontab.PARALLEL_MIN_FILES):
+        (tmp_path / f"job{index}").write_text("# comment\n0 2 * * * /usr/bin/backup.sh\n")
+    paths = [str(tmp_path / f"job{index}") for index in range(check_crontab.PARALLEL_MIN_FILES)]
+    assert check_crontab.main(["--timings", "--format", "json", "--jobs", jobs, *[arg for path in paths for arg in ("-U", path)]]) == 0
+    data = json.loads(capsys.readouterr().out)
+    timings = data["timings"]
+    assert list(data)[-1] == "timings"
+    assert list(timings["phases"]) == ["discovery", "daemon_check", "permission_checks", "parsing", "rendering"]
+    assert timings["phases"]["parsing"] > 0
+    assert timings["phases"]["rendering"] > 0
+    assert sorted(entry["file"] for entry in timings["files"]) == sorted(paths)
+    assert all(entry["lines"] == 2 and entry["rows"] == 1 and entry["parse_s"] > 0 and not entry["cached"] for entry in timings["files"])
+    assert timings["lines"] == 2 * len(paths)
+    # Worker time is summed apart from the wall-time phases
+    assert ("worker_phases" in timings) == (jobs == "2")
+
+
+def test_json_without_timings(tmp_path, monkeypatch, capsys):
+    """Test the JSON document has no timings block unless asked for"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    crontab = tmp_path / "crontab"
+    crontab.write_text("0 2 * * * /usr/bin/backup.sh\n")
+    check_crontab.main(["--format", "json", "-U", str(crontab)])
+    assert "timings" not in json.loads(capsys.readouterr().out)
+    assert PROFILER.files == []
+
+
+def test_json_timings_lists_cached_files(tmp_path, monkeypatch, capsys):
+    """Test files served from the result cache get a timings entry flagged as cached"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    crontab = tmp_path / "job"
+    crontab.write_text("0 2 * * * /usr/bin/backup.sh\n")
+    args = ["--timings", "--format", "json", "--cache-dir", str(tmp_path / "cache"), "-U", str(crontab)]
+    assert check_crontab.main(args) == 0
+    assert [entry["cached"] for entry in json.loads(capsys.readouterr().out)["timings"]["files"]] == [False]
+    assert check_crontab.main(args) == 0
+    timings = json.loads(capsys.readouterr().out)["timings"]
+    assert timings["files"] == [{"file": str(crontab), "rows": 1, "cached": True}]
+    assert timings["lines"] == 0
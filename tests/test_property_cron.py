@@ -3,10 +3,13 @@
 
 from __future__ import annotations
 
+import re
+
 from hypothesis import HealthCheck, given as hypothesis_given, settings, strategies as st
 from typing import Any, Callable, cast
 
 from checkcrontab.checker import check_line
+from checkcrontab.expression import DAY, HOUR, MINUTE, MONTH, WEEKDAY, CronExpression, parse_field
 
 Decorator = Callable[[Callable[..., Any]], Callable[..., Any]]
 DecoratorFactory = Callable[..., Decorator]
@@ -172,3 +175,149 @@ def test_special_system_keywords(keyword: str, command: str) -> None:
     errors, warnings = check_line(line, 1, "special-system_cron", is_system_crontab=True)
     assert errors == []
     assert warnings == []
+
+
+# Reference grammar for time fields: the field regexes and list/range/step checks of the former
+# line-by-line validator. expression.parse_field must give the same messages.
+MINUTE_PATTERN = r"^(\*|([0-5]?[0-9])(-([0-5]?[0-9]))?(/([0-9]+))?(,([0-5]?[0-9])(-([0-5]?[0-9]))?(/([0-9]+))?)*|\*/([0-9]+))$"
+HOUR_PATTERN = r"^(\*|([0-9]|1[0-9]|2[0-3])(-([0-9]|1[0-9]|2[0-3]))?(/([0-9]|1[0-9]|2[0-3]))?(,([0-9]|1[0-9]|2[0-3])(-([0-9]|1[0-9]|2[0-3]))?(/([0-9]|1[0-9]|2[0-3]))?)*|\*/([0-9]|1[0-9]|2[0-3]))$"
+DAY_PATTERN = r"^(\*|([1-9]|[12][0-9]|3[01])(-([1-9]|[12][0-9]|3[01]))?(/([1-9]|[12][0-9]|3[01]))?(,([1-9]|[12][0-9]|3[01])(-([1-9]|[12][0-9]|3[01]))?(/([1-9]|[12][0-9]|3[01]))?)*|\*/([1-9]|[12][0-9]|3[01]))$"
+MONTH_PATTERN = r"^(\*|([1-9]|1[0-2])(-([1-9]|1[0-2]))?(/([1-9]|1[0-2]))?(,([1-9]|1[0-2])(-([1-9]|1[0-2]))?(/([1-9]|1[0-2]))?)*|\*/([1-9]|1[0-2]))$"
+WEEKDAY_PATTERN = r"^(\*|([0-7])(-([0-7]))?(/([0-7]))?(,([0-7])(-([0-7]))?)*|\*/([0-7]))$"
+
+
+def _validate_time_field_logic(value: str, field_name: str, min_val: int, max_val: int) -> list[str]:
+    """Validate time field logic (ranges, lists, steps)"""
+    errors: list[str] = []
+
+    # Skip special values
+    if value in ["*"]:
+        return errors
+
+    # Handle lists (comma-separated values)
+    if "," in value:
+        parts = value.split(",")
+        seen_values = set()
+        for part in parts:
+            part_stripped = part.strip()
+            if not part_stripped:
+                errors.append(f"empty value in {field_name} list: '{value}'")
+                continue
+
+            # Check for duplicates
+            if part_stripped in seen_values:
+                errors.append(f"duplicate value '{part_stripped}' in {field_name} list: '{value}'")
+            seen_values.add(part_stripped)
+
+            # Validate individual part
+            part_errors = _validate_single_time_value(part_stripped, field_name, min_val, max_val)
+            errors.extend(part_errors)
+    else:
+        # Validate single value or range or step
+        part_errors = _validate_single_time_value(value, field_name, min_val, max_val)
+        errors.extend(part_errors)
+
+    return errors
+
+
+def _validate_single_time_value(value: str, field_name: str, min_val: int, max_val: int) -> list[str]:
+    """Validate single time value, range, or step"""
+    errors: list[str] = []
+
+    # Handle steps (*/n)
+    if value.startswith("*/"):
+        step_part = value[2:]
+        if step_part.isdigit():
+            step_val = int(step_part)
+            if step_val <= 0:
+                errors.append(f"step value must be positive in {field_name}: '{value}'")
+            # Step can be any positive number - cron will handle it correctly
+            # Step should not exceed the maximum value for the field
+            if step_val > max_val:
+                errors.append(f"step value {step_val} exceeds maximum {max_val} for {field_name}: '{value}'")
+        else:
+            errors.append(f"invalid step value in {field_name}: '{value}'")
+        return errors
+
+    # Handle ranges (n-m)
+    if "-" in value:
+        range_parts = value.split("-")
+        if len(range_parts) == 2:
+            start_str, end_str = range_parts
+            if start_str.isdigit() and end_str.isdigit():
+                start_val = int(start_str)
+                end_val = int(end_str)
+
+                if start_val > end_val:
+                    errors.append(f"invalid range {start_val}-{end_val} in {field_name}: start > end")
+
+                if start_val < min_val or start_val > max_val:
+                    errors.append(f"range start {start_val} out of bounds ({min_val}-{max_val}) for {field_name}: '{value}'")
+
+                if end_val < min_val or end_val > max_val:
+                    errors.append(f"range end {end_val} out of bounds ({min_val}-{max_val}) for {field_name}: '{value}'")
+        return errors
+
+    # Handle single numeric values
+    if value.isdigit():
+        num_val = int(value)
+        if num_val < min_val or num_val > max_val:
+            errors.append(f"value {num_val} out of bounds ({min_val}-{max_val}) for {field_name}: '{value}'")
+
+    return errors
+
+
+FIELD_TOKENS = st.text(alphabet="0123456789*/-,", min_size=1, max_size=9)
+FIELD_REFERENCE = [
+    (MINUTE, "minutes", "minute", 0, 59, MINUTE_PATTERN),
+    (HOUR, "hours", "hour", 0, 23, HOUR_PATTERN),
+    (DAY, "day of month", "day of month", 1, 31, DAY_PATTERN),
+    (MONTH, "month", "month", 1, 12, MONTH_PATTERN),
+    (WEEKDAY, "day of week", "day of week", 0, 7, WEEKDAY_PATTERN),
+]
+
+
+@COMMON_SETTINGS
+@typed_given(value=FIELD_TOKENS, reference=st.sampled_from(FIELD_REFERENCE))
+def test_parse_field_matches_reference_grammar(value: str, reference: Any) -> None:
+    field, name, format_name, min_val, max_val, pattern = reference
+    _, errors = parse_field(field, value)
+    expected = _validate_time_field_logic(value, name, min_val, max_val)
+    if not expected and not re.match(pattern, value):
+        expected = [f"invalid {format_name} format: '{value}'"]
+    if expected:
+        assert errors == expected
+    else:
+        # Accepted by the reference grammar; only zero steps and reversed stepped ranges are rejected on top
+        assert all("must be positive" in error or "start > end" in error for error in errors)
+
+
+@COMMON_SETTINGS
+@typed_given(
+    minute=_valid_field(0, 59),
+    hour=_valid_field(0, 23),
+    day=_valid_field(1, 31),
+    month=_valid_field(1, 12),
+    weekday=_valid_field(0, 7),
+)
+def test_expression_matches_brute_force(minute: str, hour: str, day: str, month: str, weekday: str) -> None:
+    expression, errors = CronExpression.parse(minute, hour, day, month, weekday)
+    assert errors == []
+    assert expression is not None
+    for field, value, min_val, max_val in ((MINUTE, minute, 0, 59), (HOUR, hour, 0, 23), (DAY, day, 1, 31), (MONTH, month, 1, 12), (WEEKDAY, weekday, 0, 7)):
+        assert expression.values(field) == sorted(_expand(value, min_val, max_val))
+
+
+def _expand(value: str, min_val: int, max_val: int) -> set[int]:
+    selected: set[int] = set()
+    for part in value.split(","):
+        span, _, step_str = part.partition("/")
+        step = int(step_str) if step_str else 1
+        if span == "*":
+            start, end = min_val, max_val
+        elif "-" in span:
+            start, end = (int(bound) for bound in span.split("-"))
+        else:
+            start = end = int(span)
+        selected.update(range(start, end + 1, step))
+    return selected
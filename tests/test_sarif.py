@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# mypy: ignore-errors
+"""
+Tests for sarif module (streaming SARIF writer)
+"""
+
+import io
+import json
+
+import pytest
+
+from checkcrontab.diagnostic import RULE_PERMISSIONS, SEVERITY_WARNING, Diagnostic
+from checkcrontab.sarif import SarifWriter, gen_sarif_output
+
+
+def make_files(count):
+    """Files with a mix of errors, warnings and clean files"""
+    files = []
+    for index in range(count):
+        errors = [Diagnostic.on_line(f"job{index}", index + 1, f"bad \"minute\" {index}", "61 * * * * echo")]
+        if index % 2:
+            errors.append(Diagnostic(f"job{index}", 0, "File should have permissions 644", severity=SEVERITY_WARNING, rule_id=RULE_PERMISSIONS))
+        files.append({"file": f"/etc/cron.d/job{index}", "errors": errors})
+        files.append({"file": f"/etc/cron.d/clean{index}", "errors": []})
+    return files
+
+
+@pytest.mark.parametrize("count", [0, 1, 5])
+def test_writer_matches_json_dumps(count):
+    """Test the streamed document is byte-identical to dumping the whole SARIF log"""
+    files = make_files(count)
+    stream = io.StringIO()
+    with SarifWriter(stream) as writer:
+        for file_info in files:
+            writer.add_file(file_info)
+    assert stream.getvalue() == json.dumps(gen_sarif_output(files, total_errors=count), indent=2) + "\n"
+
+
+def test_writer_header_written_before_results():
+    """Test the header is written on enter so output starts before the first file is checked"""
+    stream = io.StringIO()
+    with SarifWriter(stream) as writer:
+        assert stream.getvalue().startswith('{\n  "$schema"')
+        assert stream.getvalue().endswith('"results": [')
+        writer.add_file(make_files(1)[0])
+    assert json.loads(stream.getvalue())["runs"][0]["results"][0]["ruleId"] == "crontab-syntax-error"
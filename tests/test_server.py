@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# mypy: ignore-errors
+"""
+Tests for server module (resident checker over a Unix socket)
+"""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+
+from checkcrontab import main as check_crontab
+from checkcrontab import server
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available")
+
+
+@pytest.fixture
+def running_server(monkeypatch):
+    """Start a server thread on a short socket path, yields the path"""
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    socket_dir = tempfile.mkdtemp(prefix="ccs")
+    socket_path = os.path.join(socket_dir, "s")
+    stop = threading.Event()
+    thread = threading.Thread(target=server.serve, args=(socket_path, check_crontab.run, stop), daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 3
+    while not os.path.exists(socket_path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    yield socket_path
+    stop.set()
+    thread.join(3)
+    os.rmdir(socket_dir)
+
+
+# ============================================================================
+# forward/serve tests
+# ============================================================================
+
+
+def test_forward_matches_local_run(running_server, tmp_path, capsys):
+    """Test a forwarded check prints the same output and exit code as a local run"""
+    crontab = tmp_path / "job"
+    crontab.write_text("61 2 * * * echo bad\n")
+    argv = ["--format", "json", str(crontab)]
+    assert check_crontab.run(argv) == 1
+    local = capsys.readouterr().out
+    assert server.forward(argv, running_server) == 1
+    assert capsys.readouterr().out == local
+    assert json.loads(local)["total_errors"] == 1
+
+
+def test_forward_uses_client_directory(running_server, tmp_path, monkeypatch, capsys):
+    """Test relative paths are resolved in the client's working directory"""
+    (tmp_path / "job").write_text("0 2 * * * echo ok\n")
+    monkeypatch.chdir(tmp_path)
+    assert server.forward(["--format", "json", "job"], running_server) == 0
+    assert json.loads(capsys.readouterr().out)["files"][0]["file"] == str(tmp_path / "job")
+
+
+def test_forward_reports_argparse_exit(running_server, capsys):
+    """Test --version and usage errors come back as exit codes"""
+    assert server.forward(["--version"], running_server) == 0
+    assert check_crontab.VERSION in capsys.readouterr().out
+    assert server.forward(["--format", "xml"], running_server) == 2
+    assert "invalid choice" in capsys.readouterr().err
+
+
+def test_forward_without_server(tmp_path):
+    """Test the client falls back when nothing listens on the socket"""
+    assert server.forward(["--version"], str(tmp_path / "missing")) is None
+    assert server.forward(["--watch", "/etc/crontab"], str(tmp_path / "missing")) is None
+
+
+def test_handle_request_rejects_local_only_options():
+    """Test watch mode and nested serve are not run inside the server"""
+    response = server.handle_request({"argv": ["--watch", "/etc/crontab"]}, check_crontab.run)
+    assert response["exit_code"] == 2
+    assert server.handle_request({"argv": "--version"}, check_crontab.run)["exit_code"] == 2
+
+
+def test_main_forwards_when_socket_configured(running_server, monkeypatch):
+    """Test main() forwards to the server named by the environment"""
+    monkeypatch.setenv(server.SOCKET_ENV, running_server)
+    monkeypatch.setattr(check_crontab, "run", lambda argv: pytest.fail("check ran locally"))
+    assert check_crontab.main(["--version"]) == 0
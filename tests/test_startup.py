@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# mypy: ignore-errors
+"""
+Tests for startup imports (see benchmarks/startup.py for the timed budget)
+"""
+
+import ast
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def imported_modules(code):
+    """Run code in a fresh interpreter and return the set of loaded modules"""
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    env.pop("CHECKCRONTAB_SOCKET", None)
+    proc = subprocess.run([sys.executable, "-c", f"{code}\nimport sys; print(sorted(sys.modules))"], capture_output=True, text=True, env=env, check=True)
+    return set(ast.literal_eval(proc.stdout.splitlines()[-1]))
+
+
+def test_library_import_skips_cli():
+    """Test importing the checker does not load the CLI or its helpers"""
+    modules = imported_modules("import checkcrontab.checker")
+    assert "checkcrontab.main" not in modules
+    assert "argparse" not in modules
+    assert "checkcrontab.cache" not in modules
+
+
+def test_cli_import_skips_forbidden_modules():
+    """Test the CLI module does not eagerly load modules listed in the startup budget"""
+    with open(ROOT / "benchmarks" / "startup_budget.json") as f:
+        budget = json.load(f)
+    assert imported_modules("import checkcrontab.main") & set(budget["forbidden_modules"]) == set()
+
+
+def test_package_exposes_submodules_lazily():
+    """Test submodules are still reachable as package attributes"""
+    import checkcrontab
+
+    assert checkcrontab.checker.check_line is not None
+    assert checkcrontab.expression.CronExpression is not None
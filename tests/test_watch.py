@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# mypy: ignore-errors
+"""
+Tests for watch module (inotify based watch mode)
+"""
+
+import sys
+import threading
+import time
+
+import pytest
+
+from checkcrontab import watch
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+
+
+def run_watcher(paths, debounce=0.05):
+    """Start watch_paths in a thread, returns (changes, stop event, thread)"""
+    changes = []
+    stop = threading.Event()
+    thread = threading.Thread(target=watch.watch_paths, args=(paths, changes.append, debounce, stop), daemon=True)
+    thread.start()
+    # Give the watcher time to register its watches
+    time.sleep(0.1)
+    return changes, stop, thread
+
+
+def wait_for(changes, count, timeout=3.0):
+    """Wait until at least count changes were reported"""
+    deadline = time.monotonic() + timeout
+    while len(changes) < count and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+
+# ============================================================================
+# watch_paths tests
+# ============================================================================
+
+
+def test_watch_directory_debounces_bursts(tmp_path):
+    """Test several writes to one file are reported once"""
+    changes, stop, thread = run_watcher([str(tmp_path)])
+    crontab = tmp_path / "job"
+    for i in range(5):
+        crontab.write_text(f"{i} * * * * echo\n")
+    wait_for(changes, 1)
+    time.sleep(0.2)
+    stop.set()
+    thread.join(2)
+    assert changes == [str(crontab)]
+
+
+def test_watch_file_ignores_siblings(tmp_path):
+    """Test a watched file only reports itself, including replacement by rename"""
+    crontab = tmp_path / "job"
+    crontab.write_text("0 * * * * echo\n")
+    changes, stop, thread = run_watcher([str(crontab)])
+    (tmp_path / "other").write_text("0 * * * * echo\n")
+    new = tmp_path / "job.new"
+    new.write_text("1 * * * * echo\n")
+    new.rename(crontab)
+    wait_for(changes, 1)
+    time.sleep(0.2)
+    stop.set()
+    thread.join(2)
+    assert changes == [str(crontab)]
+
+
+def test_watch_reports_deleted_files(tmp_path):
+    """Test removal is reported so the file can be re-checked"""
+    crontab = tmp_path / "job"
+    crontab.write_text("0 * * * * echo\n")
+    changes, stop, thread = run_watcher([str(tmp_path)])
+    crontab.unlink()
+    wait_for(changes, 1)
+    stop.set()
+    thread.join(2)
+    assert changes == [str(crontab)]